@@ -1,9 +1,10 @@
 from __future__ import absolute_import
 
 from .base_backend import Backend
+from .compact import CompactGraph
 from .dgraph import DGraph
 from .graphistry import Graphistry
 from .neo4j import Neo4J
 from .networkx import NetworkX
 
-__all__ = ["Backend", "DGraph", "Graphistry", "Neo4J", "NetworkX"]
+__all__ = ["Backend", "CompactGraph", "DGraph", "Graphistry", "Neo4J", "NetworkX"]
@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
-from typing import List, Any, Union, TYPE_CHECKING
+from typing import List, Any, Optional, Union, TYPE_CHECKING
 
+from beagle.common.report import RunReport
 from beagle.nodes import Node
 
 if TYPE_CHECKING:
@@ -20,6 +21,9 @@ class Backend(object, metaclass=ABCMeta):
     ----------
     nodes : List[Node]
         Nodes produced by the transformer.
+    report : RunReport, optional
+        The report of the transformer run which produced the nodes. Backends add their own
+        stage timings and counts to it. A new report is created if none is passed.
 
     Example
     ----------
@@ -28,8 +32,9 @@ class Backend(object, metaclass=ABCMeta):
     >>> backend.graph()
     """
 
-    def __init__(self, nodes: List[Node]) -> None:
+    def __init__(self, nodes: List[Node], report: Optional[RunReport] = None) -> None:
         self.nodes = nodes
+        self.report = report or RunReport()
 
     @abstractmethod
     def graph(self) -> Union[str, Any]:
@@ -56,8 +61,7 @@ class Backend(object, metaclass=ABCMeta):
 
     @abstractmethod
     def is_empty(self) -> bool:
-        """Returns true if there wasn't a graph created.
-        """
+        """Returns true if there wasn't a graph created."""
         raise NotImplementedError()
 
     @classmethod
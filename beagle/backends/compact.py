@@ -0,0 +1,706 @@
+import inspect
+import json
+import sys
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type, Union, cast
+
+import numpy as np
+
+from beagle import nodes as node_classes
+from beagle.backends.base_backend import Backend
+from beagle.backends.networkx import node_to_json
+from beagle.common import dedup_nodes, logger
+from beagle.common.memory import _LARGEST_EDGES, _add, _empty_usage, _node_size, _sizeof
+from beagle.edges import Edge
+from beagle.nodes import Node
+
+# A table of events: either an edge holding every event of its class, or a list of events
+# which are already dicts (or None, for edges without any events).
+EventTable = Union[Edge, List[Optional[dict]]]
+
+# Number of edges converted from arrays at a time by `iter_links_json`.
+_JSON_CHUNK_SIZE = 10000
+
+
+class _Column(object):
+    """A NumPy array which values can be appended to. The capacity of the array is doubled
+    whenever it is full, so appending takes constant time on average."""
+
+    def __init__(self, dtype: Any) -> None:
+        self._data = np.empty(16, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, values: List[int]) -> None:
+        count = len(values)
+        if not count:
+            return
+
+        if self._size + count > len(self._data):
+            data = np.empty(max(2 * len(self._data), self._size + count), dtype=self._data.dtype)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+
+        self._data[self._size : self._size + count] = values
+        self._size += count
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+
+class _EventReader(object):
+    """Builds the events of an event table between two positions.
+
+    The values of the fields are converted from arrays `_JSON_CHUNK_SIZE` events at a time,
+    which suits reading the events of each edge in turn, as they are mostly next to each
+    other.
+    """
+
+    def __init__(self, table: Edge) -> None:
+        self.fields = table._fields
+        self.columns = [table.column(field) for field in self.fields]
+        self.start = self.end = 0
+        self.window: List[List[Any]] = []
+
+    def __call__(self, start: int, end: int) -> List[Optional[dict]]:
+        if not self.fields:
+            return [{} for _ in range(end - start)]
+
+        if start < self.start or end > self.end:
+            self.start, self.end = start, max(end, start + _JSON_CHUNK_SIZE)
+            self.window = [
+                values.tolist() if isinstance(values, np.ndarray) else values
+                for values in (column[self.start : self.end] for column in self.columns)
+            ]
+
+        offset = start - self.start
+        return [
+            dict(zip(self.fields, row))
+            for row in zip(*[values[offset : offset + end - start] for values in self.window])
+        ]
+
+
+def _without_edges(node: Node) -> Node:
+    """Copies the fields of `node`, without its edges. Keeping the nodes passed to the
+    backend would keep every edge object they hold as well."""
+
+    copy = node.__class__.__new__(node.__class__)
+    for attr, value in node._attributes():
+        setattr(copy, attr, value)
+    return copy
+
+
+class CompactGraph(Backend):
+    """Backend storing the graph in NumPy arrays rather than nested dicts.
+
+    :py:class:`NetworkX` keeps a dict for each node, two dicts for each edge, and a dict for
+    each event on an edge. This backend instead keeps:
+
+    - A node table: the ID of each node in an array, and a copy of each node without its
+      edges.
+    - The edges as arrays of source row, destination row and edge type code, in the order
+      they were added. A CSR index (the edges sorted by source, and the offset of the first
+      edge of each source) is built from them when needed.
+    - The events of the edges in side tables, one per edge class. Each table is an
+      :py:class:`Edge` holding every event of that class, so events are stored by field
+      with integer fields in NumPy arrays. Arrays of edge row, table and position map each
+      event back to its edge.
+
+    The graph is the same as the one built by :py:class:`NetworkX`, and :py:meth:`to_json`
+    returns the same output, with nodes and edges in the same order. Edges are kept as they
+    are, this backend does not support edge compaction.
+
+    Parameters
+    ----------
+    metadata : dict, optional
+        The metadata from the datasource.
+    consolidate_edges: boolean, optional
+        Controls if edges are consolidated. That is, if the edge of type q from u to v happens N times,
+        should there be one edge from u to v with type q, or should there be N edges.
+
+    Examples
+    --------
+
+    >>> backend = CompactGraph(nodes=nodes, consolidate_edges=True)
+    >>> backend.graph()
+    >>> backend.to_json()
+    """
+
+    def __init__(
+        self, metadata: dict = {}, consolidate_edges: bool = False, *args, **kwargs
+    ) -> None:
+
+        self.metadata = metadata
+        self.consolidate_edges = consolidate_edges
+
+        # Node table.
+        self._ids = _Column(np.int64)
+        self._rows: Dict[int, int] = {}
+        self._nodes: List[Node] = []
+
+        # Edge table, one row per consolidated edge. Without consolidation, each row still
+        # holds every event of one edge type between two nodes, and becomes one edge per event.
+        self._src = _Column(np.int64)
+        self._dst = _Column(np.int64)
+        self._type = _Column(np.int32)
+        self._types: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        # Number of events before compaction, for edges loaded from compacted JSON.
+        self._counts: Dict[int, int] = {}
+
+        # Event tables, and the edge row, table and position of each event.
+        self._tables: List[EventTable] = [[]]
+        self._table_codes: Dict[type, int] = {}
+        self._event_edge = _Column(np.int64)
+        self._event_table = _Column(np.int16)
+        self._event_index = _Column(np.int64)
+
+        # CSR index of the edges, see `_adjacency`.
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        super().__init__(*args, **kwargs)
+
+        logger.info("Initialized CompactGraph Backend")
+
+    def is_empty(self) -> bool:
+        return len(self._nodes) == 0
+
+    def graph(self) -> "CompactGraph":
+        """Builds the arrays from the nodes passed to the backend.
+
+        Returns
+        -------
+        CompactGraph
+            The backend itself, which holds the graph.
+        """
+
+        logger.info("Beginning graph generation.")
+
+        with self.report.stage("dedup"):
+            self.nodes = dedup_nodes(self.nodes)
+
+        with self.report.stage("graph"):
+            self._insert_nodes(self.nodes)
+
+        self._count_graph()
+
+        logger.info("Completed graph generation.")
+        logger.info(
+            f"Graph contains {self.number_of_nodes()} nodes and {self.number_of_edges()} edges."
+        )
+
+        return self
+
+    def add_nodes(self, nodes: List[Node]) -> "CompactGraph":
+        logger.info("Appending nodes into existing graph.")
+        with self.report.stage("dedup"):
+            nodes = dedup_nodes(nodes)
+
+        with self.report.stage("graph"):
+            self._insert_nodes(nodes)
+
+        self._count_graph()
+
+        logger.info("Completed appending nodes graph.")
+        logger.info(
+            f"Graph contains {self.number_of_nodes()} nodes and {self.number_of_edges()} edges."
+        )
+        return self
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    def number_of_edges(self) -> int:
+        """The number of edges, as counted by NetworkX: one per event when edges are not
+        consolidated."""
+        if self.consolidate_edges:
+            return len(self._src)
+        return len(self._event_edge)
+
+    def _count_graph(self) -> None:
+        """Records the number of nodes of each class, and edges of each type, in the report.
+        If the report measures memory, the memory used by the graph is recorded as well."""
+
+        self.report.node_counts = dict(Counter(node.__class__.__name__ for node in self._nodes))
+
+        if self.consolidate_edges:
+            per_type = np.bincount(self._type.values, minlength=len(self._types))
+        else:
+            per_type = np.bincount(
+                self._type.values[self._event_edge.values], minlength=len(self._types)
+            )
+
+        self.report.edge_counts = {
+            name: int(count) for name, count in zip(self._types, per_type.tolist()) if count
+        }
+
+        if self.report.memory is not None:
+            self.report.memory["graph"] = self.memory_usage()
+
+    def _node_row(self, node: Node, replace: bool, new_ids: List[int]) -> int:
+        """Returns the row of `node` in the node table, adding it if it isn't in the graph.
+        If `replace` is set, a node already in the graph is replaced by `node`."""
+
+        node_id = hash(node)
+        row = self._rows.get(node_id)
+
+        if row is None:
+            row = self._rows[node_id] = len(self._nodes)
+            self._nodes.append(_without_edges(node))
+            new_ids.append(node_id)
+        elif replace:
+            self._nodes[row] = _without_edges(node)
+
+        return row
+
+    def _type_code(self, edge_name: str) -> int:
+        code = self._type_codes.get(edge_name)
+        if code is None:
+            code = self._type_codes[edge_name] = len(self._types)
+            self._types.append(edge_name)
+        return code
+
+    def _table(self, edge_cls: Type[Edge]) -> Edge:
+        code = self._table_codes.get(edge_cls)
+        if code is None:
+            code = self._table_codes[edge_cls] = len(self._tables)
+            self._tables.append(edge_cls())
+        return cast(Edge, self._tables[code])
+
+    def _existing_edges(self, sources: Set[int]) -> Dict[Tuple[int, int, int], int]:
+        """Maps the source row, destination row and type code of the edges going out of
+        `sources` to their edge row."""
+
+        order, indptr = self._adjacency()
+        src, dst, types = self._src.values, self._dst.values, self._type.values
+
+        existing: Dict[Tuple[int, int, int], int] = {}
+        for row in sources:
+            for edge in order[indptr[row] : indptr[row + 1]].tolist():
+                existing[(int(src[edge]), int(dst[edge]), int(types[edge]))] = edge
+
+        return existing
+
+    def _insert_nodes(self, nodes: List[Node]) -> None:
+        """Inserts nodes into the graph, as well as all edges outbound from them.
+
+        Nodes already in the graph are replaced by the node from `nodes`. The destination of
+        an edge is only added if it isn't in the graph yet. When consolidating edges, the
+        events of an edge already in the graph are added to it.
+
+        Parameters
+        ----------
+        nodes : List[Node]
+            The de-duplicated nodes to insert.
+        """
+
+        node_count = len(self._nodes)
+        edge_count = len(self._src)
+
+        new_ids: List[int] = []
+        src: List[int] = []
+        dst: List[int] = []
+        types: List[int] = []
+        event_edge: List[int] = []
+        event_table: List[int] = []
+        event_index: List[int] = []
+
+        # Consolidated edges added by this call, and the edges of the nodes which were
+        # already in the graph.
+        consolidated: Dict[Tuple[int, int, int], int] = {}
+        if self.consolidate_edges and edge_count:
+            consolidated = self._existing_edges(
+                {
+                    self._rows[hash(node)]
+                    for node in nodes
+                    if self._rows.get(hash(node), node_count) < node_count
+                }
+            )
+
+        def _edge_row(u: int, v: int, code: int) -> int:
+            key = (u, v, code)
+            if self.consolidate_edges and key in consolidated:
+                return consolidated[key]
+
+            row = edge_count + len(src)
+            src.append(u)
+            dst.append(v)
+            types.append(code)
+
+            if self.consolidate_edges:
+                consolidated[key] = row
+            return row
+
+        empty = cast(List[Optional[dict]], self._tables[0])
+
+        for node in nodes:
+            u = self._node_row(node, True, new_ids)
+
+            for edge_dict in node.edges:
+                for dest_node, edge in edge_dict.items():
+                    v = self._node_row(dest_node, False, new_ids)
+
+                    if not len(edge):
+                        row = _edge_row(u, v, self._type_code(edge.__name__))
+                        event_edge.append(row)
+                        event_table.append(0)
+                        event_index.append(len(empty))
+                        empty.append(None)
+                        continue
+
+                    table = self._table(type(edge))
+                    table_code = self._table_codes[type(edge)]
+                    start = len(table)
+                    table.extend(edge)
+
+                    # Most edges name all of their events after the edge.
+                    if edge._names is None:
+                        row = _edge_row(u, v, self._type_code(edge.__name__))
+                        event_edge += [row] * len(edge)
+                    else:
+                        rows: Dict[str, int] = {}
+                        for name in edge._names:
+                            if name not in rows:
+                                rows[name] = _edge_row(u, v, self._type_code(name))
+                            event_edge.append(rows[name])
+
+                    event_table += [table_code] * len(edge)
+                    event_index += range(start, start + len(edge))
+
+        self._ids.extend(new_ids)
+        self._src.extend(src)
+        self._dst.extend(dst)
+        self._type.extend(types)
+        self._event_edge.extend(event_edge)
+        self._event_table.extend(event_table)
+        self._event_index.extend(event_index)
+
+        self._csr = None
+
+    def _adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the CSR index of the edges: the edge rows sorted by source, and for each
+        node row, the offset of its first edge in that order.
+
+        The edges of a source are sorted by the first edge added between the same two nodes,
+        which is the order NetworkX keeps them in.
+        """
+
+        if self._csr is None:
+            src = self._src.values
+            pairs = src * max(len(self._nodes), 1) + self._dst.values
+
+            _, first, inverse = np.unique(pairs, return_index=True, return_inverse=True)
+            order = np.lexsort((first[inverse], src))
+
+            indptr = np.zeros(len(self._nodes) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(src, minlength=len(self._nodes)), out=indptr[1:])
+
+            self._csr = (order, indptr)
+
+        return self._csr
+
+    def _events_by_edge(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the events sorted by edge row, keeping the order they were added in, and
+        the offset of the first event of each edge in that order."""
+
+        event_edge = self._event_edge.values
+        order = np.argsort(event_edge, kind="stable")
+
+        indptr = np.zeros(len(self._src) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(event_edge, minlength=len(self._src)), out=indptr[1:])
+
+        return order, indptr
+
+    def _event_readers(self) -> List[Callable[[int, int], List[Optional[dict]]]]:
+        """Returns, for each event table, a function building the events between two
+        positions of the table."""
+
+        readers: List[Callable[[int, int], List[Optional[dict]]]] = []
+
+        for table in self._tables:
+            if isinstance(table, list):
+                readers.append(lambda start, end, table=table: table[start:end])
+                continue
+
+            readers.append(_EventReader(table))
+
+        return readers
+
+    def iter_nodes_json(self) -> Iterator[dict]:
+        """Yields the entries of the `nodes` list of :py:meth:`to_json` one at a time."""
+
+        for node_id, node in zip(self._ids.values.tolist(), self._nodes):
+            yield node_to_json(node_id, node)
+
+    def iter_links_json(self) -> Iterator[dict]:
+        """Yields the entries of the `links` list of :py:meth:`to_json` one at a time.
+
+        Edges are read from the arrays `_JSON_CHUNK_SIZE` at a time, and the events of each
+        edge are only turned into dicts when the edge is reached, so the memory used does not
+        grow with the size of the graph.
+        """
+
+        order, _ = self._adjacency()
+        event_order, event_ptr = self._events_by_edge()
+
+        readers = self._event_readers()
+        event_table = self._event_table.values[event_order]
+        event_index = self._event_index.values[event_order]
+
+        # The events of an edge are usually next to each other in a single table, and read
+        # as one slice of it. `breaks` counts the events which don't follow the previous one.
+        step = np.ones(len(event_order), dtype=np.int64)
+        step[1:] = (event_table[1:] != event_table[:-1]) | (event_index[1:] != event_index[:-1] + 1)
+        breaks = np.cumsum(step)
+
+        starts, ends = event_ptr[:-1], event_ptr[1:]
+        firsts = np.minimum(starts, max(len(event_order) - 1, 0))
+
+        ids = self._ids.values
+        src, dst, types = self._src.values, self._dst.values, self._type.values
+
+        link_id = 0
+        for offset in range(0, len(order), _JSON_CHUNK_SIZE):
+            edges = order[offset : offset + _JSON_CHUNK_SIZE]
+            chunk_starts, chunk_ends, chunk_firsts = starts[edges], ends[edges], firsts[edges]
+
+            if len(event_order):
+                contiguous = (breaks[np.maximum(chunk_ends - 1, 0)] == breaks[chunk_firsts]) & (
+                    chunk_ends > chunk_starts
+                )
+                tables = event_table[chunk_firsts].tolist()
+                indexes = event_index[chunk_firsts].tolist()
+            else:
+                contiguous = np.zeros(len(edges), dtype=bool)
+                tables = indexes = [0] * len(edges)
+
+            for edge, u, v, code, start, end, is_contiguous, table, index in zip(
+                edges.tolist(),
+                ids[src[edges]].tolist(),
+                ids[dst[edges]].tolist(),
+                types[edges].tolist(),
+                chunk_starts.tolist(),
+                chunk_ends.tolist(),
+                contiguous.tolist(),
+                tables,
+                indexes,
+            ):
+                if is_contiguous:
+                    data = readers[table](index, index + end - start)
+                else:
+                    data = [
+                        readers[event_table_code](event_position, event_position + 1)[0]
+                        for event_table_code, event_position in zip(
+                            event_table[start:end].tolist(), event_index[start:end].tolist()
+                        )
+                    ]
+
+                edge_name = self._types[code]
+
+                if self.consolidate_edges:
+                    link_id += 1
+                    properties: Dict[str, Any] = {"data": data}
+                    if edge in self._counts:
+                        properties["count"] = self._counts[edge]
+
+                    yield {
+                        "id": link_id,
+                        "source": u,
+                        "target": v,
+                        "type": edge_name,
+                        "properties": properties,
+                    }
+                    continue
+
+                for entry in data:
+                    link_id += 1
+                    yield {
+                        "id": link_id,
+                        "source": u,
+                        "target": v,
+                        "type": edge_name,
+                        "properties": {"data": entry},
+                    }
+
+    def to_json(self) -> dict:
+        """Converts the graph to the same node_link JSON as :py:meth:`NetworkX.to_json`.
+
+        Returns
+        -------
+        dict
+            node_link compatible version of the graph.
+        """
+
+        return {
+            **self.json_header(),
+            "nodes": list(self.iter_nodes_json()),
+            "links": list(self.iter_links_json()),
+        }
+
+    def json_header(self) -> dict:
+        """The keys of :py:meth:`to_json` other than `nodes` and `links`."""
+        return {"directed": True, "multigraph": True}
+
+    @classmethod
+    def from_json(cls, path_or_obj: Union[str, dict], *args, **kwargs) -> "CompactGraph":
+        """Loads a graph saved by :py:meth:`to_json`, or by :py:meth:`NetworkX.to_json`.
+
+        Parameters
+        ----------
+        path_or_obj : Union[str, dict]
+            The JSON, or the path to a file containing it.
+
+        Other arguments are passed on to the constructor, for example `consolidate_edges`.
+
+        Returns
+        -------
+        CompactGraph
+            A backend holding the graph.
+        """
+
+        data = path_or_obj
+        if not isinstance(path_or_obj, dict):
+            data = json.load(open(path_or_obj))
+
+        data = cast(Dict[str, List[Dict[str, Any]]], data)
+
+        for key in ["nodes", "links"]:
+            if key not in data:
+                raise ValueError("JSON Was not generated by beagle.")
+
+        backend = cls(*args, nodes=[], **kwargs)
+
+        # Create a mapping of class name to class object.
+        node_mapping: Dict[str, Type[Node]] = {
+            pair[0]: pair[1] for pair in inspect.getmembers(node_classes, inspect.isclass)
+        }
+
+        ids: List[int] = []
+        for node in data["nodes"]:
+            node_obj = node_mapping[node["_node_class"]](**node["properties"])  # type: ignore
+            backend._rows[node["id"]] = len(backend._nodes)
+            backend._nodes.append(node_obj)
+            ids.append(node["id"])
+
+        events = cast(List[Optional[dict]], backend._tables[0])
+        src: List[int] = []
+        dst: List[int] = []
+        types: List[int] = []
+        event_edge: List[int] = []
+
+        for row, link in enumerate(data["links"]):
+            src.append(backend._rows[link["source"]])
+            dst.append(backend._rows[link["target"]])
+            types.append(backend._type_code(link["type"]))
+
+            properties = link["properties"]
+            if "count" in properties:
+                backend._counts[row] = properties["count"]
+
+            entries = properties.get("data")
+            if not isinstance(entries, list):
+                entries = [entries]
+
+            event_edge += [row] * len(entries)
+            events += entries
+
+        backend._ids.extend(ids)
+        backend._src.extend(src)
+        backend._dst.extend(dst)
+        backend._type.extend(types)
+        backend._event_edge.extend(event_edge)
+        backend._event_table.extend([0] * len(event_edge))
+        backend._event_index.extend(list(range(len(event_edge))))
+
+        return backend
+
+    def memory_usage(self, top: int = _LARGEST_EDGES) -> Dict[str, Any]:
+        """Estimates the memory held by the graph, in the same format as
+        :py:func:`beagle.common.memory.graph_memory_usage`.
+
+        The arrays of the node and edge tables are split evenly between the nodes and edges
+        they hold, and each event table between the events it holds.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of edges listed under "largest_edges" (the default is 10).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The total size in bytes, the count and size of each node type, the count, number
+            of events and size of each edge type, and the edges holding the most events.
+        """
+
+        usage = _empty_usage()
+        seen: Set[int] = set()
+
+        node_count = max(len(self._nodes), 1)
+        per_node = (
+            self._ids.nbytes + sys.getsizeof(self._rows) + sys.getsizeof(self._nodes)
+        ) / node_count
+
+        for node in self._nodes:
+            size = int(per_node) + _node_size(node, seen)
+            usage["total"] += size
+            _add(usage["nodes"], node.__class__.__name__, size)
+
+        edge_count = len(self._src)
+        if not edge_count:
+            return usage
+
+        # Size of each event, from the table holding it.
+        event_sizes: List[float] = []
+        for table in self._tables:
+            size = _sizeof(table if isinstance(table, list) else table.__dict__, seen)
+            event_sizes.append(size / max(len(table), 1))
+
+        per_event = np.asarray(event_sizes)[self._event_table.values] + (
+            self._event_edge.nbytes + self._event_table.nbytes + self._event_index.nbytes
+        ) / max(len(self._event_edge), 1)
+        per_edge = (self._src.nbytes + self._dst.nbytes + self._type.nbytes) / edge_count
+
+        event_edge = self._event_edge.values
+        edge_bytes = per_edge + np.bincount(event_edge, weights=per_event, minlength=edge_count)
+
+        # Edges without events have a single None event, which isn't counted.
+        valid = np.ones(len(event_edge), dtype=np.int64)
+        empty = cast(List[Optional[dict]], self._tables[0])
+        if empty:
+            is_none = np.fromiter((entry is None for entry in empty), dtype=bool, count=len(empty))
+            in_empty = self._event_table.values == 0
+            valid[in_empty] = ~is_none[self._event_index.values[in_empty]]
+
+        edge_events = np.bincount(event_edge, weights=valid, minlength=edge_count).astype(np.int64)
+
+        types = self._type.values
+        type_count = len(self._types)
+        for name, count, size, events in zip(
+            self._types,
+            np.bincount(types, minlength=type_count).tolist(),
+            np.bincount(types, weights=edge_bytes, minlength=type_count).tolist(),
+            np.bincount(types, weights=edge_events, minlength=type_count).tolist(),
+        ):
+            if count:
+                usage["edges"][name] = {"count": count, "bytes": int(size), "events": int(events)}
+                usage["total"] += int(size)
+
+        for edge in np.argsort(-edge_events, kind="stable")[:top].tolist():
+            usage["largest_edges"].append(
+                {
+                    "source": repr(self._nodes[self._src.values[edge]]),
+                    "target": repr(self._nodes[self._dst.values[edge]]),
+                    "type": self._types[self._type.values[edge]],
+                    "events": int(edge_events[edge]),
+                }
+            )
+
+        return usage
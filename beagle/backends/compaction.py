@@ -0,0 +1,146 @@
+from typing import Any, Dict, Hashable, List, Optional
+
+# Policies accepted by `compact_events`, see `beagle.backends.networkx.NetworkX`.
+EDGE_COMPACTION_POLICIES = ["dedup", "timestamps", "cap"]
+
+# Fields added to the events by the policies.
+_SUMMARY_FIELDS = {"count", "first_timestamp", "last_timestamp", "min_timestamp", "max_timestamp"}
+
+
+def compact_events(
+    events: List[Optional[dict]], policy: str, cap: int = 100
+) -> List[Optional[dict]]:
+    """Reduces the events of one edge (of a single type, between two nodes) using `policy`.
+
+    The policies are:
+
+    - `dedup`: Identical events are collapsed into one, with a `count` field holding how many
+      times it appeared.
+    - `timestamps`: The events are summarized into a single event. It keeps the fields of the
+      first event, and adds the `first_timestamp`, `last_timestamp`, `min_timestamp`,
+      `max_timestamp` and `count` of all of them.
+    - `cap`: Only the first `cap` events are kept. When events are dropped, the last event
+      kept gets a `count` field which includes them, so that the `count` of the kept events
+      (1 for events without one) adds up to the number of events of the edge.
+
+    Events which were already compacted with the same policy can be compacted again together
+    with new events, which is what happens when nodes are added to an existing graph.
+
+    Parameters
+    ----------
+    events : List[Optional[dict]]
+        The events of the edge. Edges without any data have a single `None` event.
+    policy : str
+        One of `EDGE_COMPACTION_POLICIES`.
+    cap : int, optional
+        The number of events kept by the `cap` policy (the default is 100).
+
+    Returns
+    -------
+    List[Optional[dict]]
+        The compacted events.
+    """
+
+    if policy not in EDGE_COMPACTION_POLICIES:
+        raise ValueError(f"policy must be one of {EDGE_COMPACTION_POLICIES}, got {policy}")
+
+    data = [event for event in events if event is not None]
+
+    # Edges without data are left as they are.
+    if not data:
+        return events
+
+    if policy == "dedup":
+        return _dedup(data)
+    elif policy == "timestamps":
+        return [_summarize_timestamps(data)]
+    else:
+        return _cap(data, max(cap, 1))
+
+
+def _event_key(event: dict) -> Hashable:
+    values = tuple((key, value) for key, value in event.items() if key != "count")
+    try:
+        hash(values)
+        return values
+    except TypeError:
+        # Some fields hold dicts or lists.
+        return repr(values)
+
+
+def _dedup(events: List[dict]) -> List[Optional[dict]]:
+    unique: Dict[Hashable, dict] = {}
+
+    for event in events:
+        key = _event_key(event)
+
+        if key in unique:
+            unique[key]["count"] += event.get("count", 1)
+        else:
+            unique[key] = dict(event, count=event.get("count", 1))
+
+    return list(unique.values())
+
+
+def _cap(events: List[dict], cap: int) -> List[Optional[dict]]:
+    if len(events) <= cap:
+        return list(events)
+
+    kept: List[Optional[dict]] = list(events[: cap - 1])
+    dropped = sum(event.get("count", 1) for event in events[cap:])
+
+    last = events[cap - 1]
+    kept.append(dict(last, count=last.get("count", 1) + dropped))
+
+    return kept
+
+
+def _safe(func: Any, values: List[Any]) -> Any:
+    """Applies min or max, returning None if the values can't be compared."""
+    try:
+        return func(values) if values else None
+    except TypeError:
+        return None
+
+
+def _summarize_timestamps(events: List[dict]) -> dict:
+    summary = {key: value for key, value in events[0].items() if key not in _SUMMARY_FIELDS}
+
+    firsts: List[Any] = []
+    lasts: List[Any] = []
+    lows: List[Any] = []
+    highs: List[Any] = []
+    count = 0
+
+    for event in events:
+        count += event.get("count", 1)
+
+        if "first_timestamp" in event:
+            # Already a summary.
+            for values, field in [
+                (firsts, "first_timestamp"),
+                (lasts, "last_timestamp"),
+                (lows, "min_timestamp"),
+                (highs, "max_timestamp"),
+            ]:
+                if event[field] is not None:
+                    values.append(event[field])
+
+        elif event.get("timestamp") is not None:
+            for values in [firsts, lasts, lows, highs]:
+                values.append(event["timestamp"])
+
+    if "timestamp" in summary:
+        summary["timestamp"] = firsts[0] if firsts else None
+
+    summary.update(
+        {
+            "first_timestamp": firsts[0] if firsts else None,
+            "last_timestamp": lasts[-1] if lasts else None,
+            "min_timestamp": _safe(min, lows),
+            "max_timestamp": _safe(max, highs),
+            "count": count,
+        }
+    )
+
+    return summary
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from beagle.backends.json_writer import _get_encoder, _graph_sections
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Extension of graphs saved by `write_graph_file`.
+GRAPH_FILE_EXTENSION = ".graph"
+
+# Bumped whenever the layout written by `write_graph_file` changes.
+_GRAPH_FILE_VERSION = 1
+
+_MAGIC = b"BEAGLEGF"
+
+# Position and length of the index, followed by the magic again.
+_FOOTER = struct.Struct("<QQ8s")
+
+# Number of nodes or links in each section.
+_SECTION_SIZE = 10000
+
+# Sections are compressed for speed rather than size, JSON compresses well either way.
+_COMPRESSION_LEVEL = 1
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Values orjson doesn't read, such as NaN.
+            pass
+
+    return json.loads(data)
+
+
+def write_graph_file(
+    backend: Any, fp: Union[BinaryIO, Any], section_size: int = _SECTION_SIZE
+) -> str:
+    """Writes a graph in the binary format read by :py:class:`GraphFile`.
+
+    The file holds the same nodes and links as `backend.to_json()`, split in sections of
+    `section_size` items. Each section is a JSON list compressed with zlib, so any one of
+    them can be read without decoding the rest of the file. The layout is::
+
+        magic | sections | index | index position, index length, magic
+
+    The index is a compressed JSON object holding the `json_header` of the backend, the
+    number of nodes and links, and the position, length, first item and number of items
+    of each section.
+
+    Like :py:func:`write_graph_json`, nodes and links are encoded as they are read from the
+    backend, and sections are written as soon as they are full.
+
+    >>> with open("graph.graph", "wb") as f:
+    ...     sha256 = write_graph_file(backend, f)
+
+    Parameters
+    ----------
+    backend : Any
+        A backend with `json_header`, `iter_nodes_json` and `iter_links_json` methods, such
+        as :py:class:`NetworkX`, :py:class:`CompactGraph` or :py:class:`GraphFile`.
+    fp : Union[BinaryIO, Any]
+        A file opened in binary mode, or any object with a `write` or `sendall` method
+        accepting bytes. It doesn't need to be seekable.
+    section_size : int, optional
+        Number of nodes or links in each section (the default is 10000).
+
+    Returns
+    -------
+    str
+        The SHA256 of the graph as JSON, which is the same as the SHA256 returned by
+        `write_graph_json(backend, fp, sort_keys=True, encoder="json")`, rather than that of
+        the bytes written. A graph has the same hash whichever format it is saved in.
+    """
+
+    # Items are encoded the way `write_graph_json` encodes them, and the hash is taken over
+    # the JSON document they would make, in the same order.
+    encode = _get_encoder("json", sort_keys=True)
+    sha256 = hashlib.sha256()
+
+    write = fp.sendall if hasattr(fp, "sendall") else fp.write
+    position = 0
+
+    def _write(data: bytes) -> None:
+        nonlocal position
+        write(data)
+        position += len(data)
+
+    def _write_sections(items: Iterator[dict]) -> List[Dict[str, int]]:
+        sections: List[Dict[str, int]] = []
+        start = 0
+        chunk: List[bytes] = []
+
+        def _flush() -> None:
+            nonlocal start
+            data = zlib.compress(b"[" + b", ".join(chunk) + b"]", _COMPRESSION_LEVEL)
+            sections.append(
+                {"offset": position, "length": len(data), "start": start, "count": len(chunk)}
+            )
+            _write(data)
+            start += len(chunk)
+            chunk.clear()
+
+        for item in items:
+            encoded = encode(item)
+            if start or chunk:
+                sha256.update(b", ")
+            sha256.update(encoded)
+
+            chunk.append(encoded)
+            if len(chunk) >= section_size:
+                _flush()
+
+        if chunk:
+            _flush()
+
+        return sections
+
+    _write(_MAGIC)
+
+    sections: Dict[str, List[Dict[str, int]]] = {}
+
+    sha256.update(b"{")
+    for key_index, (key, value) in enumerate(_graph_sections(backend, sort_keys=True)):
+        if key_index:
+            sha256.update(b", ")
+        sha256.update(encode(key) + b": ")
+
+        if not callable(value):
+            sha256.update(encode(value))
+            continue
+
+        sha256.update(b"[")
+        sections[key] = _write_sections(value())
+        sha256.update(b"]")
+    sha256.update(b"}")
+
+    index = {
+        "version": _GRAPH_FILE_VERSION,
+        "header": backend.json_header(),
+        "nodes": sum(section["count"] for section in sections["nodes"]),
+        "links": sum(section["count"] for section in sections["links"]),
+        "sections": sections,
+    }
+
+    data = zlib.compress(encode(index), _COMPRESSION_LEVEL)
+    index_offset = position
+    _write(data)
+    _write(_FOOTER.pack(index_offset, len(data), _MAGIC))
+
+    return sha256.hexdigest()
+
+
+def is_graph_file(path: str) -> bool:
+    """Returns True if `path` was written by :py:func:`write_graph_file`."""
+
+    with open(path, "rb") as f:
+        return f.read(len(_MAGIC)) == _MAGIC
+
+
+class GraphFile(object):
+    """Reads a graph written by :py:func:`write_graph_file`.
+
+    Only the index is read when the file is opened. Nodes and links are read and decoded a
+    section at a time, so reading the nodes doesn't touch the links, and reading a slice
+    of the links only decodes the sections holding it.
+
+    >>> graph = GraphFile("graph.graph")
+    >>> graph.number_of_edges()
+    250000
+    >>> graph.links(1000, 1010)
+    [{"id": 1001, "source": ..., "target": ..., "type": ..., "properties": ...}, ...]
+
+    The whole graph can still be exported as JSON, either with :py:meth:`to_json`, or
+    written a piece at a time with :py:func:`write_graph_json`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Raises
+    ------
+    ValueError
+        If the file was not written by :py:func:`write_graph_file`, or was written by an
+        incompatible version.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a beagle graph file.")
+
+            f.seek(-_FOOTER.size, os.SEEK_END)
+            offset, length, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is truncated.")
+
+            f.seek(offset)
+            self.index = _loads(zlib.decompress(f.read(length)))
+
+        if self.index.get("version") != _GRAPH_FILE_VERSION:
+            raise ValueError(f"{path} was written by an incompatible version of beagle.")
+
+    def json_header(self) -> dict:
+        """The keys of :py:meth:`to_json` other than `nodes` and `links`."""
+        return dict(self.index["header"])
+
+    def number_of_nodes(self) -> int:
+        return self.index["nodes"]
+
+    def number_of_edges(self) -> int:
+        return self.index["links"]
+
+    def _read(self, key: str, start: int = 0, stop: Optional[int] = None) -> Iterator[dict]:
+        """Yields the items of `key` ("nodes" or "links") between `start` and `stop`, which
+        work like the bounds of a slice. Only the sections holding them are decoded."""
+
+        bounds = range(self.index[key])[start:stop]
+        if not bounds:
+            return
+
+        with open(self.path, "rb") as f:
+            for section in self.index["sections"][key]:
+                first, count = section["start"], section["count"]
+                if first + count <= bounds.start or first >= bounds.stop:
+                    continue
+
+                f.seek(section["offset"])
+                items = _loads(zlib.decompress(f.read(section["length"])))
+
+                yield from items[max(bounds.start - first, 0) : bounds.stop - first]
+
+    def iter_nodes_json(self) -> Iterator[dict]:
+        """Yields the entries of the `nodes` list of :py:meth:`to_json` one at a time."""
+        return self._read("nodes")
+
+    def iter_links_json(self) -> Iterator[dict]:
+        """Yields the entries of the `links` list of :py:meth:`to_json` one at a time."""
+        return self._read("links")
+
+    def nodes(self, start: int = 0, stop: Optional[int] = None) -> List[dict]:
+        """Returns the nodes between `start` and `stop`, or every node by default."""
+        return list(self._read("nodes", start, stop))
+
+    def links(self, start: int = 0, stop: Optional[int] = None) -> List[dict]:
+        """Returns the links between `start` and `stop`, or every link by default."""
+        return list(self._read("links", start, stop))
+
+    def to_json(self) -> dict:
+        """Returns the graph in the same format as :py:meth:`NetworkX.to_json`.
+
+        Returns
+        -------
+        dict
+            node_link compatible version of the graph.
+        """
+
+        return {**self.json_header(), "nodes": self.nodes(), "links": self.links()}
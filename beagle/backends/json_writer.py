@@ -0,0 +1,196 @@
+import hashlib
+import json
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+
+from beagle.common import logger
+from beagle.config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Encoders accepted by `write_graph_json`.
+JSON_ENCODERS = ["json", "orjson"]
+
+# Encoded items are gathered until there is this many bytes to write.
+_BUFFER_SIZE = 64 * 1024
+
+
+def _get_encoder(encoder: Optional[str], sort_keys: bool) -> Callable[[Any], bytes]:
+    """Returns a function encoding a single item to JSON.
+
+    When `encoder` is not set, orjson is used if it is installed, and the standard library
+    otherwise. Both give the same JSON values, but not the same bytes: orjson leaves out
+    the spaces after separators, and doesn't escape non-ASCII characters.
+    """
+
+    if encoder is None:
+        encoder = "orjson" if orjson is not None else "json"
+
+    if encoder not in JSON_ENCODERS:
+        raise ValueError(f"encoder must be one of {JSON_ENCODERS}, got {encoder}")
+
+    if encoder == "orjson":
+        if orjson is not None:
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if sort_keys:
+                options |= orjson.OPT_SORT_KEYS
+
+            def _orjson(item: Any) -> bytes:
+                try:
+                    return orjson.dumps(item, option=options)
+                except TypeError:
+                    # Values orjson doesn't support, such as integers over 64 bits.
+                    return json.dumps(item, sort_keys=sort_keys).encode("utf-8")
+
+            return _orjson
+
+        logger.warning("orjson is not installed, falling back to the json module")
+
+    return lambda item: json.dumps(item, sort_keys=sort_keys).encode("utf-8")
+
+
+def _graph_sections(backend: Any, sort_keys: bool) -> List[Tuple[str, Any]]:
+    """The keys of `backend.to_json()` in the order they are written, with their value, or
+    with the method yielding their items for `nodes` and `links`."""
+
+    sections = {
+        **backend.json_header(),
+        "nodes": backend.iter_nodes_json,
+        "links": backend.iter_links_json,
+    }
+
+    keys = sorted(sections) if sort_keys else list(sections)
+
+    return [(key, sections[key]) for key in keys]
+
+
+def dumps(obj: Any, sort_keys: bool = False, encoder: Optional[str] = None) -> bytes:
+    """Encodes `obj` to JSON with `encoder`, which defaults to `storage.json_encoder`.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to encode.
+    sort_keys : bool, optional
+        Sorts the keys of every object (the default is False).
+    encoder : Optional[str], optional
+        See :py:func:`iter_graph_json`.
+
+    Returns
+    -------
+    bytes
+        The JSON of `obj`.
+    """
+
+    if encoder is None:
+        encoder = Config.get("storage", "json_encoder") or None
+
+    return _get_encoder(encoder, sort_keys)(obj)
+
+
+def iter_graph_json(
+    backend: Any, sort_keys: bool = False, encoder: Optional[str] = None
+) -> Iterator[bytes]:
+    """Encodes the output of `backend.to_json()` a piece at a time, without building it.
+
+    Nodes and links are read from the `iter_nodes_json` and `iter_links_json` methods of the
+    backend, and encoded one at a time, so only one of them is held in memory as a dict.
+
+    Parameters
+    ----------
+    backend : Any
+        A backend with `json_header`, `iter_nodes_json` and `iter_links_json` methods, such
+        as :py:class:`NetworkX` or :py:class:`CompactGraph`.
+    sort_keys : bool, optional
+        Sorts the keys of every object, as `json.dumps(..., sort_keys=True)` does (the
+        default is False).
+    encoder : Optional[str], optional
+        One of `JSON_ENCODERS`. Defaults to `storage.json_encoder`, or orjson when it is
+        installed if that is unset.
+
+    Returns
+    -------
+    Iterator[bytes]
+        Pieces of the JSON document.
+    """
+
+    if encoder is None:
+        encoder = Config.get("storage", "json_encoder") or None
+
+    encode = _get_encoder(encoder, sort_keys)
+
+    # Separators match the ones each encoder uses for the items themselves.
+    item_sep, key_sep = (b",", b":") if encode(["", ""]) == b'["",""]' else (b", ", b": ")
+
+    yield b"{"
+
+    for key_index, (key, value) in enumerate(_graph_sections(backend, sort_keys)):
+        if key_index:
+            yield item_sep
+
+        yield encode(key) + key_sep
+
+        if not callable(value):
+            yield encode(value)
+            continue
+
+        yield b"["
+        for index, item in enumerate(value()):
+            if index:
+                yield item_sep
+            yield encode(item)
+        yield b"]"
+
+    yield b"}"
+
+
+def write_graph_json(
+    backend: Any, fp: Union[BinaryIO, Any], sort_keys: bool = False, encoder: Optional[str] = None
+) -> str:
+    """Writes the output of `backend.to_json()` to a binary file or a socket, as it is
+    encoded by :py:func:`iter_graph_json`. Peak memory stays close to the size of a single
+    node or link, rather than growing with the size of the graph.
+
+    With the `json` encoder and `sort_keys`, the bytes written are the same as those of
+    `json.dumps(backend.to_json(), sort_keys=True)`. Other encoders give other bytes, and so
+    another SHA256, for the same graph.
+
+    >>> with open("graph.json", "wb") as f:
+    ...     sha256 = write_graph_json(backend, f, sort_keys=True)
+
+    Parameters
+    ----------
+    backend : Any
+        See :py:func:`iter_graph_json`.
+    fp : Union[BinaryIO, Any]
+        A file opened in binary mode, or any object with a `write` or `sendall` method
+        accepting bytes.
+    sort_keys : bool, optional
+        Sorts the keys of every object (the default is False).
+    encoder : Optional[str], optional
+        See :py:func:`iter_graph_json`.
+
+    Returns
+    -------
+    str
+        The SHA256 of the bytes written.
+    """
+
+    write = fp.sendall if hasattr(fp, "sendall") else fp.write
+    sha256 = hashlib.sha256()
+
+    buffer = bytearray()
+    for chunk in iter_graph_json(backend, sort_keys=sort_keys, encoder=encoder):
+        buffer += chunk
+        if len(buffer) >= _BUFFER_SIZE:
+            sha256.update(buffer)
+            write(bytes(buffer))
+            buffer.clear()
+
+    if buffer:
+        sha256.update(buffer)
+        write(bytes(buffer))
+
+    return sha256.hexdigest()
@@ -1,17 +1,40 @@
+import gc
 import inspect
 import json
-from collections import defaultdict
-from itertools import groupby
-from typing import Any, Dict, List, Union, cast
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple, Union, cast
 
 import networkx as nx
 
 from beagle import nodes
 from beagle.backends.base_backend import Backend
+from beagle.backends.compaction import EDGE_COMPACTION_POLICIES, compact_events
 from beagle.common import dedup_nodes, logger
+from beagle.common.memory import graph_memory_usage
+from beagle.config import Config
+from beagle.edges import Edge
 from beagle.nodes import Node
 
 
+@contextmanager
+def _gc_paused() -> Generator[None, None, None]:
+    """Pauses the cyclic garbage collector, and restores its previous state on exit.
+
+    Inserting a large graph allocates a dict for every event and a tuple for every edge.
+    None of them are part of a reference cycle, but each allocation counts towards a
+    collection, and each collection walks every object created so far.
+    """
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class NetworkX(Backend):
     """NetworkX based backend. Other backends can subclass this backend in order to have access
     to the underlying NetworkX object.
@@ -38,6 +61,14 @@ class NetworkX(Backend):
     consolidate_edges: boolean, optional
         Controls if edges are consolidated. That is, if the edge of type q from u to v happens N times,
         should there be one edge from u to v with type q, or should there be N edges.
+    edge_compaction: str, optional
+        Reduces the events kept on each edge, see :py:func:`beagle.backends.compaction.compact_events`.
+        One of "dedup", "timestamps" or "cap". When set, consolidated edges also get a `count`
+        property holding the number of events before compaction.
+        (the default is Config.get("networkx", "edge_compaction"), which is unset)
+    edge_cap: int, optional
+        The number of events kept per edge by the "cap" policy.
+        (the default is int(Config.get("networkx", "edge_cap")), which pulls from the configuration file)
 
     Notes
     -------
@@ -45,11 +76,24 @@ class NetworkX(Backend):
     """
 
     def __init__(
-        self, metadata: dict = {}, consolidate_edges: bool = False, *args, **kwargs
+        self,
+        metadata: dict = {},
+        consolidate_edges: bool = False,
+        edge_compaction: Optional[str] = Config.get("networkx", "edge_compaction") or None,
+        edge_cap: int = int(Config.get("networkx", "edge_cap")),
+        *args,
+        **kwargs,
     ) -> None:
 
+        if edge_compaction is not None and edge_compaction not in EDGE_COMPACTION_POLICIES:
+            raise ValueError(
+                f"edge_compaction must be one of {EDGE_COMPACTION_POLICIES}, got {edge_compaction}"
+            )
+
         self.metadata = metadata
         self.consolidate_edges = consolidate_edges
+        self.edge_compaction = edge_compaction
+        self.edge_cap = edge_cap
         self.G = nx.MultiDiGraph(metadata=metadata)
         super().__init__(*args, **kwargs)
 
@@ -73,12 +117,15 @@ class NetworkX(Backend):
         logger.info("Beginning graph generation.")
 
         # De-duplicate nodes.
-        self.nodes = dedup_nodes(self.nodes)
+        with self.report.stage("dedup"):
+            self.nodes = dedup_nodes(self.nodes)
 
-        for node in self.nodes:
-            # Insert the node into the graph.
+        with self.report.stage("graph"):
+            # Insert the nodes into the graph.
             # This also takes care of edges.
-            self.insert_node(node, hash(node))
+            self._insert_nodes(self.nodes)
+
+        self._count_graph()
 
         logger.info("Completed graph generation.")
         logger.info(f"Graph contains {len(self.G.nodes())} nodes and {len(self.G.edges())} edges.")
@@ -87,14 +134,32 @@ class NetworkX(Backend):
 
     def add_nodes(self, nodes: List[Node]) -> nx.MultiDiGraph:
         logger.info("Appending nodes into existing graph.")
-        nodes = dedup_nodes(nodes)
-        for node in nodes:
-            self.insert_node(node, hash(node))
+        with self.report.stage("dedup"):
+            nodes = dedup_nodes(nodes)
+
+        with self.report.stage("graph"):
+            self._insert_nodes(nodes)
+
+        self._count_graph()
 
         logger.info("Completed appending nodes graph.")
         logger.info(f"Graph contains {len(self.G.nodes())} nodes and {len(self.G.edges())} edges.")
         return self.G
 
+    def _count_graph(self) -> None:
+        """Records the number of nodes of each class, and edges of each type, in the report.
+        If the report measures memory, the memory used by the graph is recorded as well."""
+
+        self.report.node_counts = dict(
+            Counter(data["data"].__class__.__name__ for _, data in self.G.nodes(data=True))
+        )
+        self.report.edge_counts = dict(
+            Counter(data["edge_name"] for _, _, data in self.G.edges(data=True))
+        )
+
+        if self.report.memory is not None:
+            self.report.memory["graph"] = graph_memory_usage(self.G)
+
     def insert_node(self, node: Node, node_id: int) -> None:
         """Inserts a node into the graph, as well as all edges outbound from it.
 
@@ -106,42 +171,64 @@ class NetworkX(Backend):
             The ID of the node (`hash(node)`)
         """
 
-        # Add the node
+        self._insert_nodes([node])
 
-        # If it is in the graph, update with the object from the array.
-        if node_id in self.G:
-            nx.set_node_attributes(self.G, {node_id: {"data": node}})
-        # Otherwise, insert from the first time
-        else:
-            self.G.add_node(node_id, data=node)
+    def _insert_nodes(self, nodes: List[Node]) -> None:
+        """Inserts nodes into the graph, as well as all edges outbound from them.
+
+        The nodes and edges are collected first, and then added using a single call to
+        `add_nodes_from` and a single call to `add_edges_from`.
+
+        Nodes already in the graph are replaced by the node from `nodes`. The destination of
+        an edge is only added if it isn't in the graph yet.
+
+        When consolidating edges, the instances of each `(u, v, edge_name)` are gathered first,
+        and each consolidated edge is then written once, see :py:meth:`_consolidate`.
+
+        The garbage collector is paused while the nodes are inserted, see :py:func:`_gc_paused`.
+
+        Parameters
+        ----------
+        nodes : List[Node]
+            The de-duplicated nodes to insert.
+        """
 
-        # Insert the node's edges
-        # Add in all the edges for this node.
-        for edge_dict in node.edges:
-            for dest_node, edge_data in edge_dict.items():
+        with _gc_paused():
+            G = self.G
 
-                default_edge_name = edge_data.__name__
+            # Insertion order of the nodes is kept, so node IDs stay in the same order as
+            # inserting each node and its destinations in turn.
+            node_data: Dict[int, Node] = {}
+            edges: List[tuple] = []
+            consolidated: Dict[Tuple[int, int, str], List[Optional[dict]]] = {}
 
-                edge_instances = [
-                    {"edge_name": entry.pop("edge_name", default_edge_name), "data": entry}
-                    for entry in edge_data._events
-                ]
+            for node in nodes:
+                u_id = hash(node)
+                node_data[u_id] = node
 
-                if len(edge_instances) == 0:
-                    edge_instances = [{"edge_name": default_edge_name}]
+                for edge_dict in node.edges:
+                    for dest_node, edge_data in edge_dict.items():
+                        v_id = hash(dest_node)
 
-                # Sort by name
-                edge_instances = sorted(edge_instances, key=lambda e: e["edge_name"])
+                        if v_id not in node_data and v_id not in G:
+                            node_data[v_id] = dest_node
 
-                for edge_name, instances in groupby(edge_instances, key=lambda e: e["edge_name"]):
+                        for edge_name, instances in _edge_instances(edge_data).items():
+                            if not self.consolidate_edges:
+                                edges += self._edge_tuples(u_id, v_id, edge_name, instances)
+                                continue
 
-                    self.insert_edges(
-                        u=node,  # Source node
-                        v=dest_node,  # Dest Node
-                        edge_name=edge_name,
-                        # All instances of edges between u->v. Only get the data
-                        instances=[e.get("data", None) for e in edge_instances],
-                    )
+                            key = (u_id, v_id, edge_name)
+                            if key in consolidated:
+                                consolidated[key] += instances
+                            else:
+                                consolidated[key] = instances
+
+            # Looks up existing edges before the new nodes are added.
+            edges += self._consolidate(consolidated)
+
+            G.add_nodes_from((node_id, {"data": node}) for node_id, node in node_data.items())
+            G.add_edges_from(edges)
 
     def insert_edges(self, u: Node, v: Node, edge_name: str, instances: List[dict]) -> None:
         """Inserts instances of an edge of type `edge_name` from node `u` to `v`
@@ -165,36 +252,76 @@ class NetworkX(Backend):
         if v_id not in self.G.nodes:
             self.G.add_node(v_id, data=v)
 
-        # If we consolidate edges, the key is the edge name, and we update the data.
         if self.consolidate_edges:
-            curr = self.G.get_edge_data(u=u_id, v=v_id, key=edge_name, default=None)
+            edges = self._consolidate({(u_id, v_id, edge_name): list(instances)})
+        else:
+            edges = self._edge_tuples(u_id, v_id, edge_name, instances)
+
+        self.G.add_edges_from(edges)
+
+    def _consolidate(
+        self, consolidated: Dict[Tuple[int, int, str], List[Optional[dict]]]
+    ) -> List[tuple]:
+        """Adds the instances gathered for each `(u, v, edge_name)` to the consolidated edges.
+
+        The data of an edge already in the graph is extended in place, so that adding events
+        to an edge takes time proportional to the new events, rather than to all of its
+        events. The tuples passed to `add_edges_from` are returned for the other edges.
+
+        Parameters
+        ----------
+        consolidated : Dict[Tuple[int, int, str], List[Optional[dict]]]
+            The instances of each edge, keyed by source ID, destination ID and edge name. The
+            lists become the data of the edges.
+
+        Returns
+        -------
+        List[tuple]
+            The edges which aren't in the graph yet.
+        """
+
+        G = self.G
+        new_edges: List[tuple] = []
+
+        for (u_id, v_id, edge_name), instances in consolidated.items():
+            # Nodes which aren't in the graph yet have no edges to look up.
+            curr = (
+                G.get_edge_data(u=u_id, v=v_id, key=edge_name, default=None) if u_id in G else None
+            )
+
             if curr is None:
-                self.G.add_edge(
-                    u_for_edge=u_id,
-                    v_for_edge=v_id,
-                    key=edge_name,
-                    data=instances,
-                    edge_name=edge_name,
+                attrs: Dict[str, Any] = {"data": instances, "edge_name": edge_name}
+                if self.edge_compaction:
+                    attrs["count"] = len(instances)
+                    attrs["data"] = compact_events(instances, self.edge_compaction, self.edge_cap)
+
+                new_edges.append((u_id, v_id, edge_name, attrs))
+                continue
+
+            if self.edge_compaction:
+                curr["count"] = curr.get("count", len(curr["data"])) + len(instances)
+                curr["data"] = compact_events(
+                    curr["data"] + instances, self.edge_compaction, self.edge_cap
                 )
             else:
-                nx.set_edge_attributes(
-                    self.G,
-                    {
-                        (u_id, v_id, edge_name): {
-                            "data": curr["data"] + instances,  # Add old data to new data.
-                            "edge_name": edge_name,
-                        }
-                    },
-                )
+                curr["data"].extend(instances)
 
-        # Otherwise, they key is assigned from NetworkX, and we add the edge type as a label:
-        else:
-            self.G.add_edges_from(
-                [
-                    (u_id, v_id, {"key": edge_name, "data": entry, "edge_name": edge_name})
-                    for entry in instances
-                ]
-            )
+        return new_edges
+
+    def _edge_tuples(
+        self, u_id: int, v_id: int, edge_name: str, instances: List[Optional[dict]]
+    ) -> List[tuple]:
+        """Builds the tuples passed to `add_edges_from` for the instances of an edge of type
+        `edge_name` from `u_id` to `v_id`, when edges are not consolidated. The key is
+        assigned by NetworkX, and the edge type is added as a label."""
+
+        if self.edge_compaction:
+            instances = compact_events(instances, self.edge_compaction, self.edge_cap)
+
+        return [
+            (u_id, v_id, {"key": edge_name, "data": entry, "edge_name": edge_name})
+            for entry in instances
+        ]
 
     def update_node(self, node: Node, node_id: int) -> None:  # pragma: no cover
         """Update the attributes of a node. Since we may see the same Node in multiple events,
@@ -222,12 +349,9 @@ class NetworkX(Backend):
 
         current_data = self.G.nodes[node_id]["data"]
 
-        for key, value in node.__dict__.items():
-
-            # NOTE: Skips edge combination because edge data is
-            # added anyway in self.insert_node()
-            if isinstance(value, defaultdict):
-                continue
+        # NOTE: Skips edge combination because edge data is
+        # added anyway in self.insert_node()
+        for key, value in node._attributes():
 
             # Always use the latest value.
             if value:
@@ -256,47 +380,40 @@ class NetworkX(Backend):
             node_link compatible version of the graph.
         """
 
-        def node_to_json(node_id: int, node: Node) -> dict:
-            return {
-                "id": node_id,
-                "properties": node.to_dict(),
-                "_node_type": node.__name__,
-                "_node_class": node.__class__.__name__,
-                "_display": node._display,
-                "_color": node.__color__,
-            }
+        return {
+            **self.json_header(),
+            "nodes": list(self.iter_nodes_json()),
+            "links": list(self.iter_links_json()),
+        }
+
+    def json_header(self) -> dict:
+        """The keys of :py:meth:`to_json` other than `nodes` and `links`."""
+        return {"directed": self.G.is_directed(), "multigraph": self.G.is_multigraph()}
 
-        def edge_to_json(edge_id: int, u: int, v: int, edge_key: str, edge_props: dict) -> dict:
-            return {
-                "id": edge_id,
+    def iter_nodes_json(self) -> Iterator[dict]:
+        """Yields the entries of the `nodes` list of :py:meth:`to_json` one at a time."""
+
+        for node, node_data in self.G.nodes(data=True):
+            yield node_to_json(node, node_data["data"])
+
+    def iter_links_json(self) -> Iterator[dict]:
+        """Yields the entries of the `links` list of :py:meth:`to_json` one at a time."""
+
+        for index, (u, v, _, edge_props) in enumerate(self.G.edges(data=True, keys=True)):
+            properties = {"data": edge_props["data"]}
+
+            # Number of events before compaction.
+            if "count" in edge_props:
+                properties["count"] = edge_props["count"]
+
+            yield {
+                "id": index + 1,  # Unique ID based on index.
                 "source": u,
                 "target": v,
                 "type": edge_props["edge_name"],
-                "properties": {"data": edge_props["data"]},
+                "properties": properties,
             }
 
-        relationships = [
-            edge_to_json(
-                index + 1,  # Unique ID based on index.
-                edge[0],  # Source node (u)
-                edge[1],  # Destination node (v)
-                edge[2],  # Edge type (e.g "wrote")
-                edge[3],  # Edge data
-            )
-            for index, edge in enumerate(self.G.edges(data=True, keys=True))
-        ]
-
-        nodes = [
-            node_to_json(node, node_data["data"]) for node, node_data in self.G.nodes(data=True)
-        ]
-
-        return {
-            "directed": self.G.is_directed(),
-            "multigraph": self.G.is_multigraph(),
-            "nodes": nodes,
-            "links": relationships,
-        }
-
     @staticmethod
     def from_json(path_or_obj: Union[str, dict]) -> nx.MultiDiGraph:
 
@@ -341,7 +458,7 @@ class NetworkX(Backend):
                     {
                         "key": edge["id"],  # Unique Key
                         "edge_name": edge["type"],  # Edge Type
-                        "data": edge["properties"]["data"],  # Edge Data
+                        **edge["properties"],  # Edge Data, and count if compacted.
                     },
                 )
                 for edge in data["links"]
@@ -349,3 +466,61 @@ class NetworkX(Backend):
         )
 
         return G
+
+
+def node_to_json(node_id: int, node: Node) -> dict:
+    """Converts a node to its entry in the `nodes` list of the node_link JSON format.
+
+    Parameters
+    ----------
+    node_id : int
+        The ID of the node in the graph (`hash(node)`).
+    node : Node
+        The node.
+
+    Returns
+    -------
+    dict
+        The ID, properties, type, display value and color of the node.
+    """
+
+    return {
+        "id": node_id,
+        "properties": node.to_dict(),
+        "_node_type": node.__name__,
+        "_node_class": node.__class__.__name__,
+        "_display": node._display,
+        "_color": node.__color__,
+    }
+
+
+def _edge_instances(edge: Edge) -> Dict[str, List[Optional[dict]]]:
+    """Groups the events of an edge by their name. An edge without events has a single `None`
+    instance, named after the edge.
+
+    Parameters
+    ----------
+    edge : Edge
+        The edge to read the events of.
+
+    Returns
+    -------
+    Dict[str, List[Optional[dict]]]
+        The events of each edge name, without their `edge_name` field.
+    """
+
+    if len(edge) == 0:
+        return {edge.__name__: [None]}
+
+    fields = edge._fields
+    rows = zip(*[edge._list(field) for field in fields]) if fields else [()] * len(edge)
+
+    # Most edges name all of their events after the edge.
+    if edge._names is None:
+        return {edge.__name__: [dict(zip(fields, row)) for row in rows]}
+
+    grouped: Dict[str, List[Optional[dict]]] = {}
+    for name, row in zip(edge._names, rows):
+        grouped.setdefault(name, []).append(dict(zip(fields, row)))
+
+    return grouped
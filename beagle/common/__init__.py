@@ -1,8 +1,11 @@
 from __future__ import absolute_import
 
-from typing import Dict, List, Tuple
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from beagle.common.logging import logger  # noqa:F401
+from beagle.config import Config
 from beagle.nodes import Node
 
 
@@ -17,6 +20,9 @@ def split_path(path: str) -> Tuple[str, str]:
     By default, if it can't split, it'll return \\ as the directory, and None
     as the image.
 
+    Both values are interned (see `sys.intern`), as the same names and directories
+    come up in many events.
+
     Parameters
     ----------
     path : str
@@ -27,15 +33,16 @@ def split_path(path: str) -> Tuple[str, str]:
     Tuple[str, str]
         A tuple of file name + extension, and directory at once.
     """
-    image_only = path.split("\\")[-1]
-    directory = "\\".join(path.split("\\")[:-1])
+    parts = path.split("\\")
+    image_only = parts[-1]
+    directory = "\\".join(parts[:-1])
 
     if directory == "":
         directory = "\\"
     if image_only == "":
         image_only = "None"
 
-    return image_only, directory
+    return sys.intern(image_only), sys.intern(directory)
 
 
 def split_reg_path(reg_path: str) -> Tuple[str, str, str]:
@@ -56,23 +63,100 @@ def split_reg_path(reg_path: str) -> Tuple[str, str, str]:
     Returns
     -------
     Tuple[str, str, str]
-        Hive, registry key, and registry key path
+        Hive, registry key, and registry key path. Each value is interned, see
+        :py:func:`split_path`.
     """
     # RegistryKey Node Creation
-    hive = reg_path.split("\\")[0]
-    reg_key_path = "\\".join(reg_path.split("\\")[1:-1])
-    reg_key = reg_path.split("\\")[-1]
+    parts = reg_path.split("\\")
+    hive = parts[0]
+    reg_key_path = "\\".join(parts[1:-1])
+    reg_key = parts[-1]
+
+    return (sys.intern(hive), sys.intern(reg_key), sys.intern(reg_key_path))
+
+
+def current_rss() -> Optional[int]:
+    """Returns the resident set size of the current process in bytes.
+
+    Uses `psutil` if it is installed, otherwise reads `/proc/self/statm`. Returns
+    None if neither is available.
+
+    Returns
+    -------
+    Optional[int]
+        The current RSS in bytes.
+    """
+
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def merge_nodes(
+    output: Dict[int, Node], nodes: Iterable[Node], intern: bool = False
+) -> Dict[int, Node]:
+    """Merges nodes into an identity map of node hash to node. The first instance of each
+    node is kept, and every later instance is merged into it using :py:meth:`Node.merge_with`.
+
+
+    Parameters
+    ----------
+    output : Dict[int, Node]
+        The identity map to update.
+    nodes : Iterable[Node]
+        The nodes to merge in.
+    intern : bool, optional
+        Intern the string fields of the nodes added to `output`, so that the many nodes
+        sharing a host, image or directory share a single copy of it, see
+        :py:meth:`Node._intern_fields` (the default is False).
 
-    return (hive, reg_key, reg_key_path)
+    Returns
+    -------
+    Dict[int, Node]
+        The updated identity map.
+    """
 
+    for node in nodes:
+        node_key = hash(node)
 
-def dedup_nodes(nodes: List[Node]) -> List[Node]:
+        current = output.get(node_key)
+
+        # First time seeing node.
+        if current is None:
+            if intern:
+                node._intern_fields()
+            output[node_key] = node
+        # Otherwise, update the node
+        elif current is not node:
+            current.merge_with(node)
+
+    return output
+
+
+def dedup_nodes(
+    nodes: List[Node], workers: int = int(Config.get("transformer", "dedup_workers") or 1)
+) -> List[Node]:
     """Deduplicates a list of nodes.
 
+    With more than one worker, large lists are split into shards by node hash and merged
+    in parallel, see :py:func:`beagle.common.dedup.sharded_dedup_nodes`.
+
     Parameters
     ----------
     nodes : List[Node]
         [description]
+    workers : int, optional
+        Number of processes used to merge the nodes
+        (the default is Config.get("transformer", "dedup_workers"), which pulls from the configuration file)
 
     Returns
     -------
@@ -82,28 +166,19 @@ def dedup_nodes(nodes: List[Node]) -> List[Node]:
 
     def _merge_batch(nodes: List[Node]) -> List[Node]:
         """Merge a single batch of nodes"""
-        output: Dict[int, Node] = {}
-
         logger.debug(f"Merging batch of size {len(nodes)}")
 
-        for node in nodes:
-            node_key = hash(node)
-
-            # First time seeing node.
-            if node_key not in output:
-                output[node_key] = node
-                continue
-
-            # Otherwise, update the node
-
-            current = output[node_key]
-
-            current.merge_with(node)
-
-            output[node_key] = current
+        output = merge_nodes({}, nodes)
 
         logger.debug(f"Merged down to size {len(output)}")
 
         return list(output.values())
 
+    if workers > 1:
+        from beagle.common.dedup import MIN_SHARDED_NODES, sharded_dedup_nodes
+
+        if len(nodes) >= MIN_SHARDED_NODES:
+            logger.debug(f"Merging {len(nodes)} nodes in {workers} shards")
+            return sharded_dedup_nodes(nodes, workers)
+
     return _merge_batch(nodes)
@@ -0,0 +1,119 @@
+import os
+import pickle
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from beagle.nodes import Node
+
+# Bumped whenever the layout written by `save_checkpoint` changes.
+_CHECKPOINT_VERSION = 1
+
+
+def _flatten_nodes(nodes: List[Node]) -> Dict[str, Any]:
+    """Splits the nodes into their own attributes and a flat list of edges.
+
+    Pickling nodes directly recurses through every edge, which overflows the stack on large
+    graphs. Instead, every node reachable from `nodes` is given an index, its edge dicts are
+    replaced by empty ones, and each edge is stored as `(source, attribute, destination, edge)`.
+    """
+
+    index: Dict[int, int] = {}
+    ordered: List[Node] = []
+
+    def _index(node: Node) -> int:
+        position = index.get(id(node))
+        if position is None:
+            position = index[id(node)] = len(ordered)
+            ordered.append(node)
+        return position
+
+    roots = [_index(node) for node in nodes]
+
+    states: List[Tuple[type, Dict[str, Any]]] = []
+    edges: List[Tuple[int, str, int, Any]] = []
+
+    # `ordered` grows while iterating as edges reach nodes not seen yet.
+    i = 0
+    while i < len(ordered):
+        node = ordered[i]
+        state: Dict[str, Any] = dict(node._attributes())
+
+        for attr, edge_map in node._edge_items():
+            state[attr] = defaultdict(edge_map.default_factory)
+            for dest_node, edge in edge_map.items():
+                edges.append((i, attr, _index(dest_node), edge))
+
+        states.append((node.__class__, state))
+        i += 1
+
+    return {"nodes": states, "edges": edges, "roots": roots}
+
+
+def _unflatten_nodes(flat: Dict[str, Any]) -> List[Node]:
+    """Rebuilds the nodes flattened by :py:func:`_flatten_nodes`."""
+
+    nodes: List[Node] = []
+    for cls, state in flat["nodes"]:
+        node = cls.__new__(cls)
+        for attr, value in state.items():
+            setattr(node, attr, value)
+        nodes.append(node)
+
+    # Every node has its key fields by now, so they can be used as edge dict keys.
+    for source, attr, dest, edge in flat["edges"]:
+        getattr(nodes[source], attr)[nodes[dest]] = edge
+
+    return [nodes[i] for i in flat["roots"]]
+
+
+def save_checkpoint(path: str, state: Dict[str, Any], nodes: List[Node]) -> None:
+    """Writes a checkpoint to `path`. The file is written next to `path` first and then moved
+    into place, so an interruption while writing leaves the previous checkpoint intact.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+    state : Dict[str, Any]
+        Picklable values describing the progress of the run, such as the datasource position.
+    nodes : List[Node]
+        The nodes created so far.
+    """
+
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        pickle.dump(
+            {"version": _CHECKPOINT_VERSION, "state": state, "nodes": _flatten_nodes(nodes)},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Optional[Tuple[Dict[str, Any], List[Node]]]:
+    """Loads a checkpoint written by :py:func:`save_checkpoint`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+
+    Returns
+    -------
+    Optional[Tuple[Dict[str, Any], List[Node]]]
+        The state and nodes stored in the checkpoint, or None if there is no checkpoint at
+        `path` or it was written by an incompatible version.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+
+    if data.get("version") != _CHECKPOINT_VERSION:
+        return None
+
+    return data["state"], _unflatten_nodes(data["nodes"])
@@ -0,0 +1,150 @@
+import multiprocessing as mp
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from beagle.nodes import Node
+from beagle.nodes.node import _restore_node
+
+# Below this many nodes, sending the shards to other processes costs more than it saves.
+MIN_SHARDED_NODES = 10000
+
+# Nodes being deduplicated, read by the forked worker processes.
+_SHARD_NODES: List[Node] = []
+
+# A node without references to other node objects: its class, fields and hash, and for each
+# edge attribute, the class, key fields, hash and edge of each destination.
+PackedDest = Tuple[type, Dict[str, Any], int, Any]
+PackedNode = Tuple[type, Dict[str, Any], int, List[Tuple[str, List[PackedDest]]]]
+
+
+def _pack(node: Node) -> PackedNode:
+    """Replaces the destination nodes of the edges of `node` by their class and key fields.
+
+    Pickling a node pickles every node reachable through its edges. Packing the merged nodes
+    of a shard means only the shard itself is sent back from the worker process.
+    """
+
+    edges = [
+        (
+            attr,
+            [
+                (
+                    dest.__class__,
+                    {field: getattr(dest, field, None) for field in dest.key_fields},
+                    hash(dest),
+                    edge,
+                )
+                for dest, edge in edge_map.items()
+            ],
+        )
+        for attr, edge_map in node._edge_items()
+    ]
+
+    return node.__class__, dict(node._attributes()), hash(node), edges
+
+
+def _unpack(packed: PackedNode) -> Node:
+    """Rebuilds a node packed by :py:func:`_pack`. Destinations of its edges are nodes with
+    only their key fields set, which are equal to (and have the same hash as) the original."""
+
+    cls, state, node_hash, edges = packed
+
+    node = cls.__new__(cls)
+    for attr, value in state.items():
+        setattr(node, attr, value)
+
+    # The hashes were computed before packing, there is no need to compute them again.
+    node._hash = node_hash
+
+    for attr, items in edges:
+        edge_map = getattr(node, attr)
+        for dest_cls, dest_key, dest_hash, edge in items:
+            dest = _restore_node(dest_cls, dest_key)
+            dest._hash = dest_hash
+            edge_map[dest] = edge
+
+    return node
+
+
+def _merge_shard(shard: int, shards: int) -> List[PackedNode]:
+    """Merges the nodes of a single shard, inside of a worker process. The nodes are read
+    from `_SHARD_NODES`, which the worker inherited from the parent when it was forked."""
+
+    from beagle.common import merge_nodes
+
+    merged = merge_nodes({}, (node for node in _SHARD_NODES if hash(node) % shards == shard))
+
+    return [_pack(node) for node in merged.values()]
+
+
+def sharded_dedup_nodes(nodes: List[Node], workers: int) -> List[Node]:
+    """Deduplicates a list of nodes across `workers` processes.
+
+    The nodes are split into shards by their hash, which is a stable hash of their key
+    fields (see :py:meth:`Node.__hash__`). Every instance of a node lands in the same shard,
+    so each shard is merged on its own, and the results only need to be concatenated.
+
+    The worker processes are forked, so they read the nodes from the memory of this process
+    rather than having them sent over. Only the merged nodes are sent back, without the
+    nodes their edges point to. Edges are then pointed back at the merged nodes, or at the
+    original destination for nodes which only appear as the destination of an edge.
+
+    Where processes can't be forked, the nodes are merged in this process instead.
+
+    Parameters
+    ----------
+    nodes : List[Node]
+        The nodes to deduplicate.
+    workers : int
+        The number of processes (and shards) to use.
+
+    Returns
+    -------
+    List[Node]
+        The deduplicated nodes.
+    """
+
+    global _SHARD_NODES
+
+    from beagle.common import logger, merge_nodes
+
+    if "fork" not in mp.get_all_start_methods():
+        logger.debug("Processes can't be forked, merging nodes in a single process")
+        return list(merge_nodes({}, nodes).values())
+
+    _SHARD_NODES = nodes
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp.get_context("fork")
+        ) as executor:
+            shards = list(executor.map(_merge_shard, range(workers), [workers] * workers))
+    finally:
+        _SHARD_NODES = []
+
+    merged = [_unpack(packed) for shard in shards for packed in shard]
+
+    canonical = {hash(node): node for node in merged}
+
+    # The first instance of every node seen as the destination of an edge, for destinations
+    # which aren't in `nodes` themselves.
+    destinations: Dict[int, Node] = {}
+    for node in nodes:
+        for _, edge_map in node._edge_items():
+            for dest in edge_map:
+                dest_hash = hash(dest)
+                if dest_hash not in canonical:
+                    destinations.setdefault(dest_hash, dest)
+
+    for node in merged:
+        for attr, edge_map in list(node._edge_items()):
+            relinked: defaultdict = defaultdict(edge_map.default_factory)
+            for dest, edge in edge_map.items():
+                dest_hash = hash(dest)
+                target = canonical.get(dest_hash)
+                if target is None:
+                    target = destinations.get(dest_hash, dest)
+                relinked[target] = edge
+            setattr(node, attr, relinked)
+
+    return merged
@@ -0,0 +1,218 @@
+import heapq
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from beagle.nodes import Node
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Number of edges listed under "largest_edges" by default.
+_LARGEST_EDGES = 10
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised by a transformer when the memory used by the process goes over its
+    `memory_budget_mb`. The `usage` attribute holds the :py:func:`node_memory_usage` of the
+    nodes created until then."""
+
+    def __init__(self, budget: int, rss: int, usage: Dict[str, Any]) -> None:
+        self.budget = budget
+        self.rss = rss
+        self.usage = usage
+
+        largest = sorted(
+            list(usage["nodes"].items()) + list(usage["edges"].items()),
+            key=lambda item: item[1]["bytes"],
+            reverse=True,
+        )[:3]
+
+        super().__init__(
+            f"Memory usage of {rss // (1024 * 1024)}MB is over the budget of "
+            + f"{budget // (1024 * 1024)}MB. Largest types: "
+            + ", ".join(f"{name} ({stats['bytes'] // 1024}KB)" for name, stats in largest)
+        )
+
+
+def _sizeof(value: Any, seen: Set[int]) -> int:
+    """Returns the size of `value` and of everything it holds, in bytes. Objects in `seen`
+    were already counted, so shared objects (such as interned strings) are only counted
+    once."""
+
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, np.ndarray):
+        return size
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            size += _sizeof(key, seen) + _sizeof(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _sizeof(item, seen)
+
+    return size
+
+
+def _node_size(node: Node, seen: Set[int]) -> int:
+    """The size of a node, its fields and its edge dicts, without the edges themselves."""
+
+    size = sys.getsizeof(node)
+    seen.add(id(node))
+
+    for _, value in node._attributes():
+        size += _sizeof(value, seen)
+
+    edge_maps = getattr(node, "_edge_maps", None)
+    if edge_maps is not None:
+        size += sys.getsizeof(edge_maps)
+
+    for _, edge_map in node._edge_items():
+        size += sys.getsizeof(edge_map)
+
+    return size
+
+
+def _empty_usage() -> Dict[str, Any]:
+    return {"total": 0, "nodes": {}, "edges": {}, "largest_edges": []}
+
+
+def _add(
+    stats: Dict[str, Dict[str, int]], name: str, size: int, events: Optional[int] = None
+) -> None:
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = {"count": 0, "bytes": 0}
+        if events is not None:
+            entry["events"] = 0
+
+    entry["count"] += 1
+    entry["bytes"] += size
+    if events is not None:
+        entry["events"] += events
+
+
+def _largest(edges: Iterator[Tuple[int, str, Any, Any]], top: int) -> List[Dict[str, Any]]:
+    """Lists the `top` edges with the most events. The source and target nodes are only
+    turned into strings for those edges."""
+    return [
+        {"source": repr(source), "target": repr(target), "type": name, "events": events}
+        for events, name, source, target in heapq.nlargest(top, edges, key=lambda e: e[0])
+    ]
+
+
+def node_memory_usage(nodes: Iterable[Node], top: int = _LARGEST_EDGES) -> Dict[str, Any]:
+    """Estimates the memory held by a list of nodes, broken down by node and edge type.
+
+    Sizes include the fields of each node, and the events stored on its edges. Objects
+    shared between nodes, such as interned strings, are counted once, for the first node
+    holding them.
+
+    >>> node_memory_usage(transformer.run())
+    {
+        "total": 10485760,
+        "nodes": {"Process": {"count": 1200, "bytes": 524288}, ...},
+        "edges": {"Wrote": {"count": 5000, "events": 80000, "bytes": 4194304}, ...},
+        "largest_edges": [{"source": "...", "target": "...", "type": "Wrote", "events": 9000}, ...]
+    }
+
+    Parameters
+    ----------
+    nodes : Iterable[Node]
+        The nodes to measure.
+    top : int, optional
+        The number of edges listed under "largest_edges" (the default is 10).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The total size in bytes, the count and size of each node type, the count, number
+        of events and size of each edge type, and the edges holding the most events.
+    """
+
+    usage = _empty_usage()
+    seen: Set[int] = set()
+
+    def _edges() -> Iterator[Tuple[int, str, Any, Any]]:
+        for node in nodes:
+            size = _node_size(node, seen)
+            usage["total"] += size
+            _add(usage["nodes"], node.__class__.__name__, size)
+
+            for _, edge_map in node._edge_items():
+                for dest, edge in edge_map.items():
+                    size = sys.getsizeof(edge) + _sizeof(edge.__dict__, seen)
+                    usage["total"] += size
+                    _add(usage["edges"], edge.__name__, size, len(edge))
+
+                    yield len(edge), edge.__name__, node, dest
+
+    usage["largest_edges"] = _largest(_edges(), top)
+
+    return usage
+
+
+def _event_count(data: Any) -> int:
+    """The number of events in the `data` of an edge, which is a list of events once edges
+    are consolidated, and a single event otherwise."""
+
+    if data is None:
+        return 0
+
+    if isinstance(data, dict):
+        return 1
+
+    return len([event for event in data if event is not None])
+
+
+def graph_memory_usage(G: "nx.MultiDiGraph", top: int = _LARGEST_EDGES) -> Dict[str, Any]:
+    """Estimates the memory held by a graph built by the :py:class:`NetworkX` backend, in
+    the same format as :py:func:`node_memory_usage`.
+
+    Node sizes include the attribute dict NetworkX keeps for each node, and edge sizes
+    include the events stored on each edge, whether or not edges are consolidated.
+
+    Parameters
+    ----------
+    G : nx.MultiDiGraph
+        The graph to measure.
+    top : int, optional
+        The number of edges listed under "largest_edges" (the default is 10).
+
+    Returns
+    -------
+    Dict[str, Any]
+        See :py:func:`node_memory_usage`.
+    """
+
+    usage = _empty_usage()
+    seen: Set[int] = set()
+
+    for _, attrs in G.nodes(data=True):
+        node: Optional[Node] = attrs.get("data")
+        size = sys.getsizeof(attrs)
+        if node is not None:
+            size += _node_size(node, seen)
+
+        usage["total"] += size
+        _add(usage["nodes"], node.__class__.__name__ if node is not None else "None", size)
+
+    def _edges() -> Iterator[Tuple[int, str, Any, Any]]:
+        for u, v, attrs in G.edges(data=True):
+            events = _event_count(attrs.get("data"))
+            name = attrs.get("edge_name", "")
+
+            size = _sizeof(attrs, seen)
+            usage["total"] += size
+            _add(usage["edges"], name, size, events)
+
+            yield events, name, G.nodes[u].get("data"), G.nodes[v].get("data")
+
+    usage["largest_edges"] = _largest(_edges(), top)
+
+    return usage
@@ -0,0 +1,161 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+# Upper bounds (in seconds) of the handler latency histogram buckets.
+_LATENCY_BUCKETS: List[Tuple[str, float]] = [
+    ("<10us", 1e-5),
+    ("<100us", 1e-4),
+    ("<1ms", 1e-3),
+    ("<10ms", 1e-2),
+    ("<100ms", 1e-1),
+    (">=100ms", float("inf")),
+]
+
+# Minimum time between two queue depth samples.
+_QUEUE_SAMPLE_INTERVAL = 0.5
+
+
+class LatencyHistogram(object):
+    """Tracks the count, total, maximum and a bucketed histogram of latencies."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: Dict[str, int] = {name: 0 for name, _ in _LATENCY_BUCKETS}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+        for name, bound in _LATENCY_BUCKETS:
+            if seconds < bound:
+                self.buckets[name] += 1
+                break
+
+    def update(self, other: "LatencyHistogram") -> None:
+        """Adds the values of another histogram into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for name, count in other.buckets.items():
+            self.buckets[name] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "histogram": dict(self.buckets),
+        }
+
+
+class RunReport(object):
+    """Collects timings and counts for each stage of turning a datasource into a graph.
+
+    The transformer records the number of events, the queue depth, and the time spent in
+    each handler. The backend records the de-duplication and graph building time, as well
+    as the number of nodes and edges of each type. :py:meth:`to_dict` returns all of it
+    as a JSON serializable dictionary.
+
+    Examples
+    --------
+
+    >>> transformer = SysmonEVTX("sysmon.evtx").to_transformer()
+    >>> transformer.to_graph()
+    >>> transformer.report.to_dict()
+    {"events": 10234, "events_per_second": 5120.4, "stages": {"transform": 2.0, ...}, ...}
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._start = time.time()
+        self._last_queue_sample = 0.0
+
+        self.events = 0
+        self.nodes_created = 0
+        self.errors = 0
+        self.stages: Dict[str, float] = {}
+        self.queue_depth: List[Tuple[float, int]] = []
+        self.handlers: Dict[str, LatencyHistogram] = {}
+        self.unhandled: Counter = Counter()
+        self.node_counts: Dict[str, int] = {}
+        self.edge_counts: Dict[str, int] = {}
+        self.peak_rss: Optional[int] = None
+        # Memory used by each node and edge type, see `beagle.common.memory`. Only measured
+        # when enabled with the transformer `memory_report` option.
+        self.memory: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """Records the wall time of the wrapped block under `name`.
+
+        >>> with report.stage("dedup"):
+                nodes = dedup_nodes(nodes)
+        """
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.time() - start)
+            self.sample_rss()
+
+    def record_handler(self, name: str, seconds: float) -> None:
+        """Records the time a single call to the handler `name` took."""
+        with self._lock:
+            histogram = self.handlers.get(name)
+            if histogram is None:
+                histogram = self.handlers[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def merge_handlers(self, handlers: Dict[str, LatencyHistogram]) -> None:
+        """Merges handler histograms recorded elsewhere, for example in a worker process."""
+        with self._lock:
+            for name, other in handlers.items():
+                self.handlers.setdefault(name, LatencyHistogram()).update(other)
+
+    def sample_queue(self, depth: int) -> None:
+        """Records the number of batches waiting to be transformed. Samples taken less than
+        half a second after the previous one are ignored."""
+
+        now = time.time()
+        if self.queue_depth and now - self._last_queue_sample < _QUEUE_SAMPLE_INTERVAL:
+            return
+
+        self._last_queue_sample = now
+        self.queue_depth.append((round(now - self._start, 3), depth))
+        self.sample_rss()
+
+    def sample_rss(self) -> None:
+        """Updates the peak resident memory seen during the run."""
+
+        from beagle.common import current_rss
+
+        rss = current_rss()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def to_dict(self) -> Dict[str, Any]:
+        transform_time = self.stages.get("transform", 0.0)
+
+        return {
+            "events": self.events,
+            "events_per_second": self.events / transform_time if transform_time else None,
+            "nodes_created": self.nodes_created,
+            "errors": self.errors,
+            "unhandled": {str(key): count for key, count in self.unhandled.items()},
+            "stages": dict(self.stages),
+            "queue_depth": [list(sample) for sample in self.queue_depth],
+            "handlers": {name: hist.to_dict() for name, hist in self.handlers.items()},
+            "nodes": dict(self.node_counts),
+            "edges": dict(self.edge_counts),
+            "peak_rss": self.peak_rss,
+            "memory": self.memory,
+        }
@@ -1,6 +1,8 @@
 import inspect
+import os
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, Any, Generator
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Generator, Hashable, Iterator, Optional, Set
 
 from beagle.constants import FieldNames
 
@@ -32,6 +34,9 @@ class DataSource(object, metaclass=ABCMeta):
 
     """
 
+    # Event types requested by the transformer, see `set_event_types`.
+    _event_types: Optional[Set[Hashable]] = None
+
     def __init_subclass__(cls, **kwargs):
         """Validated the subclass has the required annotations.
         """
@@ -65,6 +70,69 @@ class DataSource(object, metaclass=ABCMeta):
 
         raise NotImplementedError()
 
+    def events_from(self, position: int) -> Iterator[dict]:
+        """Yields the events from :py:meth:`events`, skipping the first `position` of them.
+        This is used to resume a transformer from a checkpoint.
+
+        The skipped events are still read, but are not transformed again. Datasources which
+        can seek directly to a position should override this.
+
+        Parameters
+        ----------
+        position : int
+            The number of events to skip.
+
+        Returns
+        -------
+        Iterator[dict]
+            The events after `position`.
+        """
+
+        return islice(self.events(), position, None)
+
+    def set_event_types(self, event_types: Optional[Set[Hashable]]) -> None:
+        """Sets the event types the transformer reading from this datasource creates nodes
+        from. Datasources which can check the type of an event before fully parsing it should
+        skip events of any other type in :py:meth:`events`. Other datasources ignore this.
+
+        What an event type is depends on the datasource, for example the EventID of a
+        Sysmon record, see :py:meth:`beagle.transformers.base_transformer.Transformer.accepted_event_types`.
+
+        Transformers set the event types while they read the datasource, and restore the
+        previous ones once they are done.
+
+        Parameters
+        ----------
+        event_types : Optional[Set[Hashable]]
+            The event types to yield, or None to yield every event.
+        """
+
+        self._event_types = event_types
+
+    def identity(self) -> Dict[str, Any]:
+        """Identifies the input read by this datasource, so that a checkpoint saved while
+        reading one input is not resumed on another, see
+        :py:meth:`beagle.transformers.base_transformer.Transformer.run`.
+
+        Defaults to the :py:meth:`metadata` of the datasource, and the path, size and
+        modification time of every file whose path is an attribute of the datasource.
+        Datasources reading from anything else, such as events held in memory, should
+        override this.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Picklable values which differ between two inputs.
+        """
+
+        files = {}
+        for attr, value in vars(self).items():
+            if isinstance(value, str) and os.path.isfile(value):
+                stat = os.stat(value)
+                files[attr] = (os.path.abspath(value), stat.st_size, stat.st_mtime)
+
+        return {"metadata": self.metadata(), "files": files}
+
     @abstractmethod
     def metadata(self) -> dict:
         """Returns the metadata object for this data source.
@@ -76,12 +144,17 @@ class DataSource(object, metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
-    def to_transformer(self, transformer: "Transformer" = None) -> "Transformer":
+    def to_transformer(self, transformer: "Transformer" = None, **kwargs) -> "Transformer":
         """Allows the data source to be used as a functional API. By default, uses the
         first transformer in the `transformers` attribute.
 
+        Any keyword arguments are passed to the transformer, for example to select how
+        events are processed.
+
         >>> graph = DataSource().to_transformer().to_graph()
 
+        >>> nodes = DataSource().to_transformer(execution="process").run()
+
         Returns
         -------
         Transformer
@@ -91,7 +164,7 @@ class DataSource(object, metaclass=ABCMeta):
             transformer_cls = self.transformers[0]  # type: ignore
         else:
             transformer_cls = transformer
-        return transformer_cls(self)
+        return transformer_cls(self, **kwargs)
 
     def to_graph(self, *args, **kwargs) -> Any:
         """Allows to hop immediatly from a datasource to a graph.
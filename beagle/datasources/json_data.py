@@ -1,6 +1,7 @@
+import hashlib
 import os
 import json
-from typing import Dict, Generator, List
+from typing import Any, Dict, Generator, List
 
 from beagle.datasources.base_datasource import DataSource
 from beagle.transformers import GenericTransformer
@@ -52,3 +53,9 @@ class JSONData(DataSource):
 
     def metadata(self) -> dict:
         return {}
+
+    def identity(self) -> Dict[str, Any]:
+        """The SHA256 of the events, see :py:meth:`DataSource.identity`."""
+
+        data = json.dumps(self._events, sort_keys=True, default=str).encode("utf-8")
+        return {"sha256": hashlib.sha256(data).hexdigest()}
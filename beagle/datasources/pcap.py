@@ -78,11 +78,23 @@ class PCAP(DataSource):
             },
         }
 
+        # Layers in reverse order, the event type of a packet is its last matching layer.
+        layers_by_depth = list(reversed(list(layers_data.keys())))
+        skipped = 0
+
         packet_type = "Ether"
         for packet in pcap:
 
             packet = cast(Packet, packet)
 
+            if self._event_types is not None:
+                top_layer = next(
+                    (layer.__name__ for layer in layers_by_depth if packet.haslayer(layer)), None
+                )
+                if top_layer not in self._event_types:
+                    skipped += 1
+                    continue
+
             payload = packet.build()
             if packet.haslayer(IP):
                 payload = packet[IP].build()
@@ -122,6 +134,9 @@ class PCAP(DataSource):
 
             yield packet_data
 
+        if skipped:
+            logger.debug(f"Skipped {skipped} packets with unused event types")
+
     def _parse_dns_request(self, dns_layer) -> dict:
         from scapy.layers.dns import DNS, DNSRR
 
@@ -1,9 +1,10 @@
 import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generator, Optional
 
 import Evtx.Evtx as evtx
 from lxml import etree
 
+from beagle.common.logging import logger
 from beagle.datasources.win_evtx import WinEVTX
 from beagle.transformers.sysmon_transformer import SysmonTransformer
 
@@ -23,6 +24,50 @@ class SysmonEVTX(WinEVTX):
     def __init__(self, sysmon_evtx_log_file: str) -> None:
         super().__init__(sysmon_evtx_log_file)
 
+    def events(self) -> Generator[dict, None, None]:
+        """Yields each record as a flattened dictionary. If event types were set using
+        :py:meth:`set_event_types`, records with any other EventID are skipped
+        before being flattened.
+        """
+
+        skipped = 0
+
+        with evtx.Evtx(self.file_path) as log:
+            for record in log.records():
+                # Get the lxml object
+                xml = record.lxml()
+
+                if self._event_types is not None and self.event_id(xml) not in self._event_types:
+                    skipped += 1
+                    continue
+
+                yield self.parse_record(xml)
+
+        if skipped:
+            logger.debug(f"Skipped {skipped} records with unused event IDs")
+
+    @staticmethod
+    def event_id(record: etree.ElementTree) -> Optional[int]:
+        """Reads the EventID of a record without parsing the rest of it.
+
+        Parameters
+        ----------
+        record : etree.ElementTree
+            The record.
+
+        Returns
+        -------
+        Optional[int]
+            The EventID, or None if the record doesn't have a valid one.
+        """
+
+        event_id = record.findtext("{*}System/{*}EventID")
+
+        try:
+            return int(event_id)  # type: ignore
+        except (TypeError, ValueError):
+            return None
+
     def metadata(self) -> dict:
         """Returns the Hostname by inspecting the `Computer` entry of the
         first record.
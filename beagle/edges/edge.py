@@ -1,4 +1,37 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union, cast
+
+import numpy as np
+
+# Integer fields are appended to lists, and moved to NumPy arrays in chunks of this many
+# events. Edges holding fewer events than this keep their integers in lists.
+_CHUNK_SIZE = 256
+
+# Fields annotated with one of these types are stored in NumPy arrays.
+_INT_TYPES = (int, Optional[int])
+
+# Membership tests on edges with at least this many events go through a set of the values of
+# each field, instead of scanning the field.
+_INDEX_MIN_EVENTS = 64
+
+Column = Union[List[Any], np.ndarray]
+
+_INT64_MIN, _INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def _array_contains(column: np.ndarray, value: Any) -> bool:
+    """Checks if an integer array holds `value`, with the same equality as a list or set of
+    the same integers: `5.0` and `True` match `5` and `1`, `5.5` matches nothing."""
+
+    if isinstance(value, float):
+        if not value.is_integer():
+            return False
+        value = int(value)
+
+    if isinstance(value, int):
+        value = int(value)
+        return _INT64_MIN <= value <= _INT64_MAX and bool((column == value).any())
+
+    return value in column.tolist()
 
 
 class Edge(object):
@@ -46,27 +79,57 @@ class Edge(object):
 
     >>> proc.launched[child]
 
+    Events are stored by field rather than as one dict per event, and fields annotated as
+    `int` (such as timestamps and ports) are kept in NumPy arrays once an edge holds many
+    events. :py:meth:`column` returns the values of a single field, while `_events` builds
+    the dicts for each event when the edge is serialized.
+
+    Checking if an edge holds a value, such as ``{"timestamp": 145} in proc.launched[child]``,
+    scans the field on small edges. Once an edge has many events, the first check on a field
+    builds a set of its values, which is kept up to date by :py:meth:`append`.
+
     """
 
-    _events: List[dict] = []
+    # Layout of the fields of each subclass, built once in `__init_subclass__`.
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+    _int_fields: FrozenSet[str] = frozenset()
+    # True if the subclass overrides `get_name`, in which case the name of each event is stored.
+    _named_events = False
+
+    # Number of events, and number of events moved to `_arrays` by `_flush`.
+    _size = 0
+    _flushed = 0
+    # Chunks of each integer field, created on the first flush.
+    _arrays: Optional[Dict[str, List[np.ndarray]]] = None
+    # Name of each event, only kept if `_named_events` is set.
+    _names: Optional[List[str]] = None
+    # Set of the values of each field looked up by `__contains__`, or None for fields holding
+    # unhashable values. Created on the first lookup on a large enough edge.
+    _index: Optional[Dict[str, Optional[Set[Any]]]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        annotations: Dict[str, Any] = {}
+        for klass in reversed(cls.__mro__):
+            if klass is not Edge and issubclass(klass, Edge):
+                annotations.update(klass.__dict__.get("__annotations__", {}))
+
+        cls._fields = tuple(annotations)
+        cls._field_set = frozenset(annotations)
+        cls._int_fields = frozenset(
+            field for field, annotation in annotations.items() if annotation in _INT_TYPES
+        )
+        cls._named_events = cls.get_name is not Edge.get_name
 
     def __init__(self) -> None:
-        self._events = []
+        # One list per field, holding its value for each event. For integer fields, only the
+        # values appended since the last `_flush` are in the list, the rest are in `_arrays`.
+        self._columns: Dict[str, List[Any]] = {}
 
     def __add__(self, data: Dict[Any, Any]) -> "Edge":
-        for key, value in data.items():
-            if key not in self.__annotations__:
-                raise RuntimeError(
-                    f"{key} is not a valid field for a {self.__class__.__name__} edge. "
-                    + f"Valid fields are {self.__annotations__}"
-                )
-
-        entry = {k: None for k, _ in self.__annotations__.items()}
-        entry.update(data)
-        entry["edge_name"] = self.get_name(entry)
-
-        self._events.append(entry)
-
+        self.append(**data)
         return self
 
     def get_name(self, entry: dict):
@@ -88,29 +151,230 @@ class Edge(object):
 
         """
 
-        for key, value in kwargs.items():
-            if key not in self.__annotations__:
-                raise RuntimeError(
-                    f"{key} is not a valid field for a {self.__class__.__name__} edge."
-                    + f"Valid fields are {self.__annotations__}"
-                )
+        if not self._field_set.issuperset(kwargs):
+            invalid = [key for key in kwargs if key not in self._field_set]
+            raise RuntimeError(
+                f"{invalid[0]} is not a valid field for a {self.__class__.__name__} edge."
+                + f"Valid fields are {list(self._fields)}"
+            )
 
-        entry = {k: None for k, _ in self.__annotations__.items()}
-        entry.update(kwargs)
-        entry["edge_name"] = self.get_name(entry)
+        columns = self._columns
 
-        self._events.append(entry)
+        if not columns:
+            columns = self._columns = {field: [] for field in self._fields}
 
-    def __contains__(self, data: Dict[Any, Any]):
+        for field, column in columns.items():
+            column.append(kwargs.get(field))
+
+        if self._named_events:
+            if self._names is None:
+                self._names = [self.__name__] * self._size
+            self._names.append(self.get_name(kwargs))
 
-        found = {k: False for k in data.keys()}
+        self._size += 1
 
-        for event in self._events:
-            for key, value in data.items():
-                if event[key] == value:
-                    found[key] = True
+        if self._index is not None:
+            self._update_index(kwargs)
+
+        if self._int_fields and self._size - self._flushed >= _CHUNK_SIZE:
+            self._flush()
+
+    def extend(self, other: "Edge") -> None:
+        """Appends every event of `other` to this edge, leaving `other` unchanged.
+
+        Edges of the same class have the same fields, so the values of each field are added
+        at once, without validating and building each event. Events of an edge of another
+        class are appended one by one using :py:meth:`append`.
+
+        >>> proc.launched[child].extend(other_proc.launched[child])
+
+        Parameters
+        ----------
+        other : Edge
+            The edge to copy the events of.
+        """
+
+        if not other._size:
+            return
+
+        if type(other) is not type(self):
+            for event in other._events:
+                event.pop("edge_name")
+                self.append(**event)
+            return
+
+        columns = self._columns
+
+        if not columns:
+            columns = self._columns = {field: [] for field in self._fields}
+
+        for field, column in columns.items():
+            column.extend(other._list(field))
+
+        if self._named_events and (self._names is not None or other._names is not None):
+            if self._names is None:
+                self._names = [self.__name__] * self._size
+            self._names.extend(other._names or [other.__name__] * other._size)
+
+        self._size += other._size
+
+        if self._index is not None:
+            for field, values in self._index.items():
+                if values is None:
+                    continue
+                try:
+                    values.update(other._list(field))
+                except TypeError:
+                    self._index[field] = None
+
+        if self._int_fields and self._size - self._flushed >= _CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Moves the values of integer fields appended since the last flush into NumPy arrays.
+
+        A field holding anything other than integers is kept as a list from then on.
+        """
 
-        return all(found.values())
+        if self._arrays is None:
+            self._arrays = {field: [] for field in self._int_fields}
+
+        for field in list(self._arrays):
+            pending = self._columns[field]
+            if not pending:
+                continue
+
+            chunks = self._arrays[field]
+
+            if all(type(value) is int for value in pending):
+                try:
+                    chunks.append(np.array(pending, dtype=np.int64))
+                    self._columns[field] = []
+                    continue
+                except OverflowError:
+                    pass
+
+            del self._arrays[field]
+            self._columns[field] = [value for chunk in chunks for value in chunk.tolist()] + pending
+
+        self._flushed = self._size
+
+    def column(self, field: str) -> Column:
+        """Returns the value of `field` for each event on this edge, either as a list or as
+        a NumPy array. `edge_name` returns the name of each event.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+
+        Returns
+        -------
+        Union[List[Any], np.ndarray]
+            The values of the field, in the order the events were added.
+        """
+
+        if field == "edge_name":
+            return self._names or [self.__name__] * self._size
+
+        if field not in self._field_set:
+            raise KeyError(field)
+
+        if self._arrays is None:
+            return self._columns.get(field, [None] * self._size)
+
+        if self._arrays.get(field):
+            self._flush()
+
+        chunks = self._arrays.get(field)
+        if chunks:
+            if len(chunks) > 1:
+                chunks[:] = [np.concatenate(chunks)]
+            return chunks[0]
+
+        return self._columns.get(field, [None] * self._size)
+
+    @property
+    def _events(self) -> List[dict]:
+        """The events on this edge, each as a dict of its fields and its `edge_name`.
+
+        The dicts are created on every access, so changing them does not change the edge.
+        """
+
+        keys = self._fields + ("edge_name",)
+        columns = [self._list(field) for field in keys]
+
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def _list(self, field: str) -> List[Any]:
+        """Returns the values of `field` as a list. Fields which aren't in a NumPy array return
+        the list held by the edge rather than a copy, so it must not be changed."""
+
+        column = self.column(field)
+        return column.tolist() if isinstance(column, np.ndarray) else column
+
+    def _values(self, field: str) -> Optional[Set[Any]]:
+        """Returns the set of values of `field`, building it on the first call. Returns None if
+        the field holds values which can't be hashed."""
+
+        if self._index is None:
+            self._index = {}
+
+        if field not in self._index:
+            try:
+                self._index[field] = set(self._list(field))
+            except TypeError:
+                self._index[field] = None
+
+        return self._index[field]
+
+    def _update_index(self, entry: Dict[str, Any]) -> None:
+        """Adds the values of the event just appended to the indexed fields."""
+
+        for field, values in cast(Dict[str, Optional[Set[Any]]], self._index).items():
+            if values is None:
+                continue
+
+            if field == "edge_name":
+                value = self._names[-1] if self._names else self.__name__
+            else:
+                value = entry.get(field)
+
+            try:
+                values.add(value)
+            except TypeError:
+                self._index[field] = None  # type: ignore
+
+    def __contains__(self, data: Dict[Any, Any]):
+
+        # An edge without events holds nothing, whichever fields are looked up.
+        if not self._size:
+            return not data
+
+        for key, value in data.items():
+            if key != "edge_name" and key not in self._field_set:
+                raise KeyError(key)
+
+            if self._size >= _INDEX_MIN_EVENTS:
+                values = self._values(key)
+                if values is not None:
+                    try:
+                        if value not in values:
+                            return False
+                        continue
+                    except TypeError:
+                        # Unhashable value, fall back to scanning the field.
+                        pass
+
+            column = self.column(key)
+
+            if isinstance(column, np.ndarray):
+                if not _array_contains(column, value):
+                    return False
+            elif value not in column:
+                return False
+
+        return True
 
     def __len__(self) -> int:
-        return len(self._events)
+        return self._size
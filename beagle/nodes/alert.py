@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import DefaultDict, List, Optional
 
 from beagle.nodes.node import Node
@@ -9,6 +8,7 @@ class Alert(Node):
 
     __name__ = "Alert"
     __color__ = "#FFFF00"
+    __slots__ = ("alert_data", "alert_name")
 
     alert_data: Optional[str]
     alert_name: Optional[str]
@@ -22,12 +22,6 @@ class Alert(Node):
         self.alert_data = alert_data
         self.alert_name = alert_name
 
-        self.alerted_on = defaultdict(AlertedOn)
-
     @property
     def _display(self) -> str:
         return self.alert_name or super()._display
-
-    @property
-    def edges(self) -> List[DefaultDict]:
-        return [self.alerted_on]
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import DefaultDict, List, Optional
 
 from beagle.nodes.node import Node
@@ -11,6 +10,7 @@ class Domain(Node):
 
     __name__ = "Domain"
     __color__ = "#A52A2A"
+    __slots__ = ("domain",)
 
     domain: Optional[str]
 
@@ -20,25 +20,21 @@ class Domain(Node):
 
     def __init__(self, domain: str = None):
         self.domain = domain
-        self.resolves_to = defaultdict(ResolvesTo)
 
     @property
     def _display(self) -> str:
         return self.domain or super()._display
 
-    @property
-    def edges(self) -> List[DefaultDict]:
-        return [self.resolves_to]
-
 
 class URI(Node):
 
     __name__ = "URI"
     __color__ = "#FF00FF"
+    __slots__ = ("uri",)
 
     uri: Optional[str]
 
-    uri_of: DefaultDict[Domain, URIOf] = defaultdict(URIOf)
+    uri_of: DefaultDict[Domain, URIOf]
 
     key_fields: List[str] = ["uri"]
 
@@ -48,7 +44,3 @@ class URI(Node):
     @property
     def _display(self) -> str:
         return self.uri or super()._display
-
-    @property
-    def edges(self) -> List[DefaultDict]:
-        return [self.uri_of]
@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import TYPE_CHECKING, DefaultDict, Dict, List, Optional
 
 from beagle.nodes.node import Node
@@ -12,6 +11,7 @@ if TYPE_CHECKING:
 class File(Node):
     __name__ = "File"
     __color__ = "#3CB371"
+    __slots__ = ("host", "full_path", "file_path", "file_name", "extension", "timestamp", "hashes")
 
     host: Optional[str]
     full_path: Optional[str]
@@ -19,7 +19,7 @@ class File(Node):
     file_name: Optional[str]
     extension: Optional[str]
     timestamp: Optional[int]
-    hashes: Optional[Dict[str, str]] = {}
+    hashes: Optional[Dict[str, str]]
 
     file_of: DefaultDict["Process", FileOf]
     copied_to: DefaultDict["File", CopiedTo]
@@ -53,17 +53,10 @@ class File(Node):
         self.extension = extension
         self.hashes = hashes
 
-        self.file_of = defaultdict(FileOf)
-        self.copied_to = defaultdict(CopiedTo)
-
     def set_extension(self) -> None:
         if self.full_path:
             self.extension = self.full_path.split(".")[-1]
 
-    @property
-    def edges(self) -> List[DefaultDict]:
-        return [self.file_of, self.copied_to]
-
     @property
     def _display(self) -> str:
         return self.file_name or super()._display
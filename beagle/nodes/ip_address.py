@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import DefaultDict, List, Optional, TYPE_CHECKING
 
 from beagle.nodes.node import Node
@@ -12,6 +11,7 @@ class IPAddress(Node):
 
     __name__ = "IP Address"
     __color__ = "#87CEEB"
+    __slots__ = ("ip_address", "mac")
 
     ip_address: Optional[str]
     mac: Optional[str]
@@ -26,11 +26,6 @@ class IPAddress(Node):
         self.ip_address = ip_address
         self.mac = mac
 
-        self.connected_to = defaultdict(ConnectedTo)
-
-        self.http_request_to = defaultdict(HTTPRequestTo)
-        self.dns_query_for = defaultdict(DNSQueryFor)
-
     @property
     def _display(self) -> str:
         return self.ip_address or super()._display
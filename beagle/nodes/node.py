@@ -1,6 +1,160 @@
+import hashlib
+import math
+import numbers
+import sys
 from abc import ABCMeta
 from collections import defaultdict
-from typing import Any, Dict, List, Tuple
+from typing import Any, DefaultDict, Dict, Iterator, List, Tuple, Type
+
+# Attributes which hold the internal state of a node rather than one of its fields.
+_INTERNAL_SLOTS = {"_edge_maps", "_key", "_hash", "__dict__", "__weakref__"}
+
+_MISSING = object()
+
+
+def _encode(value: Any) -> bytes:
+    """Encodes a key value so that values which compare equal have the same encoding.
+
+    Every value is prefixed by its kind, and strings and containers by their length, so
+    that no two different tuples of values give the same bytes. Numbers are encoded as an
+    exact ratio of integers, which `1`, `1.0`, `True` and `numpy.int64(1)` all share.
+    """
+
+    if value is None:
+        return b"N"
+
+    if isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        return b"s%d:" % len(data) + data
+
+    if isinstance(value, (bytes, bytearray)):
+        return b"b%d:" % len(value) + bytes(value)
+
+    if isinstance(value, numbers.Number):
+        if isinstance(value, numbers.Complex) and not isinstance(value, numbers.Real):
+            if value.imag:
+                return b"c" + _encode(value.real) + _encode(value.imag)
+            value = value.real
+
+        if isinstance(value, numbers.Integral):
+            return b"n%d/1" % int(value)
+
+        if value != value:
+            return b"nan"
+
+        if value in (math.inf, -math.inf):
+            return b"n+inf" if value > 0 else b"n-inf"
+
+        try:
+            numerator, denominator = value.as_integer_ratio()
+        except AttributeError:
+            numerator, denominator = float(value).as_integer_ratio()
+
+        return b"n%d/%d" % (numerator, denominator)
+
+    if isinstance(value, (tuple, list)):
+        kind = b"t" if isinstance(value, tuple) else b"l"
+        return kind + b"%d:" % len(value) + b"".join(_encode(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+        items = sorted(_encode(item) for item in value)
+        return b"S%d:" % len(items) + b"".join(items)
+
+    if isinstance(value, dict):
+        items = sorted(_encode(key) + _encode(item) for key, item in value.items())
+        return b"d%d:" % len(items) + b"".join(items)
+
+    return b"r" + _encode(f"{value.__class__.__name__}:{value!r}")
+
+
+def _stable_hash(values: Tuple) -> int:
+    """Hashes a tuple of plain values (strings, numbers, None) into a signed 64-bit integer.
+
+    Unlike the built-in `hash()`, which is randomized for strings in every interpreter,
+    this returns the same value across runs, processes and machines. Values which compare
+    equal, such as `1` and `1.0`, have the same hash, see :py:func:`_encode`.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(_encode(values), digest_size=8).digest(), "big", signed=True
+    )
+
+
+def _restore_node(cls: Type["Node"], key: Dict[str, Any]) -> "Node":
+    """Recreates a node with only its key fields set, see :py:meth:`Node.__reduce__`"""
+    node = cls.__new__(cls)
+    for field, value in key.items():
+        setattr(node, field, value)
+    return node
+
+
+class KeyField(object):
+    """Descriptor for a field listed in `key_fields`, which clears the cached key and hash
+    of the node whenever the field is set, see :py:meth:`Node.__hash__`.
+
+    The value itself is kept where it would be without the descriptor: in the slot of the
+    field if the class declares one, or in the instance `__dict__` otherwise.
+    """
+
+    __slots__ = ("name", "slot", "default")
+
+    def __init__(self, name: str, slot: Any = None, default: Any = _MISSING) -> None:
+        self.name = name
+        self.slot = slot
+        self.default = default
+
+    def __get__(self, instance: "Node", owner: type) -> Any:
+        if instance is None:
+            return self
+
+        if self.slot is not None:
+            return self.slot.__get__(instance, owner)
+
+        value = instance.__dict__.get(self.name, self.default)
+        if value is _MISSING:
+            raise AttributeError(self.name)
+        return value
+
+    def __set__(self, instance: "Node", value: Any) -> None:
+        if self.slot is not None:
+            self.slot.__set__(instance, value)
+        else:
+            instance.__dict__[self.name] = value
+
+        instance._key = instance._hash = None
+
+
+class EdgeMap(object):
+    """Descriptor for an edge attribute of a node, such as `Process.wrote`.
+
+    The `defaultdict` holding the edges is only created the first time the attribute is
+    used, and is kept in the `_edge_maps` dict of the node. Most nodes only have edges of
+    one or two types, so this avoids allocating a dict for every other edge type.
+
+    :py:class:`Node` sets one up for every attribute annotated as a `DefaultDict` of edges,
+    so node classes only need the annotation::
+
+        class Process(Node):
+            wrote: DefaultDict[File, Wrote]
+    """
+
+    __slots__ = ("name", "edge_cls")
+
+    def __init__(self, name: str, edge_cls: type) -> None:
+        self.name = name
+        self.edge_cls = edge_cls
+
+    def __get__(self, instance: "Node", owner: type) -> Any:
+        if instance is None:
+            return self
+
+        maps = instance._get_edge_maps()
+        edges = maps.get(self.name)
+        if edges is None:
+            edges = maps[self.name] = defaultdict(self.edge_cls)
+        return edges
+
+    def __set__(self, instance: "Node", value: DefaultDict) -> None:
+        instance._get_edge_maps()[self.name] = value
 
 
 class Node(object, metaclass=ABCMeta):
@@ -9,12 +163,115 @@ class Node(object, metaclass=ABCMeta):
     __name__ = "Node"
     __color__ = "#FFFFFF"
 
+    __slots__: Tuple[str, ...] = ("_edge_maps", "_key", "_hash")
+
     key_fields: List[str] = []
 
+    # Names of the fields stored in slots, across the whole class hierarchy.
+    _slot_fields: Tuple[str, ...] = ()
+
     def __init_subclass__(cls, **kwargs):
         if "key_fields" not in cls.__annotations__:
             raise RuntimeError(f"A Node sublcass **must** contain the key_fields annotation")
 
+        # Edge attributes are created on first access, see `EdgeMap`. A `defaultdict` set
+        # on the class itself would be shared by every instance, so it is replaced as well.
+        for name, annotation in cls.__dict__.get("__annotations__", {}).items():
+            if getattr(annotation, "__origin__", None) is not defaultdict:
+                continue
+
+            edge_cls = annotation.__args__[1]
+            if isinstance(cls.__dict__.get(name, defaultdict()), defaultdict):
+                setattr(cls, name, EdgeMap(name, edge_cls))
+
+        for name in cls.key_fields:
+            cls._wrap_key_field(name)
+
+        cls._slot_fields = tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+            if name not in _INTERNAL_SLOTS
+        )
+
+    @classmethod
+    def _wrap_key_field(cls, name: str) -> None:
+        """Replaces the key field `name` with a :py:class:`KeyField`, keeping its slot or
+        class level default."""
+
+        for klass in cls.__mro__:
+            if name not in klass.__dict__:
+                continue
+
+            current = klass.__dict__[name]
+            if isinstance(current, KeyField):
+                return
+
+            if type(current).__name__ == "member_descriptor":
+                setattr(cls, name, KeyField(name, slot=current))
+            else:
+                setattr(cls, name, KeyField(name, default=current))
+            return
+
+        setattr(cls, name, KeyField(name))
+
+    def _get_edge_maps(self) -> Dict[str, DefaultDict]:
+        try:
+            return self._edge_maps
+        except AttributeError:
+            self._edge_maps: Dict[str, DefaultDict] = {}
+            return self._edge_maps
+
+    def _attributes(self) -> Iterator[Tuple[str, Any]]:
+        """Yields the name and value of each field set on this node, without its edges."""
+
+        for name in self._slot_fields:
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                continue
+
+        for name, value in getattr(self, "__dict__", {}).items():
+            if not isinstance(value, defaultdict):
+                yield name, value
+
+    def _intern_fields(self) -> None:
+        """Replaces each string field of this node with its interned copy (see `sys.intern`).
+
+        Values such as hosts, image names and directories are repeated across many nodes,
+        and are otherwise stored once per node. Interned strings are freed once no node
+        uses them anymore.
+        """
+
+        node_hash = getattr(self, "_hash", None)
+
+        for name in self._slot_fields:
+            value = getattr(self, name, None)
+            if type(value) is str:
+                interned = sys.intern(value)
+                if interned is not value:
+                    setattr(self, name, interned)
+
+        fields = getattr(self, "__dict__", None)
+        if fields:
+            for name, value in fields.items():
+                if type(value) is str:
+                    fields[name] = sys.intern(value)
+
+        # The cached key may hold the previous strings. The interned strings are equal to
+        # them, so the hash did not change.
+        self._key = None
+        self._hash = node_hash
+
+    def _edge_items(self) -> Iterator[Tuple[str, DefaultDict]]:
+        """Yields the name and `defaultdict` of each edge attribute used on this node."""
+
+        yield from getattr(self, "_edge_maps", {}).items()
+
+        for name, value in getattr(self, "__dict__", {}).items():
+            if isinstance(value, defaultdict):
+                yield name, value
+
     @property
     def __key(self) -> Tuple[str, ...]:
         """The __key is a tuple which contains the elements which make this Node unique.
@@ -58,12 +315,22 @@ class Node(object, metaclass=ABCMeta):
         ("1", 1)
 
         """
-        return tuple(getattr(self, val) for val in self.key_fields)
+
+        # Cached until one of the key fields is set, see `KeyField`.
+        try:
+            key = self._key
+        except AttributeError:
+            key = None
+
+        if key is None:
+            key = self._key = tuple(getattr(self, val) for val in self.key_fields)
+
+        return key
 
     def __eq__(self, other: object) -> bool:
         """Two Node objects are equal if their __key tuple are equal"""
 
-        return isinstance(other, self.__class__) and self.__key == other.__key
+        return self is other or (isinstance(other, self.__class__) and self.__key == other.__key)
 
     def __hash__(self) -> int:
         """The hashcode of a Node is the hash of its __key tuple, and it's class.
@@ -71,8 +338,34 @@ class Node(object, metaclass=ABCMeta):
         The __name__ param is injected into the hash so that if two Nodes from two
         different classes happen to have the same __key value, they are do not have
         a colliding hash.
+
+        The hash is a stable 64-bit hash rather than the built-in `hash()` of the tuple,
+        so the same node has the same hash in every process and run. Backends use it
+        as the ID of the node.
+
+        The hash is computed once, and cached until one of the key fields is set.
         """
-        return hash(self.__key + (self.__class__.__name__,))
+        try:
+            node_hash = self._hash
+        except AttributeError:
+            node_hash = None
+
+        if node_hash is None:
+            node_hash = self._hash = _stable_hash(self.__key + (self.__class__.__name__,))
+
+        return node_hash
+
+    def __reduce__(self) -> tuple:
+        """Pickles the node so that its key fields are restored before the rest of its state.
+
+        Edge dicts are keyed by other nodes, which may point back to this node. Restoring the
+        key fields first means this node is hashable by the time those dicts are rebuilt,
+        which allows nodes to be sent to and from worker processes.
+        """
+        key = {field: getattr(self, field, None) for field in self.key_fields}
+        state = dict(self._attributes())
+        state.update(self._edge_items())
+        return (_restore_node, (self.__class__, key), (None, state))
 
     def __repr__(self) -> str:
         return (
@@ -102,38 +395,34 @@ class Node(object, metaclass=ABCMeta):
 
         # Otherwise, update the node
 
-        for key, value in node.__dict__.items():
-
-            # NOTE: Skips edge combination because edge data is
-            # added anyway in self.insert_node()
-            if isinstance(value, defaultdict):
-
-                for dest_node, edge_data in value.items():
+        key_fields = self.key_fields
 
-                    events = edge_data._events
+        for key, value in node._attributes():
+            # Always use the latest value. Key fields are already equal, and setting them
+            # would clear the cached hash.
+            if value and key not in key_fields:
+                setattr(self, key, sys.intern(value) if type(value) is str else value)
 
-                    relationship = getattr(self, key)[dest_node]
+        for key, edge_map in node._edge_items():
 
-                    for event in events:
-                        event.pop("edge_name")
-                        relationship.append(**event)
+            relationships = getattr(self, key)
 
-            # Always use the latest value.
-            elif value:
-                setattr(self, key, value)
+            for dest_node, edge_data in edge_map.items():
+                # Copies all of the events at once, see `Edge.extend`.
+                relationships[dest_node].extend(edge_data)
 
     @property
-    def edges(self) -> List:
-        """Returns an empty list, so that all nodes can have their
-        edges iterated on, even if they have no outgoing edges.
+    def edges(self) -> List[DefaultDict]:
+        """Returns the edge dicts of this node. Edge types which were never used on this
+        node are left out, so a node without edges returns an empty list.
 
         Returns
         -------
-        List
-            []
+        List[DefaultDict]
+            The `defaultdict` of each edge type used on this node.
         """
 
-        return [attr for attr in self.__dict__.values() if isinstance(attr, defaultdict)]
+        return [edge_map for _, edge_map in self._edge_items()]
 
     @property
     def _display(self) -> str:
@@ -184,6 +473,4 @@ class Node(object, metaclass=ABCMeta):
         {"x": "1", "y": 1}
         """
 
-        return {
-            key: value for key, value in self.__dict__.items() if not isinstance(value, defaultdict)
-        }
+        return dict(self._attributes())
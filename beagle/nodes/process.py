@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import DefaultDict, Dict, List, Optional
 
 from beagle.nodes.domain import URI, Domain
@@ -28,6 +27,16 @@ from beagle.edges import (
 class Process(Node):
     __name__ = "Process"
     __color__ = "#FF0000"
+    __slots__ = (
+        "host",
+        "user",
+        "process_id",
+        "process_path",
+        "process_image",
+        "process_image_path",
+        "command_line",
+        "hashes",
+    )
     key_fields: List[str] = ["host", "process_id", "process_image"]
 
     host: Optional[str]
@@ -37,7 +46,7 @@ class Process(Node):
     process_image: Optional[str]
     process_image_path: Optional[str]
     command_line: Optional[str]
-    hashes: Optional[Dict[str, str]] = {}
+    hashes: Optional[Dict[str, str]]
 
     # Process edges
     launched: DefaultDict["Process", Launched]  # List of launched processes
@@ -91,22 +100,6 @@ class Process(Node):
             else:
                 self.process_path = f"{process_image_path}\\{process_image}"
 
-        # Edge dicts
-        self.wrote = defaultdict(Wrote)
-        self.accessed = defaultdict(Accessed)
-        self.copied = defaultdict(Copied)
-        self.launched = defaultdict(Launched)
-        self.deleted = defaultdict(Deleted)
-        self.connected_to = defaultdict(ConnectedTo)
-        self.http_request_to = defaultdict(HTTPRequestTo)
-        self.dns_query_for = defaultdict(DNSQueryFor)
-        self.loaded = defaultdict(Loaded)
-        self.changed_value = defaultdict(ChangedValue)
-        self.created_key = defaultdict(CreatedKey)
-        self.deleted_value = defaultdict(DeletedValue)
-        self.read_key = defaultdict(ReadKey)
-        self.deleted_key = defaultdict(DeletedKey)
-
     def get_file_node(self) -> File:
         return File(
             host=self.host,
@@ -115,25 +108,6 @@ class Process(Node):
             hashes=self.hashes,
         )
 
-    @property
-    def edges(self) -> List[DefaultDict]:
-        return [
-            self.wrote,
-            self.accessed,
-            self.copied,
-            self.launched,
-            self.deleted,
-            self.connected_to,
-            self.http_request_to,
-            self.dns_query_for,
-            self.loaded,
-            self.changed_value,
-            self.created_key,
-            self.deleted_value,
-            self.deleted_key,
-            self.read_key,
-        ]
-
     @property
     def _display(self) -> str:
         return self.process_image or super()._display
@@ -144,6 +118,8 @@ class SysMonProc(Process):
     the unique Sysmon process_guid identifier.
     """
 
+    __slots__ = ("process_guid",)
+
     key_fields: List[str] = ["process_guid"]
     process_guid: Optional[str]
 
@@ -7,6 +7,7 @@ class RegistryKey(Node):
 
     __name__ = "Registry Key"
     __color__ = "#808000"
+    __slots__ = ("host", "hive", "key_path", "key", "value", "value_type")
 
     host: Optional[str]
     hive: Optional[str]
@@ -1,12 +1,35 @@
 import multiprocessing as mp
+import os
+import time
 from abc import ABCMeta, abstractmethod
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from queue import Queue
-from threading import Thread, current_thread
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Any
+from threading import Lock, Thread, current_thread, local
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 
 from beagle.backends.networkx import NetworkX
-from beagle.common import logger
+from beagle.common import current_rss, dedup_nodes, logger, merge_nodes
+from beagle.common.checkpoint import load_checkpoint, save_checkpoint
+from beagle.common.memory import MemoryBudgetExceeded, node_memory_usage
+from beagle.common.report import LatencyHistogram, RunReport
+from beagle.config import Config
 from beagle.datasources import DataSource
 from beagle.nodes import Node
 
@@ -15,11 +38,99 @@ _THREAD_COUNT = mp.cpu_count()
 # Object to signal termination of processing.
 _SENTINEL = object()
 
+# Supported values for the `execution` parameter.
+_EXECUTION_MODES = ["thread", "process"]
+
+# How long the producer sleeps between memory checks while over `max_rss_mb`.
+_THROTTLE_INTERVAL = 0.05
+
+N = TypeVar("N", bound=Node)
+
+# Transformer instance used by each worker process when `execution="process"`.
+_PROCESS_TRANSFORMER: Optional["Transformer"] = None
+
 
 if TYPE_CHECKING:
     from beagle.backends.base_backend import Backend
 
 
+def handles(*keys: Hashable) -> Callable:
+    """Registers a transformer method as the handler for one or more event keys.
+    See :py:meth:`Transformer.dispatch`.
+
+    Examples
+    --------
+
+    >>> class MyTransformer(Transformer):
+            def event_key(self, event: dict) -> Hashable:
+                return event["event_type"]
+
+            def transform(self, event: dict) -> Optional[Tuple[Node, ...]]:
+                return self.dispatch(event)
+
+            @handles("process_launched")
+            def make_process(self, event: dict) -> Tuple[Process]:
+                ...
+
+    Parameters
+    ----------
+    keys : Hashable
+        The event keys the method handles.
+    """
+
+    def _decorator(func: Callable) -> Callable:
+        func._handles = getattr(func, "_handles", ()) + keys  # type: ignore
+        return func
+
+    return _decorator
+
+
+def _init_process_worker(transformer_cls: Type["Transformer"]) -> None:
+    """Creates the transformer instance used by a worker process. The datasource is
+    never read inside of a worker, so the instance is created without one.
+    """
+    global _PROCESS_TRANSFORMER
+    _PROCESS_TRANSFORMER = transformer_cls(datasource=None)  # type: ignore
+
+
+def _transform_batch(
+    events: List[dict],
+) -> Tuple[List[Node], List[Exception], Counter, Dict[str, LatencyHistogram]]:
+    """Transforms a batch of events inside of a worker process.
+
+    Returns
+    -------
+    Tuple[List[Node], List[Exception], Counter, Dict[str, LatencyHistogram]]
+        The de-duplicated nodes created from the batch, any exceptions raised
+        while transforming, the counts of events without a handler, and the
+        handler latencies.
+    """
+
+    transformer = cast("Transformer", _PROCESS_TRANSFORMER)
+
+    nodes: Dict[int, Node] = {}
+    errors: List[Exception] = []
+
+    transformer.unhandled = Counter()
+    transformer.report = RunReport()
+    transformer._registry.nodes = nodes
+
+    try:
+        for event in events:
+            try:
+                result = transformer._timed_transform(event)
+            except Exception as e:
+                errors.append(e)
+                continue
+
+            if result:
+                merge_nodes(nodes, result)
+    finally:
+        transformer._registry.nodes = None
+
+    return list(nodes.values()), errors, transformer.unhandled, transformer.report.handlers
+
+
 class Transformer(object, metaclass=ABCMeta):
     """Base Transformer class. This class implements a producer/consumer queue
     from the datasource to the :py:meth:`transform` method. Producing the list
@@ -29,17 +140,143 @@ class Transformer(object, metaclass=ABCMeta):
     ----------
     datasource : DataSource
         The `DataSource` to get events from.
-
+    execution : str, optional
+        Either "thread" or "process". When set to "process", batches of events are sent
+        to a pool of worker processes instead of consumer threads, which allows
+        :py:meth:`transform` to make use of more than a single core.
+        (the default is Config.get("transformer", "execution"), which pulls from the configuration file)
+    workers : int, optional
+        The number of consumer threads or worker processes to use
+        (the default is Config.get("transformer", "workers"), falling back to the CPU count - 1)
+    batch_size : int, optional
+        The number of events handed to a consumer thread or worker process at a time
+        (the default is int(Config.get("transformer", "batch_size")), which pulls from the configuration file)
+    queue_size : int, optional
+        The maximum number of batches waiting to be transformed. Once reached, the producer
+        blocks until a batch is consumed.
+        (the default is int(Config.get("transformer", "queue_size")), which pulls from the configuration file)
+    max_rss_mb : int, optional
+        If set, the producer stops reading from the datasource while the resident memory of
+        the process is above this many megabytes, until the pending batches are transformed.
+        (the default is Config.get("transformer", "max_rss_mb"), which is unset)
+    checkpoint : str, optional
+        Path of a checkpoint file. When set, :py:meth:`run` periodically saves the position
+        in the datasource and the nodes created so far to this file. If the file exists when
+        :py:meth:`run` is called, and was saved reading the same input, the run resumes from
+        it instead of starting over. The file is removed once the run completes.
+    checkpoint_interval : int, optional
+        The number of events read between two checkpoints
+        (the default is int(Config.get("transformer", "checkpoint_interval")), which pulls from the configuration file)
+    memory_budget_mb : int, optional
+        If set, reading from the datasource stops with a
+        :py:class:`beagle.common.memory.MemoryBudgetExceeded` error once the resident memory
+        of the process is above this many megabytes. The error lists the node and edge types
+        using the most memory.
+        (the default is Config.get("transformer", "memory_budget_mb"), which is unset)
+    memory_report : bool, optional
+        Adds the memory used by each node and edge type to the run report, see
+        :py:func:`beagle.common.memory.node_memory_usage`. Measuring takes about half as long
+        as building the graph.
+        (the default is Config.getboolean("transformer", "memory_report"), which is False)
+
+    Subclasses can route events to their handlers using a dispatch table instead of
+    comparing each event against every event type, see :py:func:`handles` and
+    :py:meth:`dispatch`. Handlers can pass the nodes they create through
+    :py:meth:`get_or_create`, so that edges are added to a single instance of each node.
     """
 
-    def __init__(self, datasource: DataSource) -> None:
+    # Mapping of event key to the name of the method handling it, built from the
+    # methods decorated with `handles`.
+    _handlers: Dict[Hashable, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        handlers: Dict[Hashable, str] = {}
+
+        # Walk the MRO in reverse so that subclasses override their parents.
+        for klass in reversed(cls.__mro__):
+            for attr, value in klass.__dict__.items():
+                for key in getattr(value, "_handles", ()):
+                    handlers[key] = attr
+
+        cls._handlers = handlers
+
+    def __init__(
+        self,
+        datasource: DataSource,
+        execution: str = Config.get("transformer", "execution"),
+        workers: Optional[int] = None,
+        batch_size: int = int(Config.get("transformer", "batch_size")),
+        queue_size: int = int(Config.get("transformer", "queue_size")),
+        max_rss_mb: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: int = int(Config.get("transformer", "checkpoint_interval")),
+        memory_budget_mb: Optional[int] = None,
+        memory_report: bool = Config.getboolean("transformer", "memory_report"),
+    ) -> None:
+
+        if execution not in _EXECUTION_MODES:
+            raise ValueError(f"execution must be one of {_EXECUTION_MODES}, got {execution}")
+
+        if workers is None:
+            workers = int(Config.get("transformer", "workers") or max(_THREAD_COUNT - 1, 1))
+
+        if max_rss_mb is None and Config.get("transformer", "max_rss_mb"):
+            max_rss_mb = int(Config.get("transformer", "max_rss_mb"))
+
+        if memory_budget_mb is None and Config.get("transformer", "memory_budget_mb"):
+            memory_budget_mb = int(Config.get("transformer", "memory_budget_mb"))
 
         self.count = 0
-        self._queue: Queue = Queue()
+        self.queue_size = max(queue_size, 1)
+        self._queue: Queue = Queue(maxsize=self.queue_size)
+        self._pending: Set[Future] = set()
         self.datasource = datasource
+        self.execution = execution
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.memory_budget = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
         self.nodes: List[Node] = []
         self.errors: Dict[Thread, List[Exception]] = {}
 
+        # Set by `stream()`, nodes are sent here instead of `self.nodes` when present.
+        self._output: Optional[Queue] = None
+        self._stopped = False
+        self._node_count = 0
+        self._collected: Dict[int, Node] = {}
+
+        # Nodes held by each consumer thread, and the first failure of the producer thread.
+        self._seen: Dict[Thread, Dict[int, Node]] = {}
+        self._failure: Optional[Exception] = None
+
+        # Nodes created by the current consumer thread or worker batch, see `get_or_create`.
+        self._registry = local()
+
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = max(checkpoint_interval, 1)
+        # Number of events to skip when reading the datasource, and the event count at the
+        # time of the last checkpoint.
+        self._position = 0
+        self._last_checkpoint = 0
+        # Identity of the datasource, stored in checkpoints, see `DataSource.identity`.
+        self._identity: Optional[Dict[str, Any]] = None
+
+        # Number of events seen per event key which had no handler, see `dispatch`.
+        self.unhandled: Counter = Counter()
+
+        # Counts and handler latencies of the batch being transformed by the current consumer
+        # thread, merged into `unhandled` and the report once the batch is done, so consumers
+        # don't take a lock for every event.
+        self._batch_stats = local()
+        self._stats_lock = Lock()
+
+        # Timings and counts of the run, passed on to the backend by `to_graph`.
+        self.report = RunReport()
+        if memory_report:
+            self.report.memory = {}
+
     def to_graph(self, backend: "Backend" = NetworkX, *args, **kwargs) -> Any:
         """Graphs the nodes created by :py:meth:`run`. If no backend is specific,
         the default used is NetworkX.
@@ -57,16 +294,35 @@ class Transformer(object, metaclass=ABCMeta):
 
         nodes = self.run()
 
-        backend = backend(nodes=nodes, metadata=self.datasource.metadata(), *args, **kwargs)
+        backend = backend(
+            nodes=nodes, metadata=self.datasource.metadata(), report=self.report, *args, **kwargs
+        )
         return backend.graph()
 
     def run(self) -> List[Node]:
         """Generates the list of nodes from the datasource.
 
         This methods kicks off a producer/consumer queue. The producer grabs events
-        one by one from the datasource by iterating over the events from the `events`
-        generator. Each event is then sent to the :py:meth:`transformer` function to be
-        transformer into one or more `Node` objects.
+        from the datasource by iterating over the events from the `events` generator, and
+        places them on the queue in batches of `batch_size`. Each event in a batch is then
+        sent to the :py:meth:`transformer` function to be transformer into one or more
+        `Node` objects.
+
+        Each consumer merges the nodes it creates into its own identity map, so that the
+        same entity seen in many events is only kept once per consumer. Once all events
+        are transformed, the nodes from all consumers are merged into the final list.
+
+        If the transformer was created with `execution="process"`, the batches are instead
+        transformed by a pool of worker processes, see :py:meth:`_run_processes`.
+
+        If the transformer was created with a `checkpoint` path, progress is saved every
+        `checkpoint_interval` events, and a run interrupted by an error resumes from the last
+        checkpoint the next time it is started::
+
+            >>> transformer = DARPATCJson("ta1-cadets.json").to_transformer(checkpoint="cadets.ckpt")
+            >>> transformer.run()  # Fails half way through.
+            >>> transformer = DARPATCJson("ta1-cadets.json").to_transformer(checkpoint="cadets.ckpt")
+            >>> transformer.run()  # Continues from the last checkpoint.
 
         Returns
         -------
@@ -74,7 +330,144 @@ class Transformer(object, metaclass=ABCMeta):
             All Nodes created from the data source.
         """
 
-        logger.debug("Launching transformer")
+        self._resume()
+
+        self._process_events()
+
+        # Reduce the nodes pre-merged by each consumer.
+        self.nodes = dedup_nodes(self.nodes)
+
+        if self.report.memory is not None:
+            self.report.memory["nodes"] = node_memory_usage(self.nodes)
+
+        self._check_memory_budget(self.nodes)
+
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+        return self.nodes
+
+    def stream(self, batch_size: int = 1000) -> Generator[List[Node], None, None]:
+        """Generates the nodes from the datasource in batches, as they are created.
+
+        Uses the same producer/consumer queue as :py:meth:`run`, but instead of collecting
+        every node into `self.nodes`, nodes are yielded as soon as `batch_size` of them
+        are available. This allows the next stage to start before the whole datasource
+        is transformed. Transforming pauses while batches are not being consumed, so memory
+        use is bounded by `queue_size` rather than the size of the input.
+
+        Nodes representing the same entity may appear in more than one batch, backends
+        de-duplicate them when they are added.
+
+        Examples
+        --------
+
+        >>> backend = NetworkX(nodes=[], consolidate_edges=True)
+        >>> for nodes in SysmonEVTX("sysmon.evtx").to_transformer().stream(batch_size=5000):
+                backend.add_nodes(nodes)
+
+        Parameters
+        ----------
+        batch_size : int, optional
+            The number of nodes in each yielded batch (the default is 1000). The last batch
+            may be smaller.
+
+        Returns
+        -------
+        Generator[List[Node], None, None]
+            Lists of nodes created from the datasource.
+        """
+
+        if self.checkpoint:
+            logger.warning("Checkpoints are only saved by run(), not when streaming")
+
+        self._output = Queue(maxsize=self.queue_size)
+        self._stopped = False
+
+        failures: List[Exception] = []
+
+        def _runner() -> None:
+            try:
+                self._process_events()
+            except Exception as e:
+                failures.append(e)
+            finally:
+                self._output.put(_SENTINEL)  # type: ignore
+
+        runner = Thread(target=_runner)
+        runner.start()
+
+        buffer: List[Node] = []
+        finished = False
+
+        try:
+            while True:
+                nodes = self._output.get()
+
+                if nodes is _SENTINEL:
+                    finished = True
+                    break
+
+                buffer += nodes
+
+                while len(buffer) >= batch_size:
+                    yield buffer[:batch_size]
+                    buffer = buffer[batch_size:]
+
+            if buffer:
+                yield buffer
+        finally:
+            # If the caller stopped iterating early, stop reading the datasource and
+            # drain the output so that the consumers are not left blocked.
+            if not finished:
+                self._stopped = True
+                while self._output.get() is not _SENTINEL:
+                    pass
+
+            runner.join()
+            self._output = None
+
+        if failures:
+            raise failures[0]
+
+    def _process_events(self) -> None:
+        """Runs the events from the datasource through the consumer threads or worker
+        processes, depending on `execution`."""
+
+        logger.debug(f"Launching transformer using {self.execution} execution")
+
+        start = time.time()
+
+        with self.report.stage("transform"):
+            if self.execution == "process":
+                self._run_processes()
+            else:
+                self._run_threads()
+
+        elapsed = time.time() - start
+
+        self.report.events = self.count
+        self.report.nodes_created = self._node_count
+        self.report.errors = sum(len(errors) for errors in self.errors.values())
+        self.report.unhandled = self.unhandled
+
+        logger.info(f"Finished processing of events, created {self._node_count} nodes.")
+        logger.info(
+            f"Transformed {self.count} events in {elapsed:.2f}s "
+            + f"({self.count / max(elapsed, 1e-6):.0f} events/sec)"
+        )
+
+        if any([len(x) > 0 for x in self.errors.values()]):
+            logger.warning(f"Parsing finished with errors.")
+            logger.debug(self.errors)
+
+        if self.unhandled:
+            logger.info(
+                f"Skipped {sum(self.unhandled.values())} events without a handler: "
+                + f"{dict(self.unhandled.most_common(10))}"
+            )
+
+    def _run_threads(self) -> None:
 
         threads: List[Thread] = []
 
@@ -85,9 +478,7 @@ class Transformer(object, metaclass=ABCMeta):
 
         logger.debug("Started producer thread")
 
-        consumer_count = _THREAD_COUNT - 1
-        if consumer_count == 0:
-            consumer_count = 1
+        consumer_count = self.workers
 
         for i in range(consumer_count):
             t = Thread(target=self._consumer_thread)
@@ -95,7 +486,7 @@ class Transformer(object, metaclass=ABCMeta):
             t.start()
             threads.append(t)
 
-        logger.debug(f"Started {_THREAD_COUNT-1} consumer threads")
+        logger.debug(f"Started {consumer_count} consumer threads")
 
         # Wait for the producer to finish
         producer_thread.join()
@@ -108,48 +499,499 @@ class Transformer(object, metaclass=ABCMeta):
         for thread in threads:
             thread.join()
 
-        logger.info(f"Finished processing of events, created {len(self.nodes)} nodes.")
+        if self._failure is not None:
+            raise self._failure
 
-        if any([len(x) > 0 for x in self.errors.values()]):
-            logger.warning(f"Parsing finished with errors.")
-            logger.debug(self.errors)
+    def _run_processes(self) -> None:
+        """Sends batches of events to a pool of worker processes, and merges the nodes
+        returned by each of them into `self.nodes`.
 
-        return self.nodes
+        At most `queue_size` batches are in flight at a time, so that a fast datasource
+        does not get read entirely into memory before being transformed.
+        """
 
-    def _producer_thread(self) -> None:
+        self.errors[current_thread()] = []
+
+        # Identity map for the nodes returned by the workers. Streamed batches are sent
+        # out as they arrive instead.
+        self._collected = {}
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_process_worker,
+            initargs=(self.__class__,),
+        ) as executor:
+
+            logger.debug(f"Started {self.workers} worker processes")
+
+            for batch in self._batches():
+                self._pending.add(executor.submit(_transform_batch, batch))
+
+                if len(self._pending) >= self.queue_size:
+                    self._collect_completed()
+
+            while self._pending:
+                self._collect_completed()
+
+        self._emit(list(self._collected.values()))
+        self._collected = {}
+
+    def _collect_completed(self) -> None:
+        """Waits for at least one in flight batch to finish, and collects all finished batches."""
+        done, self._pending = wait(self._pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            self._collect_batch(future)
+
+    def _batches(self) -> Generator[List[dict], None, None]:
+        """Groups the events from the datasource into lists of at most `batch_size` events.
+
+        The event types of :py:meth:`accepted_event_types` are passed to the datasource while
+        it is read, and its previous event types are restored afterwards, so that reading the
+        same datasource again, or from another transformer, isn't filtered by this one.
+        """
+        batch: List[dict] = []
         i = 0
-        for element in self.datasource.events():
-            self._queue.put(element, block=True)
-            i += 1
 
-        logger.debug(f"Producer Thread {current_thread().name} finished after {i} events")
+        previous_event_types = self.datasource._event_types
+        self.datasource.set_event_types(self.accepted_event_types())
+
+        try:
+            for element in self.datasource.events_from(self._position):
+                if self._stopped:
+                    break
+
+                batch.append(element)
+                i += 1
+
+                if len(batch) >= self.batch_size:
+                    self.count += len(batch)
+                    self._throttle()
+                    self._check_memory_budget()
+                    self.report.sample_queue(self._backlog())
+                    yield batch
+                    batch = []
+                    self._save_checkpoint()
+        finally:
+            self.datasource.set_event_types(previous_event_types)
+
+        if batch:
+            self.count += len(batch)
+            yield batch
+
+        logger.debug(f"Finished reading datasource after {i} events")
+
+    def _resume(self) -> None:
+        """Restores the position and nodes saved in `checkpoint`, if it exists and was saved
+        by the same transformer reading the same input, see :py:meth:`DataSource.identity`."""
+
+        if not self.checkpoint:
+            return
+
+        self._identity = self.datasource.identity()
+
+        checkpoint = load_checkpoint(self.checkpoint)
+        if checkpoint is None:
+            return
+
+        state, nodes = checkpoint
+
+        if state["transformer"] != self.__class__.__name__ or state["datasource"] != (
+            self.datasource.__class__.__name__
+        ):
+            logger.warning(
+                f"Ignoring checkpoint {self.checkpoint}, it was created by {state['transformer']} "
+                + f"reading from {state['datasource']}"
+            )
+            return
+
+        if state.get("identity") != self._identity:
+            logger.warning(
+                f"Ignoring checkpoint {self.checkpoint}, it was created reading from another "
+                + f"input of {state['datasource']}"
+            )
+            return
+
+        self._position = self._last_checkpoint = self.count = state["position"]
+        self.unhandled.update(state["unhandled"])
+        self.nodes = nodes
+        self._node_count = len(nodes)
+
+        logger.info(
+            f"Resuming from checkpoint {self.checkpoint} after {self._position} events, "
+            + f"with {len(nodes)} nodes"
+        )
+
+    def _save_checkpoint(self) -> None:
+        """Saves a checkpoint once `checkpoint_interval` events were read since the last one.
+
+        The datasource is not read until every batch read so far is transformed, so that
+        the saved nodes match the saved position exactly.
+        """
+
+        if (
+            not self.checkpoint
+            or self._output is not None
+            or self.count - self._last_checkpoint < self.checkpoint_interval
+        ):
+            return
+
+        start = time.time()
+
+        nodes = self._held_nodes()
+
+        save_checkpoint(
+            self.checkpoint,
+            state={
+                "transformer": self.__class__.__name__,
+                "datasource": self.datasource.__class__.__name__,
+                "identity": self._identity,
+                "position": self.count,
+                "unhandled": self.unhandled,
+            },
+            nodes=nodes,
+        )
+
+        self._last_checkpoint = self.count
+
+        logger.debug(
+            f"Saved checkpoint after {self.count} events with {len(nodes)} nodes "
+            + f"in {time.time() - start:.2f}s"
+        )
+
+    def _backlog(self) -> int:
+        """The number of batches read from the datasource which are not yet transformed."""
+        return self._queue.unfinished_tasks + len(self._pending)
+
+    def _held_nodes(self) -> List[Node]:
+        """Waits until every batch read so far is transformed, and returns all of the nodes
+        created until now, including those still held by consumers."""
+
+        if self.execution == "process":
+            while self._pending:
+                self._collect_completed()
+        else:
+            self._queue.join()
+
+        return (
+            self.nodes
+            + [node for seen in self._seen.values() for node in seen.values()]
+            + list(self._collected.values())
+        )
+
+    def _check_memory_budget(self, nodes: Optional[List[Node]] = None) -> None:
+        """Raises :py:class:`MemoryBudgetExceeded` if the process uses more memory than
+        `memory_budget_mb`, with the memory used by each type of node and edge in `nodes`.
+        If `nodes` is not given, the nodes created so far are measured. When streaming, those
+        were already handed off, so no breakdown is given."""
+
+        if self.memory_budget is None:
+            return
+
+        rss = current_rss() or 0
+        if rss < self.memory_budget:
+            return
+
+        if nodes is None:
+            nodes = self._held_nodes() if self._output is None else []
+
+        error = MemoryBudgetExceeded(self.memory_budget, rss, node_memory_usage(nodes))
+        logger.critical(str(error))
+
+        self._stopped = True
+        raise error
+
+    def _throttle(self) -> None:
+        """Blocks reading from the datasource while the memory ceiling is exceeded.
+
+        Reading resumes once the memory drops, or once there are no more batches waiting
+        to be transformed, since at that point waiting would not free up any memory.
+        """
+
+        if self.max_rss is None or (current_rss() or 0) < self.max_rss:
+            return
+
+        logger.warning(
+            f"Memory usage above {self.max_rss // (1024 * 1024)}MB, pausing datasource reads"
+        )
+
+        while self._backlog() > 0 and (current_rss() or 0) >= self.max_rss:
+            if self._pending:
+                self._collect_completed()
+            else:
+                time.sleep(_THROTTLE_INTERVAL)
+
+    def _collect_batch(self, future: Future) -> None:
+        nodes, errors, unhandled, handlers = future.result()
+
+        self.unhandled.update(unhandled)
+        self.report.merge_handlers(handlers)
+
+        for e in errors:
+            logger.warning(f"Error when parsing event, recieved exception {e}")
+
+        self.errors[current_thread()] += errors
+
+        if self._output is not None:
+            self._emit(nodes)
+        else:
+            # Nodes coming back from a worker process are new copies, intern them here.
+            merge_nodes(self._collected, nodes, intern=True)
+
+    def _emit(self, nodes: List[Node]) -> None:
+        """Hands off transformed nodes, either to `self.nodes` or to the `stream()` output."""
+        if not nodes:
+            return
+
+        self._node_count += len(nodes)
+
+        if self._output is not None:
+            self._output.put(nodes, block=True)
+        else:
+            self.nodes += nodes
+
+    def _producer_thread(self) -> None:
+        batches = 0
+        try:
+            for batch in self._batches():
+                self._queue.put(batch, block=True)
+                batches += 1
+        except Exception as e:
+            logger.critical(f"Failed to read from datasource after {self.count} events: {e}")
+            self._failure = e
+            return
+
+        logger.debug(f"Producer Thread {current_thread().name} finished after {batches} batches")
         return
 
     def _consumer_thread(self) -> None:
         processed = 0
+
+        # Nodes created by this consumer, merged as they are created.
+        seen: Dict[int, Node] = {}
+
+        # Checkpoints read the nodes held by each consumer.
+        if self._output is None:
+            self._seen[current_thread()] = seen
+
+        self._registry.nodes = seen
+
         while True:
-            event = self._queue.get()
-            processed += 1
+            batch = self._queue.get()
 
-            if event is _SENTINEL:
+            if batch is _SENTINEL:
+                if self._output is None:
+                    self._emit(list(seen.values()))
+                self._registry.nodes = None
                 logger.debug(
                     f"Consumer Thread {current_thread().name} finished after processing {processed} events"
+                    + f", holding {len(seen)} unique nodes"
                 )
                 return
 
-            try:
-                nodes = self.transform(event)
-            except Exception as e:
-                logger.warning(f"Error when parsing event, recieved exception {e}")
-                logger.debug(event)
-                self.errors[current_thread()].append(e)
-                nodes = []
+            # When streaming, nodes are sent out once per batch instead.
+            if self._output is not None:
+                seen = self._registry.nodes = {}
+
+            self._batch_stats.unhandled = Counter()
+            self._batch_stats.handlers = {}
+
+            for event in batch:
+                processed += 1
+                try:
+                    nodes = self._timed_transform(event)
+                except Exception as e:
+                    logger.warning(f"Error when parsing event, recieved exception {e}")
+                    logger.debug(event)
+                    self.errors[current_thread()].append(e)
+                    nodes = []
 
-            if nodes:
-                self.nodes += nodes
+                if nodes:
+                    merge_nodes(seen, nodes, intern=True)
+
+            self._merge_batch_stats()
+
+            if self._output is not None:
+                self._emit(list(seen.values()))
 
             self._queue.task_done()
 
+    def _merge_batch_stats(self) -> None:
+        """Adds the counts and handler latencies of the batch the current consumer thread
+        just transformed to those of the run."""
+
+        unhandled, handlers = self._batch_stats.unhandled, self._batch_stats.handlers
+        self._batch_stats.unhandled = self._batch_stats.handlers = None
+
+        if unhandled:
+            with self._stats_lock:
+                self.unhandled.update(unhandled)
+
+        if handlers:
+            self.report.merge_handlers(handlers)
+
+    def _record_handler(self, name: str, seconds: float) -> None:
+        """Records the time a call to the handler `name` took, in the histograms of the
+        current batch inside of a consumer thread, or directly in the report otherwise."""
+
+        handlers: Optional[Dict[str, LatencyHistogram]] = getattr(
+            self._batch_stats, "handlers", None
+        )
+
+        if handlers is None:
+            self.report.record_handler(name, seconds)
+            return
+
+        histogram = handlers.get(name)
+        if histogram is None:
+            histogram = handlers[name] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def get_or_create(self, node: N) -> N:
+        """Returns the instance of `node` already created in this run, or registers `node`
+        as that instance if it is the first one.
+
+        Without it, every event creates new nodes, and their edges are copied over to a
+        single instance when the nodes are merged. When a handler passes its nodes through
+        this method, the fields of `node` are merged into the existing instance, and the
+        edges added afterwards go directly to it.
+
+        Each consumer thread (or worker process batch) has its own set of nodes. Outside of
+        :py:meth:`run` and :py:meth:`stream`, `node` is returned unchanged.
+
+        >>> process = self.get_or_create(Process(process_id=10, process_image="cmd.exe"))
+        >>> process.wrote[file_node].append(timestamp=1)
+
+        Parameters
+        ----------
+        node : Node
+            A node created by the handler, without any edges.
+
+        Returns
+        -------
+        Node
+            The instance of the node to use.
+        """
+
+        registry: Optional[Dict[int, Node]] = getattr(self._registry, "nodes", None)
+
+        if registry is None:
+            return node
+
+        node_key = hash(node)
+        current = registry.get(node_key)
+
+        if current is None:
+            node._intern_fields()
+            registry[node_key] = node
+            return node
+
+        if current is not node:
+            current.merge_with(node)
+
+        return cast(N, current)
+
     @abstractmethod
     def transform(self, event: dict) -> Optional[Iterable[Node]]:
         raise NotImplementedError("Transformers must implement transform!")
+
+    def _timed_transform(self, event: dict) -> Optional[Iterable[Node]]:
+        """Calls :py:meth:`transform`, recording how long it took in the run report."""
+        start = time.perf_counter()
+        try:
+            return self.transform(event)
+        finally:
+            self._record_handler("transform", time.perf_counter() - start)
+
+    def accepted_event_types(self) -> Optional[Set[Hashable]]:
+        """The event types this transformer creates nodes from. This is passed down to
+        the datasource before reading from it, so that datasources which can check the
+        type of an event cheaply can skip parsing events which would be discarded.
+
+        See :py:meth:`beagle.datasources.base_datasource.DataSource.set_event_types`.
+
+        Returns
+        -------
+        Optional[Set[Hashable]]
+            The accepted event types, or None (the default) if every event is used.
+        """
+
+        return None
+
+    def event_key(self, event: dict) -> Hashable:
+        """Returns the key used to look up the handler for an event in :py:meth:`dispatch`.
+
+        Parameters
+        ----------
+        event : dict
+            The event to get the key of.
+
+        Returns
+        -------
+        Hashable
+            The key of the event, for example its event type.
+        """
+
+        raise NotImplementedError("Transformers using dispatch() must implement event_key!")
+
+    def dispatch(self, event: dict) -> Optional[Tuple[Node, ...]]:
+        """Sends an event to the method registered for its key using :py:func:`handles`.
+
+        If the key is a tuple without a registered handler, the handler for the first
+        element of the tuple is used instead. This allows handling every sub-type of an
+        event with a single entry.
+
+        Events without a handler are counted in `self.unhandled` and return None.
+
+        Parameters
+        ----------
+        event : dict
+            The event to transform.
+
+        Returns
+        -------
+        Optional[Tuple[Node, ...]]
+            The output of the handler.
+        """
+
+        key = self.event_key(event)
+
+        handler = self._handlers.get(key)
+
+        if handler is None and isinstance(key, tuple):
+            handler = self._handlers.get(key[0])
+
+        if handler is None:
+            # Inside of a consumer thread, the batch counts are merged once the batch is done.
+            unhandled = getattr(self._batch_stats, "unhandled", None)
+            if unhandled is None:
+                unhandled = self.unhandled
+            unhandled[key] += 1
+            return None
+
+        start = time.perf_counter()
+        try:
+            return getattr(self, handler)(event)
+        finally:
+            self._record_handler(handler, time.perf_counter() - start)
+
+    @classmethod
+    def unhandled_keys(cls, keys: Iterable[Hashable]) -> List[Hashable]:
+        """Returns the keys which have no registered handler.
+
+        Parameters
+        ----------
+        keys : Iterable[Hashable]
+            Event keys to check, for example every event type a datasource produces.
+
+        Returns
+        -------
+        List[Hashable]
+            The keys from `keys` which :py:meth:`dispatch` would not handle.
+        """
+
+        return [
+            key
+            for key in keys
+            if key not in cls._handlers
+            and not (isinstance(key, tuple) and key and key[0] in cls._handlers)
+        ]
@@ -1,8 +1,8 @@
-from typing import List, Optional, Tuple, Union
+from typing import Hashable, List, Optional, Tuple, Union
 
 from beagle.common import logger, split_path, split_reg_path
 from beagle.nodes import File, Process, RegistryKey, IPAddress
-from beagle.transformers.base_transformer import Transformer
+from beagle.transformers.base_transformer import Transformer, handles
 
 
 # Custom Node classes to use the UUID in TC
@@ -53,36 +53,13 @@ class DRAPATCTransformer(Transformer):
         logger.info("Created Darpa Transperant Computing Transformer.")
 
     def transform(self, event: dict) -> Optional[Tuple]:
-        event_type = event["event_type"]
-
-        if event_type == "subject" and event["type"] == "SUBJECT_PROCESS":
-            return self.make_process(event)
-        elif event_type == "fileobject" and event["type"] in [
-            "FILE_OBJECT_BLOCK",
-            "FILE_OBJECT_PEFILE",
-        ]:
-            return self.make_file(event)
-        elif event_type == "registrykeyobject":
-            return self.make_registrykey(event)
-        elif event_type == "netflowobject":
-            return self.make_addr(event)
-        elif event_type == "event" and event["type"] in [
-            "EVENT_READ",
-            "EVENT_OPEN",
-            "EVENT_WRITE",
-            "EVENT_WRITE_APPEND",
-            "EVENT_MODIFY_FILE_ATTRIBUTES",
-            "EVENT_CREATE_OBJECT",
-            "EVENT_LOAD_LIBRARY",
-        ]:
-            return self.file_events(event)
-        elif event_type == "event" and event["type"] == "EVENT_EXECUTE":
-            return self.execute_events(event)
-        elif event_type == "event" and event["type"] in ["EVENT_CONNECT"]:
-            return self.conn_events(event)
-
-        return tuple()
+        return self.dispatch(event) or tuple()
 
+    def event_key(self, event: dict) -> Hashable:
+        # Object types such as `registrykeyobject` are handled regardless of their `type`.
+        return (event["event_type"], event.get("type"))
+
+    @handles(("subject", "SUBJECT_PROCESS"))
     def make_process(self, event: dict) -> Union[Tuple[TCProcess], Tuple[TCProcess, TCProcess]]:
         if event.get("cmdLine"):
             proc_cmdline = event["cmdLine"]["string"]
@@ -118,6 +95,7 @@ class DRAPATCTransformer(Transformer):
         else:
             return (proc,)
 
+    @handles(("fileobject", "FILE_OBJECT_BLOCK"), ("fileobject", "FILE_OBJECT_PEFILE"))
     def make_file(self, event: dict) -> Tuple[TCFile]:
 
         base_obj = event["baseObject"]
@@ -137,6 +115,7 @@ class DRAPATCTransformer(Transformer):
 
         return (file_node,)
 
+    @handles("registrykeyobject")
     def make_registrykey(self, event: dict) -> Tuple[TCRegistryKey]:
 
         if event["key"].startswith("\\REGISTRY\\"):
@@ -159,11 +138,21 @@ class DRAPATCTransformer(Transformer):
 
         return (regkey,)
 
+    @handles("netflowobject")
     def make_addr(self, event: dict) -> Tuple[TCIPAddress]:
         addr = TCIPAddress(uuid=event["uuid"], ip_address=event["remoteAddress"])
         # TODO: Add port data somehow
         return (addr,)
 
+    @handles(
+        ("event", "EVENT_READ"),
+        ("event", "EVENT_OPEN"),
+        ("event", "EVENT_WRITE"),
+        ("event", "EVENT_WRITE_APPEND"),
+        ("event", "EVENT_MODIFY_FILE_ATTRIBUTES"),
+        ("event", "EVENT_CREATE_OBJECT"),
+        ("event", "EVENT_LOAD_LIBRARY"),
+    )
     def file_events(self, event: dict) -> Tuple[TCProcess, TCFile]:
 
         proc = TCProcess(uuid=event["subject"]["com.bbn.tc.schema.avro.cdm18.UUID"])
@@ -178,6 +167,7 @@ class DRAPATCTransformer(Transformer):
 
         return (proc, target)
 
+    @handles(("event", "EVENT_EXECUTE"))
     def execute_events(self, event: dict) -> Tuple[TCProcess, TCProcess]:
 
         proc = TCProcess(uuid=event["subject"]["com.bbn.tc.schema.avro.cdm18.UUID"])
@@ -190,6 +180,7 @@ class DRAPATCTransformer(Transformer):
 
         return (proc, target)
 
+    @handles(("event", "EVENT_CONNECT"))
     def conn_events(self, event: dict) -> Tuple[TCProcess, TCIPAddress]:
         proc = TCProcess(uuid=event["subject"]["com.bbn.tc.schema.avro.cdm18.UUID"])
         addr = TCIPAddress(uuid=event["predicateObject"]["com.bbn.tc.schema.avro.cdm18.UUID"])
@@ -1,9 +1,9 @@
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, Hashable, Optional, Tuple, Union
 
 from beagle.common import logger, split_path
 from beagle.constants import Protocols
 from beagle.nodes import URI, Domain, File, IPAddress, Node, Process, RegistryKey, Alert
-from beagle.transformers.base_transformer import Transformer
+from beagle.transformers.base_transformer import Transformer, handles
 
 
 class FireEyeHXTransformer(Transformer):
@@ -32,33 +32,22 @@ class FireEyeHXTransformer(Transformer):
         """
 
         # NOTE: Manually created event_type in HXTriage
-        # Check happens before the process path because
+        # The alertEvent is exempt from the process path check because
         # we don't expect these events to have that.
-        if event["event_type"] == "alertEvent":
-            return self.make_alert(event)
-
         # If there's no value in processPath, we can't create the process node properly.
-        if "processPath" in event and not event["processPath"]:
+        if (
+            event["event_type"] != "alertEvent"
+            and "processPath" in event
+            and not event["processPath"]
+        ):
             return None
 
-        # Event types from the agent events.
-        if event["event_type"] == "processEvent":
-            return self.make_process(event)
-        elif event["event_type"] == "fileWriteEvent":
-            return self.make_file(event)
-        elif event["event_type"] == "urlMonitorEvent":
-            return self.make_url(event)
-        elif event["event_type"] == "ipv4NetworkEvent":
-            return self.make_network(event)
-        elif event["event_type"] == "dnsLookupEvent":
-            return self.make_dnslookup(event)
-        elif event["event_type"] == "imageLoadEvent":
-            return self.make_imageload(event)
-        elif event["event_type"] == "regKeyEvent":
-            return self.make_registry(event)
-        else:
-            return None
+        return self.dispatch(event)
+
+    def event_key(self, event: dict) -> Hashable:
+        return event["event_type"]
 
+    @handles("processEvent")
     def make_process(
         self, event: dict
     ) -> Optional[Union[Tuple[Process, File], Tuple[Process, File, Process, File]]]:
@@ -99,17 +88,19 @@ class FireEyeHXTransformer(Transformer):
 
         # Create the "child" process. This is the process who this event
         # belongs to.
-        child = Process(
-            process_image=process_image,
-            process_image_path=process_image_path,
-            command_line=event.get("processCmdLine"),
-            process_id=int(event["pid"]),
-            hashes=hashes,
-            user=event.get("username", None),
+        child = self.get_or_create(
+            Process(
+                process_image=process_image,
+                process_image_path=process_image_path,
+                command_line=event.get("processCmdLine"),
+                process_id=int(event["pid"]),
+                hashes=hashes,
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the child process
-        child_proc_file_node = child.get_file_node()
+        child_proc_file_node = self.get_or_create(child.get_file_node())
 
         # File - (File Of) -> Process
         child_proc_file_node.file_of[child]
@@ -122,23 +113,26 @@ class FireEyeHXTransformer(Transformer):
         parent_process_image, parent_process_image_path = split_path(event["parentProcessPath"])
 
         # Create the parent process
-        parent = Process(
-            process_id=int(event["parentPid"]),
-            process_image=parent_process_image,
-            process_image_path=parent_process_image_path,
+        parent = self.get_or_create(
+            Process(
+                process_id=int(event["parentPid"]),
+                process_image=parent_process_image,
+                process_image_path=parent_process_image_path,
+            )
         )
 
         # Create a parent - (launched) -> child edge.
         parent.launched[child].append(timestamp=event["event_time"])
 
         # Pull out the image of the parent process
-        parent_proc_file_node = child.get_file_node()
+        parent_proc_file_node = self.get_or_create(child.get_file_node())
 
         # File - (File Of) -> Process
         parent_proc_file_node.file_of[child]
 
         return (parent, parent_proc_file_node, child, child_proc_file_node)
 
+    @handles("fileWriteEvent")
     def make_file(self, event: dict) -> Optional[Tuple[File, Process, File]]:
         """Converts a fileWriteEvent to two nodes, a file and the process manipulated the file.
         Generates a process - (Wrote) -> File edge.
@@ -170,17 +164,21 @@ class FireEyeHXTransformer(Transformer):
             hashes = {"md5": event["md5"]}
 
         # Create the file node.
-        file_node = File(file_path=file_path, file_name=event["fileName"], hashes=hashes)
+        file_node = self.get_or_create(
+            File(file_path=file_path, file_name=event["fileName"], hashes=hashes)
+        )
 
         # Set the extension
         file_node.set_extension()
 
         # Set the process node
-        process = Process(
-            process_id=int(event["pid"]),
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            user=event.get("username"),
+        process = self.get_or_create(
+            Process(
+                process_id=int(event["pid"]),
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                user=event.get("username"),
+            )
         )
 
         # Add a wrote edge with the contents of the file write.
@@ -189,13 +187,14 @@ class FireEyeHXTransformer(Transformer):
         )
 
         # Pull out the image of the process
-        proc_file_node = process.get_file_node()
+        proc_file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         proc_file_node.file_of[process]
 
         return (file_node, process, proc_file_node)
 
+    @handles("urlMonitorEvent")
     def make_url(self, event: dict) -> Optional[Tuple[URI, Domain, Process, File, IPAddress]]:
         """Converts a URL access event and returns 5 nodes with 4 different relationships.
 
@@ -234,21 +233,23 @@ class FireEyeHXTransformer(Transformer):
             5 tuple of the nodes pulled out of the event (see function description).
         """
 
-        uri = URI(uri=event["requestUrl"])
-        domain = Domain(domain=event["hostname"])
-        ip_address = IPAddress(ip_address=event["remoteIpAddress"])
+        uri = self.get_or_create(URI(uri=event["requestUrl"]))
+        domain = self.get_or_create(Domain(domain=event["hostname"]))
+        ip_address = self.get_or_create(IPAddress(ip_address=event["remoteIpAddress"]))
 
         # Pull out the process fields.
-        process = Process(
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            command_line=event.get("processCmdLine"),
-            process_id=int(event["pid"]),
-            user=event.get("username", None),
+        process = self.get_or_create(
+            Process(
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                command_line=event.get("processCmdLine"),
+                process_id=int(event["pid"]),
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the process
-        file_node = process.get_file_node()
+        file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         file_node.file_of[process]
@@ -278,6 +279,7 @@ class FireEyeHXTransformer(Transformer):
 
         return (uri, domain, process, file_node, ip_address)
 
+    @handles("ipv4NetworkEvent")
     def make_network(self, event: dict) -> Optional[Tuple[IPAddress, Process, File]]:
         """Converts a network connection event into a Process, File and IP Address node.
 
@@ -307,21 +309,23 @@ class FireEyeHXTransformer(Transformer):
         """
 
         # Pull out the process fields.
-        process = Process(
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            process_id=int(event["pid"]),
-            user=event.get("username", None),
+        process = self.get_or_create(
+            Process(
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                process_id=int(event["pid"]),
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the process
-        file_node = process.get_file_node()
+        file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         file_node.file_of[process]
 
         # Create the network node
-        ip_address = IPAddress(event["remoteIP"])
+        ip_address = self.get_or_create(IPAddress(event["remoteIP"]))
 
         # Create the connection edge
         # Process - (Connected To) -> IP Address
@@ -331,6 +335,7 @@ class FireEyeHXTransformer(Transformer):
 
         return (ip_address, process, file_node)
 
+    @handles("dnsLookupEvent")
     def make_dnslookup(self, event: dict) -> Optional[Tuple[Domain, Process, File]]:
         """Converts a dnsLookupEvent into a Domain, Process, and Process's File node.
 
@@ -359,36 +364,41 @@ class FireEyeHXTransformer(Transformer):
         """
 
         # Pull out the process fields.
-        process = Process(
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            process_id=int(event["pid"]),
-            user=event.get("username", None),
+        process = self.get_or_create(
+            Process(
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                process_id=int(event["pid"]),
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the process
-        file_node = process.get_file_node()
+        file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         file_node.file_of[process]
 
-        domain = Domain(event["hostname"])
+        domain = self.get_or_create(Domain(event["hostname"]))
 
         process.dns_query_for[domain].append(timestamp=event["event_time"])
 
         return (domain, process, file_node)
 
+    @handles("imageLoadEvent")
     def make_imageload(self, event: dict) -> Optional[Tuple[File, Process, File]]:
         # Pull out the process fields.
-        process = Process(
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            process_id=int(event["pid"]),
-            user=event.get("username", None),
+        process = self.get_or_create(
+            Process(
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                process_id=int(event["pid"]),
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the process
-        file_node = process.get_file_node()
+        file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         file_node.file_of[process]
@@ -399,7 +409,7 @@ class FireEyeHXTransformer(Transformer):
         else:
             file_path = event["filePath"]
 
-        loaded_file = File(file_path=file_path, file_name=event["fileName"])
+        loaded_file = self.get_or_create(File(file_path=file_path, file_name=event["fileName"]))
 
         loaded_file.set_extension()
 
@@ -407,28 +417,33 @@ class FireEyeHXTransformer(Transformer):
 
         return (loaded_file, process, file_node)
 
+    @handles("regKeyEvent")
     def make_registry(self, event: dict) -> Optional[Tuple[RegistryKey, Process, File]]:
         # Pull out the process fields.
-        process = Process(
-            process_image=event["process"],
-            process_image_path=event["processPath"],
-            process_id=int(event["pid"]),
-            user=event.get("username", None),
+        process = self.get_or_create(
+            Process(
+                process_image=event["process"],
+                process_image_path=event["processPath"],
+                process_id=int(event["pid"]),
+                user=event.get("username", None),
+            )
         )
 
         # Pull out the image of the process
-        file_node = process.get_file_node()
+        file_node = self.get_or_create(process.get_file_node())
 
         # File - (File Of) -> Process
         file_node.file_of[process]
 
         # RegistryKey Node Creation
-        reg_node = RegistryKey(
-            hive=event["hive"],
-            key_path=event["keyPath"],
-            key=event.get("valueName"),
-            value=event.get("text"),
-            value_type=event.get("valueType"),
+        reg_node = self.get_or_create(
+            RegistryKey(
+                hive=event["hive"],
+                key_path=event["keyPath"],
+                key=event.get("valueName"),
+                value=event.get("text"),
+                value_type=event.get("valueType"),
+            )
         )
 
         # Space shuttle code for the edge setting
@@ -455,6 +470,7 @@ class FireEyeHXTransformer(Transformer):
 
         return (reg_node, process, file_node)
 
+    @handles("alertEvent")
     def make_alert(self, event: dict) -> Optional[Tuple[Alert, ...]]:
 
         # Fixes issue where no event metadata in the Triage.
@@ -487,4 +503,3 @@ class FireEyeHXTransformer(Transformer):
 
         # This returns a tuple compromise of the alert node, and all alerted nodes
         return (alert,) + alerted_on_nodes  # type: ignore
-
@@ -1,9 +1,9 @@
-from typing import Optional, Tuple, Union
+from typing import Hashable, Optional, Tuple, Union
 
 from beagle.common.logging import logger
 from beagle.constants import EventTypes, FieldNames
 from beagle.nodes import URI, Alert, Domain, File, IPAddress, Node, Process, RegistryKey
-from beagle.transformers.base_transformer import Transformer
+from beagle.transformers.base_transformer import Transformer, handles
 
 # TODO: Add Timestamps to everything, if possible.
 
@@ -21,34 +21,13 @@ class GenericTransformer(Transformer):
 
     def transform(self, event: dict) -> Optional[Tuple]:
 
-        event_type = event.get(FieldNames.EVENT_TYPE)
-
         if event.get(FieldNames.ALERTED_ON):
             return self.make_alert(event)
 
-        if event_type == EventTypes.PROCESS_LAUNCHED:
-            return self.make_process(event)
-        elif event_type in [
-            EventTypes.FILE_DELETED,
-            EventTypes.FILE_OPENED,
-            EventTypes.FILE_WRITTEN,
-            EventTypes.LOADED_MODULE,
-        ]:
-            return self.make_basic_file(event)
-        elif event_type == EventTypes.FILE_COPIED:
-            return self.make_file_copy(event)
-        elif event_type == EventTypes.CONNECTION:
-            return self.make_connection(event)
-        elif event_type == EventTypes.HTTP_REQUEST:
-            return self.make_http_req(event)
-        elif event_type == EventTypes.DNS_LOOKUP:
-            return self.make_dnslookup(event)
-        elif event_type in [EventTypes.REG_KEY_OPENED, EventTypes.REG_KEY_DELETED]:
-            return self.make_basic_regkey(event)
-        elif event_type in [EventTypes.REG_KEY_SET]:
-            return self.make_regkey_set_value(event)
-        else:
-            return None
+        return self.dispatch(event)
+
+    def event_key(self, event: dict) -> Hashable:
+        return event.get(FieldNames.EVENT_TYPE)
 
     def make_alert(self, event: dict) -> Tuple[Alert, ...]:
         event.pop(FieldNames.ALERTED_ON)
@@ -70,6 +49,7 @@ class GenericTransformer(Transformer):
 
         return (alert,) + nodes
 
+    @handles(EventTypes.PROCESS_LAUNCHED)
     def make_process(self, event: dict) -> Tuple[Process, File, Process, File]:
         """Accepts a process with the `EventTypes.PROCESS_LAUNCHED` event_type.
 
@@ -98,26 +78,30 @@ class GenericTransformer(Transformer):
             [description]
         """
 
-        parent = Process(
-            process_image=event[FieldNames.PARENT_PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PARENT_PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PARENT_PROCESS_ID]),
-            command_line=event[FieldNames.PARENT_COMMAND_LINE],
+        parent = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PARENT_PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PARENT_PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PARENT_PROCESS_ID]),
+                command_line=event[FieldNames.PARENT_COMMAND_LINE],
+            )
         )
 
         # Create the file node.
         # TODO: Integrate into the Process() init function?
-        parent_file = parent.get_file_node()
+        parent_file = self.get_or_create(parent.get_file_node())
         parent_file.file_of[parent]
 
-        child = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        child = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        child_file = child.get_file_node()
+        child_file = self.get_or_create(child.get_file_node())
         child_file.file_of[child]
 
         if FieldNames.TIMESTAMP in event:
@@ -127,6 +111,12 @@ class GenericTransformer(Transformer):
 
         return (parent, parent_file, child, child_file)
 
+    @handles(
+        EventTypes.FILE_DELETED,
+        EventTypes.FILE_OPENED,
+        EventTypes.FILE_WRITTEN,
+        EventTypes.LOADED_MODULE,
+    )
     def make_basic_file(self, event: dict) -> Tuple[Process, File, File]:
         """Transforms a file based event.
 
@@ -152,20 +142,24 @@ class GenericTransformer(Transformer):
             [description]
         """
 
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
-        file_node = File(
-            file_path=event[FieldNames.FILE_PATH],
-            file_name=event[FieldNames.FILE_NAME],
-            hashes=event.get(FieldNames.HASHES),
+        file_node = self.get_or_create(
+            File(
+                file_path=event[FieldNames.FILE_PATH],
+                file_name=event[FieldNames.FILE_NAME],
+                hashes=event.get(FieldNames.HASHES),
+            )
         )
 
         file_node.set_extension()
@@ -184,31 +178,38 @@ class GenericTransformer(Transformer):
 
         return (process, proc_file, file_node)
 
+    @handles(EventTypes.FILE_COPIED)
     def make_file_copy(self, event: dict) -> Tuple[Process, File, File, File]:
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
         # Source file
-        src_file = File(
-            file_path=event[FieldNames.SRC_FILE][FieldNames.FILE_PATH],
-            file_name=event[FieldNames.SRC_FILE][FieldNames.FILE_NAME],
-            hashes=event[FieldNames.SRC_FILE].get(FieldNames.HASHES),
+        src_file = self.get_or_create(
+            File(
+                file_path=event[FieldNames.SRC_FILE][FieldNames.FILE_PATH],
+                file_name=event[FieldNames.SRC_FILE][FieldNames.FILE_NAME],
+                hashes=event[FieldNames.SRC_FILE].get(FieldNames.HASHES),
+            )
         )
 
         # Dest file
         src_file.set_extension()
 
-        dest_file = File(
-            file_path=event[FieldNames.DEST_FILE][FieldNames.FILE_PATH],
-            file_name=event[FieldNames.DEST_FILE][FieldNames.FILE_NAME],
-            hashes=event[FieldNames.DEST_FILE].get(FieldNames.HASHES),
+        dest_file = self.get_or_create(
+            File(
+                file_path=event[FieldNames.DEST_FILE][FieldNames.FILE_PATH],
+                file_name=event[FieldNames.DEST_FILE][FieldNames.FILE_NAME],
+                hashes=event[FieldNames.DEST_FILE].get(FieldNames.HASHES),
+            )
         )
 
         dest_file.set_extension()
@@ -219,18 +220,21 @@ class GenericTransformer(Transformer):
 
         return (process, proc_file, src_file, dest_file)
 
+    @handles(EventTypes.CONNECTION)
     def make_connection(self, event: dict) -> Tuple[Process, File, IPAddress]:
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
-        addr = IPAddress(ip_address=event[FieldNames.IP_ADDRESS])
+        addr = self.get_or_create(IPAddress(ip_address=event[FieldNames.IP_ADDRESS]))
 
         if FieldNames.PORT in event and FieldNames.PROTOCOL in event:
             process.connected_to[addr].append(
@@ -245,54 +249,60 @@ class GenericTransformer(Transformer):
 
         return (process, proc_file, addr)
 
+    @handles(EventTypes.HTTP_REQUEST)
     def make_http_req(
         self, event: dict
     ) -> Union[Tuple[Process, File, URI, Domain], Tuple[Process, File, URI, Domain, IPAddress]]:
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
-        dom = Domain(event[FieldNames.HTTP_HOST])
-        uri = URI(uri=event[FieldNames.URI])
+        dom = self.get_or_create(Domain(event[FieldNames.HTTP_HOST]))
+        uri = self.get_or_create(URI(uri=event[FieldNames.URI]))
 
         uri.uri_of[dom]
 
         process.http_request_to[uri].append(method=event[FieldNames.HTTP_METHOD])
 
         if FieldNames.IP_ADDRESS in event:
-            ip = IPAddress(event[FieldNames.IP_ADDRESS])
+            ip = self.get_or_create(IPAddress(event[FieldNames.IP_ADDRESS]))
             dom.resolves_to[ip]
             process.connected_to[ip]
             return (process, proc_file, uri, dom, ip)
         else:
             return (process, proc_file, uri, dom)
 
+    @handles(EventTypes.DNS_LOOKUP)
     def make_dnslookup(
         self, event: dict
     ) -> Union[Tuple[Process, File, Domain, IPAddress], Tuple[Process, File, Domain]]:
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
-        dom = Domain(event[FieldNames.HTTP_HOST])
+        dom = self.get_or_create(Domain(event[FieldNames.HTTP_HOST]))
 
         process.dns_query_for[dom]
 
         # Sometimes we don't know what the domain resolved to.
         if FieldNames.IP_ADDRESS in event:
-            addr = IPAddress(ip_address=event[FieldNames.IP_ADDRESS])
+            addr = self.get_or_create(IPAddress(ip_address=event[FieldNames.IP_ADDRESS]))
 
             dom.resolves_to[addr]
 
@@ -300,23 +310,28 @@ class GenericTransformer(Transformer):
         else:
             return (process, proc_file, dom)
 
+    @handles(EventTypes.REG_KEY_OPENED, EventTypes.REG_KEY_DELETED)
     def make_basic_regkey(self, event: dict) -> Tuple[Process, File, RegistryKey]:
 
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
         # RegistryKey Node Creation
-        reg_node = RegistryKey(
-            hive=event[FieldNames.HIVE],
-            key_path=event[FieldNames.REG_KEY_PATH],
-            key=event[FieldNames.REG_KEY],
+        reg_node = self.get_or_create(
+            RegistryKey(
+                hive=event[FieldNames.HIVE],
+                key_path=event[FieldNames.REG_KEY_PATH],
+                key=event[FieldNames.REG_KEY],
+            )
         )
 
         if event["event_type"] == EventTypes.REG_KEY_OPENED:
@@ -326,24 +341,29 @@ class GenericTransformer(Transformer):
 
         return (process, proc_file, reg_node)
 
+    @handles(EventTypes.REG_KEY_SET)
     def make_regkey_set_value(self, event: dict) -> Tuple[Process, File, RegistryKey]:
 
-        process = Process(
-            process_image=event[FieldNames.PROCESS_IMAGE],
-            process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
-            process_id=int(event[FieldNames.PROCESS_ID]),
-            command_line=event[FieldNames.COMMAND_LINE],
+        process = self.get_or_create(
+            Process(
+                process_image=event[FieldNames.PROCESS_IMAGE],
+                process_image_path=event[FieldNames.PROCESS_IMAGE_PATH],
+                process_id=int(event[FieldNames.PROCESS_ID]),
+                command_line=event[FieldNames.COMMAND_LINE],
+            )
         )
 
-        proc_file = process.get_file_node()
+        proc_file = self.get_or_create(process.get_file_node())
         proc_file.file_of[process]
 
         # RegistryKey Node Creation
-        reg_node = RegistryKey(
-            hive=event[FieldNames.HIVE],
-            key_path=event[FieldNames.REG_KEY_PATH],
-            key=event[FieldNames.REG_KEY],
-            value=event.get(FieldNames.REG_KEY_VALUE),
+        reg_node = self.get_or_create(
+            RegistryKey(
+                hive=event[FieldNames.HIVE],
+                key_path=event[FieldNames.REG_KEY_PATH],
+                key=event[FieldNames.REG_KEY],
+                value=event.get(FieldNames.REG_KEY_VALUE),
+            )
         )
 
         if reg_node.value:
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, Hashable, Optional, Set, Tuple
 
 from beagle.common import logger
 from beagle.nodes import URI, Domain, IPAddress, Node
@@ -14,6 +14,10 @@ class PCAPTransformer(Transformer):
 
         logger.info("Created PCAP Transformer")
 
+    def accepted_event_types(self) -> Optional[Set[Hashable]]:
+        # Ether and IP only packets are skipped, see below.
+        return {"UDP", "TCP", "DNS", "HTTPRequest"}
+
     def transform(self, event: Dict) -> Optional[Tuple[Node, ...]]:
 
         event_type = event["event_type"]
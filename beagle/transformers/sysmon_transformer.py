@@ -1,8 +1,8 @@
-from typing import Optional, Tuple, Union
+from typing import Hashable, Optional, Set, Tuple, Union
 
 from beagle.common import logger, split_path
 from beagle.nodes import Domain, File, IPAddress, Process, RegistryKey, SysMonProc
-from beagle.transformers.base_transformer import Transformer
+from beagle.transformers.base_transformer import Transformer, handles
 
 
 class SysmonTransformer(Transformer):
@@ -15,21 +15,17 @@ class SysmonTransformer(Transformer):
         logger.info("Created Sysmon Transformer.")
 
     def transform(self, event: dict) -> Optional[Tuple]:
+        return self.dispatch(event)
 
+    def event_key(self, event: dict) -> Hashable:
         # Get the sysmon event ID
-        event_id = int(event["EventID"])
-        if event_id == 1:
-            return self.process_creation(event)
-        elif event_id == 3:
-            return self.network_connection(event)
-        elif event_id in [13, 14, 15]:
-            return self.registry_creation(event)
-        elif event_id == 22:
-            return self.dns_lookup(event)
-        elif event_id == 11:
-            return self.file_created(event)
-        return None
+        return int(event["EventID"])
 
+    def accepted_event_types(self) -> Optional[Set[Hashable]]:
+        # Only the event IDs with a handler.
+        return set(self._handlers)
+
+    @handles(1)
     def process_creation(self, event: dict) -> Tuple[Process, File, Process, File]:
 
         # Make the parent process
@@ -69,6 +65,7 @@ class SysmonTransformer(Transformer):
 
         return (parent, parent_file, proc, proc_file)
 
+    @handles(3)
     def network_connection(
         self, event: dict
     ) -> Union[Tuple[Process, File, IPAddress], Tuple[Process, File, IPAddress, Domain]]:
@@ -100,6 +97,7 @@ class SysmonTransformer(Transformer):
 
         return (proc, proc_file, dest_addr)
 
+    @handles(11)
     def file_created(self, event: dict) -> Tuple[Process, File, File]:
 
         process_image, process_path = split_path(event["EventData_Image"])
@@ -123,6 +121,7 @@ class SysmonTransformer(Transformer):
 
         return (proc, proc_file, file_node)
 
+    @handles(13, 14, 15)
     def registry_creation(self, event: dict) -> Optional[Tuple[Process, File, RegistryKey]]:
 
         if "EventData_TargetObject" not in event:
@@ -169,6 +168,7 @@ class SysmonTransformer(Transformer):
 
         return (proc, proc_file, key)
 
+    @handles(22)
     def dns_lookup(self, event: dict) -> Tuple[Process, File, Domain]:
         process_image, process_path = split_path(event["EventData_Image"])
 
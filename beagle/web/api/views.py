@@ -1,11 +1,10 @@
-import hashlib
 import inspect
 import json
 import os
 import sys
 import tempfile
 from inspect import _empty  # type: ignore
-from typing import Any, Dict, List, Tuple, Type, cast
+from typing import Any, Dict, List, Tuple, Type, Union, cast
 
 from flask import Blueprint, jsonify, request
 from flask.helpers import make_response
@@ -13,6 +12,14 @@ from flask.helpers import make_response
 import beagle.datasources  # noqa: F401
 import beagle.transformers  # noqa: F401
 from beagle.backends import Backend
+from beagle.backends.compact import CompactGraph
+from beagle.backends.graph_file import (
+    GRAPH_FILE_EXTENSION,
+    GraphFile,
+    is_graph_file,
+    write_graph_file,
+)
+from beagle.backends.json_writer import dumps, write_graph_json
 from beagle.backends.networkx import NetworkX
 from beagle.common import logger
 from beagle.config import Config
@@ -53,6 +60,9 @@ BACKENDS = {
     )
 }
 
+# Backends which hold the graph locally. Their graphs are saved, and can be added to.
+LOCAL_BACKENDS = ["NetworkX", "CompactGraph"]
+
 
 # Generate an array containing a description of each datasource.
 # This includes it's name, it's id, it's required parameters, and the transformers
@@ -257,9 +267,9 @@ def new():
 
     G = resp["graph"]
 
-    # If the backend is NetworkX, save the graph.
+    # If the backend is NetworkX or CompactGraph, save the graph.
     # Otherwise, redirect the user to wherever he sent it (if possible)
-    if backend_cls.__name__ == "NetworkX":
+    if backend_cls.__name__ in LOCAL_BACKENDS:
         response = _save_graph_to_db(backend=resp["backend"], category=datasource_cls.category)
         response = jsonify(response)
     else:
@@ -297,14 +307,11 @@ def add(graph_id: int):
 
     is_external = issubclass(datasource_cls, ExternalDataSource)
 
-    # Only NetworkX for now.
-    if backend_cls.__name__ != "NetworkX":
+    # Only NetworkX and CompactGraph for now.
+    if backend_cls.__name__ not in LOCAL_BACKENDS:
         logger.info("Cannot append to non NetworkX graphs for now.")
         return make_response(jsonify({"message": "Can only add to NetworkX Graphs for now."}), 400)
 
-    # Cast to NetworkX
-    backend_cls = cast(Type[NetworkX], backend_cls)
-
     datasource_schema = resp["schema"]
     # If this class extends the ExternalDataSource class, we know that the parameters
     # represent strings, and not files.
@@ -320,15 +327,18 @@ def add(graph_id: int):
     # NOTE: This will all need to change for support non NetworkX backends.
 
     # Get the existing graph as JSON
-    dest_path = f"{Config.get('storage', 'dir')}/{graph_obj.category}/{graph_obj.file_path}"
-    json_data = json.load(open(dest_path, "r"))
+    json_data = _load_graph_json(graph_obj)
 
-    # Make a dummy backend instance
-    backend_instance = backend_cls(nodes=[], consolidate_edges=True)
-    existing_graph = backend_cls.from_json(json_data)
+    backend_instance: Union[NetworkX, CompactGraph]
+    if backend_cls.__name__ == "CompactGraph":
+        backend_instance = CompactGraph.from_json(json_data, consolidate_edges=True)
+    else:
+        # Make a dummy backend instance
+        backend_instance = cast(Type[NetworkX], backend_cls)(nodes=[], consolidate_edges=True)
+        existing_graph = NetworkX.from_json(json_data)
 
-    # Set the graph
-    backend_instance.G = existing_graph
+        # Set the graph
+        backend_instance.G = existing_graph
 
     resp, success = _add_to_exiting_graph(
         existing_backend=backend_instance,
@@ -491,7 +501,10 @@ def _create_graph(
 
         # Create the backend
         backend_instance = backend_cls(  # type: ignore
-            metadata=datasource.metadata(), nodes=nodes, consolidate_edges=True
+            metadata=datasource.metadata(),
+            nodes=nodes,
+            consolidate_edges=True,
+            report=transformer.report,
         )
 
         # Make the graph
@@ -553,6 +566,9 @@ def _add_to_exiting_graph(
         # Create the nodes
         nodes = transformer.run()
 
+        # Record the backend stages in the report of this run.
+        existing_backend.report = transformer.report
+
         # Create the backend
         G = existing_backend.add_nodes(nodes)
 
@@ -588,13 +604,15 @@ def _add_to_exiting_graph(
     return {"graph": G, "backend": existing_backend}, True
 
 
-def _save_graph_to_db(backend: NetworkX, category: str, graph_id: int = None) -> dict:
+def _save_graph_to_db(
+    backend: Union[NetworkX, CompactGraph], category: str, graph_id: int = None
+) -> dict:
     """Saves a graph to the database, optionally forcing an overwrite of an existing graph.
 
     Parameters
     ----------
-    backend : NetworkX
-        The NetworkX object to save
+    backend : Union[NetworkX, CompactGraph]
+        The NetworkX or CompactGraph object to save
     category : str
         The category
     graph_id: int
@@ -605,30 +623,54 @@ def _save_graph_to_db(backend: NetworkX, category: str, graph_id: int = None) ->
     dict
         JSON to return to client with ID and path.
     """
-    # Take the SHA256 of the contents of the graph.
-    contents_hash = hashlib.sha256(
-        json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
-    ).hexdigest()
+    dest_folder = category.replace(" ", "_").lower()
+
+    # Set up the storage directory.
+    os.makedirs(f"{Config.get('storage', 'dir')}/{dest_folder}", exist_ok=True)
+
+    # Graphs are saved as JSON, or in the binary format read by `GraphFile`.
+    if Config.get("storage", "format") == "binary":
+        extension = GRAPH_FILE_EXTENSION
+    else:
+        extension = ".json"
+
+    # The graph is written to a temporary file while its SHA256 is taken, as the name of the
+    # file is the hash of its contents.
+    fd, tmp_path = tempfile.mkstemp(
+        suffix=".tmp", dir=f"{Config.get('storage', 'dir')}/{dest_folder}"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if extension == GRAPH_FILE_EXTENSION:
+                contents_hash = write_graph_file(backend, f)
+            else:
+                # Always written with the json module, so the hash of a graph is the same as
+                # that of graphs saved by earlier versions, whether orjson is installed or not.
+                contents_hash = write_graph_json(backend, f, sort_keys=True, encoder="json")
+    except Exception:
+        # Don't leave a partially written graph behind.
+        os.remove(tmp_path)
+        raise
 
     # See if we have previously generated this *exact* graph.
     existing = Graph.query.filter_by(meta=backend.metadata, sha256=contents_hash).first()
 
     if existing:
+        os.remove(tmp_path)
         logger.info(f"Graph previously generated with id {existing.id}")
         return {"id": existing.id, "self": f"/{existing.category}/{existing.id}"}
 
-    dest_folder = category.replace(" ", "_").lower()
+    dest_path = f"{Config.get('storage', 'dir')}/{dest_folder}/{contents_hash}{extension}"
+    os.replace(tmp_path, dest_path)
 
-    # Set up the storage directory.
-    dest_path = f"{Config.get('storage', 'dir')}/{dest_folder}/{contents_hash}.json"
-    os.makedirs(f"{Config.get('storage', 'dir')}/{dest_folder}", exist_ok=True)
-
-    json.dump(backend.to_json(), open(dest_path, "w"))
+    # Save the run report next to the graph, see `get_graph_report`.
+    report_path = f"{Config.get('storage', 'dir')}/{dest_folder}/{contents_hash}.report.json"
+    json.dump(backend.report.to_dict(), open(report_path, "w"))
 
     if graph_id:
         db_entry = Graph.query.filter_by(id=graph_id).first()
         # set the new hash.
-        db_entry.file_path = f"{contents_hash}.json"
+        db_entry.file_path = f"{contents_hash}{extension}"
         db_entry.sha256 = contents_hash
         # NOTE: Old path is not deleted.
 
@@ -638,7 +680,7 @@ def _save_graph_to_db(backend: NetworkX, category: str, graph_id: int = None) ->
             meta=backend.metadata,
             comment=request.form.get("comment", None),
             category=dest_folder,  # Categories use the lower name!
-            file_path=f"{contents_hash}.json",
+            file_path=f"{contents_hash}{extension}",
         )
         # Add new entry
         db.session.add(db_entry)
@@ -753,7 +795,7 @@ def get_category_items(category: str):  # pragma: no cover
 
 
 @api.route("/graph/<int:graph_id>")
-def get_graph(graph_id: int):  # pragma: no cover - hard to test due to building path.
+def get_graph(graph_id: int):
     """Returns the JSON object for this graph. This is a networkx node_data JSON dump:
 
     >>> {
@@ -767,6 +809,13 @@ def get_graph(graph_id: int):  # pragma: no cover - hard to test due to building
         ]
     }
 
+    The following query parameters return part of the graph. Graphs saved in the binary
+    format only read the parts which are returned.
+
+    - `nodes=false` returns an empty list of nodes.
+    - `links=false` returns an empty list of links.
+    - `start` and `stop` return the links between these two positions.
+
     Returns 404 if the graph is not found.
 
     Parameters
@@ -785,15 +834,64 @@ def get_graph(graph_id: int):  # pragma: no cover - hard to test due to building
     if not graph_obj:
         return make_response(jsonify({"message": "Graph not found"}), 404)
 
-    dest_path = f"{Config.get('storage', 'dir')}/{graph_obj.category}/{graph_obj.file_path}"
-
-    json_data = json.load(open(dest_path, "r"))
+    try:
+        start = int(request.args.get("start", 0))
+        stop = request.args.get("stop")
+        stop = int(stop) if stop is not None else None
+    except ValueError:
+        return make_response(jsonify({"message": "start and stop must be integers"}), 400)
+
+    include_nodes = request.args.get("nodes", "true").lower() != "false"
+    include_links = request.args.get("links", "true").lower() != "false"
+
+    path = _graph_path(graph_obj)
+
+    if is_graph_file(path):
+        graph = GraphFile(path)
+        json_data = {
+            **graph.json_header(),
+            "nodes": graph.nodes() if include_nodes else [],
+            "links": graph.links(start, stop) if include_links else [],
+        }
+    else:
+        json_data = _load_graph_json(graph_obj)
+        json_data["nodes"] = json_data["nodes"] if include_nodes else []
+        json_data["links"] = json_data["links"][start:stop] if include_links else []
 
-    response = jsonify(json_data)
+    response = make_response(dumps(json_data, sort_keys=True))
+    response.mimetype = "application/json"
 
     return response
 
 
+def _graph_path(graph_obj: Graph) -> str:
+    return f"{Config.get('storage', 'dir')}/{graph_obj.category}/{graph_obj.file_path}"
+
+
+def _load_graph_json(graph_obj: Graph) -> dict:
+    """Reads a saved graph, whichever format it was saved in. The format is told by the
+    first bytes of the file rather than its extension.
+
+    Parameters
+    ----------
+    graph_obj : Graph
+        The database entry of the graph.
+
+    Returns
+    -------
+    dict
+        The JSON of the graph, see :py:meth:`NetworkX.to_json`.
+    """
+
+    path = _graph_path(graph_obj)
+
+    if is_graph_file(path):
+        return GraphFile(path).to_json()
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 @api.route("/metadata/<int:graph_id>")
 def get_graph_metadata(graph_id: int):
     """Returns the metadata for a single graph. This is automatically generated
@@ -820,3 +918,40 @@ def get_graph_metadata(graph_id: int):
     response = jsonify(graph_obj.meta)
 
     return response
+
+
+@api.route("/report/<int:graph_id>")
+def get_graph_report(graph_id: int):
+    """Returns the run report for a single graph. The report contains the time spent in each
+    stage, the per-handler latencies, the queue depth over time and the number of nodes and
+    edges of each type. See :py:class:`beagle.common.report.RunReport`.
+
+    Parameters
+    ----------
+    graph_id : int
+        Graph ID.
+
+    Returns 404 if the graph ID is not found, or if the graph has no report (for
+    example, because it was created before reports were saved).
+
+    Returns
+    -------
+    Dict
+        The report of the run which created the current version of the graph.
+    """
+
+    graph_obj = Graph.query.filter_by(id=graph_id).first()
+
+    if not graph_obj:
+        return make_response(jsonify({"message": "Graph not found"}), 404)
+
+    report_path = (
+        f"{Config.get('storage', 'dir')}/{graph_obj.category}/{graph_obj.sha256}.report.json"
+    )
+
+    if not os.path.exists(report_path):
+        return make_response(jsonify({"message": "Report not found"}), 404)
+
+    response = jsonify(json.load(open(report_path, "r")))
+
+    return response
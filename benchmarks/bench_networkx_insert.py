@@ -0,0 +1,129 @@
+"""Times building a graph with the :py:class:`NetworkX` backend.
+
+Every process writes to `--files-per-process` of `--files` files, so the defaults make a graph
+of 1M consolidated edges. Each run times `NetworkX.graph()` on newly created nodes, and
+compares it with inserting the same nodes one node and one edge at a time, the way
+`graph()` did before nodes and edges were inserted in bulk. Run from the root of the
+repository, with beagle installed::
+
+    python benchmarks/bench_networkx_insert.py
+    python benchmarks/bench_networkx_insert.py --processes 5000 --runs 3
+"""
+
+import argparse
+import time
+from itertools import groupby
+from typing import Callable, List
+
+import networkx as nx
+
+from beagle.backends.networkx import NetworkX
+from beagle.common import dedup_nodes, logger
+from beagle.nodes import File, Node, Process
+
+
+def make_nodes(processes: int, files: int, files_per_process: int) -> List[Node]:
+    file_nodes = [File(file_path="c:\\files", file_name=f"{i}.txt") for i in range(files)]
+
+    nodes: List[Node] = []
+    for i in range(processes):
+        proc = Process(host="host", process_id=i, process_image="test.exe")
+        for j in range(files_per_process):
+            proc.wrote[file_nodes[(i + j) % files]].append(timestamp=i + j)
+        nodes.append(proc)
+
+    return nodes + file_nodes
+
+
+def bulk_insert(nodes: List[Node]) -> nx.MultiDiGraph:
+    backend = NetworkX(nodes=nodes, consolidate_edges=True)
+    return backend.graph()
+
+
+def per_edge_insert(nodes: List[Node]) -> nx.MultiDiGraph:
+    """Inserts nodes the way `NetworkX.graph()` did before bulk inserts: one `add_node` per
+    node, and for every edge, a lookup of the existing edge followed by one `add_edge`."""
+
+    G = nx.MultiDiGraph()
+
+    for node in dedup_nodes(nodes):
+        node_id = hash(node)
+        if node_id in G:
+            nx.set_node_attributes(G, {node_id: {"data": node}})
+        else:
+            G.add_node(node_id, data=node)
+
+        for edge_dict in node.edges:
+            for dest_node, edge in edge_dict.items():
+                default_edge_name = edge.__name__
+
+                edge_instances = [
+                    {"edge_name": entry.pop("edge_name", default_edge_name), "data": entry}
+                    for entry in edge._events
+                ]
+                if len(edge_instances) == 0:
+                    edge_instances = [{"edge_name": default_edge_name}]
+
+                edge_instances = sorted(edge_instances, key=lambda e: e["edge_name"])
+
+                for edge_name, instances in groupby(edge_instances, key=lambda e: e["edge_name"]):
+                    dest_id = hash(dest_node)
+                    if dest_id not in G.nodes:
+                        G.add_node(dest_id, data=dest_node)
+
+                    data = [e.get("data", None) for e in instances]
+                    curr = G.get_edge_data(u=node_id, v=dest_id, key=edge_name, default=None)
+                    if curr is None:
+                        G.add_edge(node_id, dest_id, key=edge_name, data=data, edge_name=edge_name)
+                    else:
+                        nx.set_edge_attributes(
+                            G,
+                            {
+                                (node_id, dest_id, edge_name): {
+                                    "data": curr["data"] + data,
+                                    "edge_name": edge_name,
+                                }
+                            },
+                        )
+
+    return G
+
+
+def run(
+    name: str, insert: Callable[[List[Node]], nx.MultiDiGraph], args: argparse.Namespace
+) -> float:
+    timings = []
+    for _ in range(args.runs):
+        nodes = make_nodes(args.processes, args.files, args.files_per_process)
+
+        start = time.perf_counter()
+        G = insert(nodes)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(
+        f"{name:<16} {G.number_of_nodes():>9} nodes {G.number_of_edges():>9} edges "
+        + f"best {best:.2f}s of "
+        + ", ".join(f"{timing:.2f}s" for timing in timings)
+    )
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=50000)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--files-per-process", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=2)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    bulk = run("graph()", bulk_insert, args)
+    per_edge = run("per edge insert", per_edge_insert, args)
+
+    print(f"speedup {per_edge / bulk:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import json
+
+import pytest
+
+from beagle.backends.compact import CompactGraph
+from beagle.backends.networkx import NetworkX
+from beagle.common.memory import graph_memory_usage
+from beagle.datasources.json_data import JSONData
+from beagle.nodes import File, IPAddress, Process
+from tests.transformers.test_base_transformer import make_events
+
+
+def make_nodes():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123")
+    f = File(file_path="c:", file_name="foo.txt")
+    ip = IPAddress("127.0.0.1")
+
+    # Enough events for the integer fields to be stored in arrays.
+    for i in range(300):
+        proc.launched[other_proc].append(timestamp=i)
+
+    other_proc.launched[proc].append(timestamp=1)
+    other_proc.wrote[f]
+
+    proc.connected_to[ip].append(port=80, protocol="TCP", timestamp=1)
+    proc.connected_to[ip].append(port=53, protocol="UDP", timestamp=2)
+    proc.connected_to[ip].append(port=443, protocol="TCP", timestamp=3)
+
+    # The destination is listed before the source.
+    return [other_proc, f, proc, ip]
+
+
+def build(backend_cls, consolidate_edges=True, nodes=None):
+    backend = backend_cls(nodes=nodes or make_nodes(), consolidate_edges=consolidate_edges)
+    backend.graph()
+    return backend
+
+
+@pytest.mark.parametrize("consolidate_edges", [True, False])
+def test_same_json_as_networkx(consolidate_edges):
+    expected = build(NetworkX, consolidate_edges).to_json()
+    actual = build(CompactGraph, consolidate_edges).to_json()
+
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+def test_same_json_as_networkx_from_transformer():
+    nodes = JSONData(make_events(50)).to_transformer().run()
+
+    expected = build(NetworkX, nodes=nodes).to_json()
+    actual = build(CompactGraph, nodes=nodes).to_json()
+
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("consolidate_edges", [True, False])
+def test_add_nodes(consolidate_edges):
+    def more_nodes():
+        proc = Process(process_id=10, process_image="test.exe")
+        other_proc = Process(process_id=12, process_image="best.exe")
+        proc.launched[other_proc].append(timestamp=1000)
+        proc.wrote[File(file_path="d:", file_name="bar.txt")].append(timestamp=5)
+        return [proc]
+
+    expected = build(NetworkX, consolidate_edges)
+    expected.add_nodes(more_nodes())
+
+    actual = build(CompactGraph, consolidate_edges)
+    actual.add_nodes(more_nodes())
+
+    assert json.dumps(actual.to_json()) == json.dumps(expected.to_json())
+    assert actual.report.node_counts == expected.report.node_counts
+    assert actual.report.edge_counts == expected.report.edge_counts
+
+
+def test_add_nodes_consolidates_existing_edge():
+    backend = build(CompactGraph)
+
+    proc = Process(process_id=10, process_image="test.exe")
+    proc.launched[Process(process_id=12, process_image="best.exe")].append(timestamp=1000)
+    backend.add_nodes([proc])
+
+    links = [link for link in backend.to_json()["links"] if link["type"] == "Launched"]
+    assert len(links) == 2
+
+    # The first launched edge is from the other process.
+    assert links[1]["properties"]["data"][-1] == {"timestamp": 1000}
+    assert len(links[1]["properties"]["data"]) == 301
+
+
+def test_graph_keeps_nodes_without_edges():
+    nodes = make_nodes()
+    backend = build(CompactGraph, nodes=nodes)
+
+    nodes[2].launched[nodes[0]].append(timestamp=5000)
+
+    # The graph holds copies of the events, and nodes without their edges.
+    assert len(backend.to_json()["links"][2]["properties"]["data"]) == 300
+    assert all(not list(node._edge_items()) for node in backend._nodes)
+
+
+def test_adjacency():
+    backend = build(CompactGraph)
+    order, indptr = backend._adjacency()
+
+    rows = backend._rows
+    proc = rows[hash(make_nodes()[2])]
+
+    edges = order[indptr[proc] : indptr[proc + 1]]
+    assert sorted(backend._types[code] for code in backend._type.values[edges]) == [
+        "Launched",
+        "TCP",
+        "UDP",
+    ]
+    assert indptr[-1] == backend.number_of_edges() == 5
+
+
+@pytest.mark.parametrize("consolidate_edges", [True, False])
+def test_from_json(consolidate_edges):
+    data = build(NetworkX, consolidate_edges).to_json()
+
+    backend = CompactGraph.from_json(data, consolidate_edges=consolidate_edges)
+
+    assert json.dumps(backend.to_json()) == json.dumps(data)
+
+
+def test_from_json_path(tmpdir):
+    path = tmpdir.join("graph.json")
+    data = build(NetworkX).to_json()
+    path.write(json.dumps(data))
+
+    assert CompactGraph.from_json(str(path), consolidate_edges=True).to_json() == data
+
+
+def test_from_json_fails_on_invalid():
+    with pytest.raises(ValueError):
+        CompactGraph.from_json({"nodes": []})
+
+
+def test_from_json_then_add_nodes():
+    backend = CompactGraph.from_json(build(NetworkX).to_json(), consolidate_edges=True)
+
+    proc = Process(process_id=10, process_image="test.exe")
+    proc.launched[Process(process_id=12, process_image="best.exe")].append(timestamp=1000)
+    backend.add_nodes([proc])
+
+    launched = backend.to_json()["links"][2]
+    assert launched["source"] == hash(proc)
+    assert launched["type"] == "Launched"
+    assert launched["properties"]["data"][-1] == {"timestamp": 1000}
+
+
+def test_empty_graph():
+    backend = CompactGraph(nodes=[], consolidate_edges=True)
+    backend.graph()
+
+    assert backend.is_empty()
+    assert backend.to_json() == {"directed": True, "multigraph": True, "nodes": [], "links": []}
+
+
+def test_memory_usage():
+    networkx = build(NetworkX)
+    backend = build(CompactGraph)
+
+    usage = backend.memory_usage()
+    expected = graph_memory_usage(networkx.G)
+
+    for kind in ["nodes", "edges"]:
+        assert {name: stats["count"] for name, stats in usage[kind].items()} == {
+            name: stats["count"] for name, stats in expected[kind].items()
+        }
+
+    assert usage["edges"]["Launched"]["events"] == 301
+    assert usage["edges"]["Wrote"]["events"] == 0
+    assert [edge["events"] for edge in usage["largest_edges"][:2]] == [300, 2]
+    assert usage["total"] < expected["total"]
+
+
+def test_memory_report():
+    backend = CompactGraph(nodes=make_nodes(), consolidate_edges=True)
+    backend.report.memory = {}
+    backend.graph()
+
+    assert backend.report.memory["graph"]["edges"]["Launched"]["count"] == 2
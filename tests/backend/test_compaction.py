@@ -0,0 +1,100 @@
+import pytest
+
+from beagle.backends.compaction import compact_events
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        compact_events([{"timestamp": 1}], "foo")
+
+
+@pytest.mark.parametrize("policy", ["dedup", "timestamps", "cap"])
+def test_no_data(policy):
+    assert compact_events([None], policy) == [None]
+
+
+def test_dedup():
+    events = [{"timestamp": 1}, {"timestamp": 2}, {"timestamp": 1}]
+
+    assert compact_events(events, "dedup") == [
+        {"timestamp": 1, "count": 2},
+        {"timestamp": 2, "count": 1},
+    ]
+
+
+def test_dedup_unhashable():
+    events = [{"headers": {"a": 1}}, {"headers": {"a": 1}}]
+
+    assert compact_events(events, "dedup") == [{"headers": {"a": 1}, "count": 2}]
+
+
+def test_dedup_twice():
+    first = compact_events([{"timestamp": 1}, {"timestamp": 1}], "dedup")
+
+    assert compact_events(first + [{"timestamp": 1}], "dedup") == [{"timestamp": 1, "count": 3}]
+
+
+def test_timestamps():
+    events = [{"timestamp": 5, "port": 80}, {"timestamp": 2, "port": 443}, {"timestamp": 9}]
+
+    assert compact_events(events, "timestamps") == [
+        {
+            "timestamp": 5,
+            "port": 80,
+            "first_timestamp": 5,
+            "last_timestamp": 9,
+            "min_timestamp": 2,
+            "max_timestamp": 9,
+            "count": 3,
+        }
+    ]
+
+
+def test_timestamps_twice():
+    first = compact_events([{"timestamp": 5}, {"timestamp": 2}], "timestamps")
+    events = compact_events(first + [{"timestamp": 1}], "timestamps")
+
+    assert events == [
+        {
+            "timestamp": 5,
+            "first_timestamp": 5,
+            "last_timestamp": 1,
+            "min_timestamp": 1,
+            "max_timestamp": 5,
+            "count": 3,
+        }
+    ]
+
+
+def test_timestamps_without_timestamp():
+    assert compact_events([{}, {}], "timestamps") == [
+        {
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "min_timestamp": None,
+            "max_timestamp": None,
+            "count": 2,
+        }
+    ]
+
+
+def test_cap():
+    events = [{"timestamp": i} for i in range(10)]
+
+    assert compact_events(events, "cap", cap=3) == [
+        {"timestamp": 0},
+        {"timestamp": 1},
+        {"timestamp": 2, "count": 8},
+    ]
+    # Nothing is dropped.
+    assert compact_events(events, "cap", cap=10) == events
+
+
+def test_cap_again():
+    events = [{"timestamp": i} for i in range(10)]
+
+    capped = compact_events(events, "cap", cap=3)
+    capped = compact_events(capped + [{"timestamp": 10}] * 5, "cap", cap=3)
+
+    assert capped[-1] == {"timestamp": 2, "count": 13}
+    assert sum(event.get("count", 1) for event in capped) == 15
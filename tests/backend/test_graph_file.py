@@ -0,0 +1,182 @@
+import hashlib
+import io
+import json
+import zlib
+
+import mock
+import pytest
+
+from beagle.backends.compact import CompactGraph
+from beagle.backends.graph_file import GraphFile, is_graph_file, write_graph_file
+from beagle.backends.json_writer import write_graph_json
+from beagle.backends.networkx import NetworkX
+from beagle.nodes import File, Process
+from tests.backend.test_compact import build
+
+
+def make_backend(procs=25):
+    f = File(file_path="c:", file_name="foo.txt")
+    nodes = []
+    for i in range(procs):
+        proc = Process(process_id=i, process_image="test.exe")
+        proc.wrote[f].append(timestamp=i)
+        proc.wrote[f].append(timestamp=i + 1)
+        nodes.append(proc)
+
+    backend = NetworkX(nodes=nodes + [f], consolidate_edges=True)
+    backend.graph()
+    return backend
+
+
+def save(backend, tmpdir, **kwargs):
+    path = str(tmpdir.join("graph.graph"))
+    with open(path, "wb") as f:
+        write_graph_file(backend, f, **kwargs)
+    return path
+
+
+@pytest.mark.parametrize("backend_cls", [NetworkX, CompactGraph])
+def test_same_json(backend_cls, tmpdir):
+    backend = build(backend_cls)
+
+    graph = GraphFile(save(backend, tmpdir))
+
+    assert graph.to_json() == backend.to_json()
+    assert graph.number_of_nodes() == 4
+    assert graph.number_of_edges() == len(backend.to_json()["links"])
+
+
+def test_sections(tmpdir):
+    backend = make_backend()
+
+    graph = GraphFile(save(backend, tmpdir, section_size=10))
+
+    assert [section["count"] for section in graph.index["sections"]["nodes"]] == [10, 10, 6]
+    assert [section["count"] for section in graph.index["sections"]["links"]] == [10, 10, 5]
+    assert graph.to_json() == backend.to_json()
+
+
+@pytest.mark.parametrize(
+    "start,stop", [(0, None), (0, 10), (5, 15), (9, 11), (20, 100), (24, 25), (-3, None), (30, 40)]
+)
+def test_links_slice(start, stop, tmpdir):
+    backend = make_backend()
+    links = backend.to_json()["links"]
+
+    graph = GraphFile(save(backend, tmpdir, section_size=10))
+
+    assert graph.links(start, stop) == links[start:stop]
+
+
+def test_slice_only_reads_sections_needed(tmpdir):
+    graph = GraphFile(save(make_backend(), tmpdir, section_size=10))
+
+    with mock.patch(
+        "beagle.backends.graph_file.zlib.decompress", wraps=zlib.decompress
+    ) as decompress:
+        graph.links(12, 14)
+
+    assert decompress.call_count == 1
+
+
+def test_nodes_only(tmpdir):
+    backend = make_backend()
+
+    graph = GraphFile(save(backend, tmpdir, section_size=10))
+
+    assert graph.nodes() == backend.to_json()["nodes"]
+    assert graph.nodes(0, 2) == backend.to_json()["nodes"][:2]
+
+
+def test_header(tmpdir):
+    graph = GraphFile(save(make_backend(), tmpdir))
+
+    assert graph.json_header() == {"directed": True, "multigraph": True}
+
+
+def test_empty_graph(tmpdir):
+    backend = NetworkX(nodes=[])
+    backend.graph()
+
+    graph = GraphFile(save(backend, tmpdir))
+
+    assert graph.to_json() == {"directed": True, "multigraph": True, "nodes": [], "links": []}
+    assert graph.links(0, 10) == []
+
+
+def test_export_json(tmpdir):
+    backend = make_backend()
+    graph = GraphFile(save(backend, tmpdir, section_size=10))
+
+    f = io.BytesIO()
+    write_graph_json(graph, f, sort_keys=True, encoder="json")
+
+    assert f.getvalue() == json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
+
+
+def test_load_into_backend(tmpdir):
+    backend = make_backend()
+    graph = GraphFile(save(backend, tmpdir))
+
+    loaded = CompactGraph.from_json(graph.to_json(), consolidate_edges=True)
+
+    assert loaded.to_json() == backend.to_json()
+
+
+@pytest.mark.parametrize("backend_cls", [NetworkX, CompactGraph])
+def test_returns_json_sha256(backend_cls):
+    backend = build(backend_cls)
+
+    sha256 = write_graph_file(backend, io.BytesIO(), section_size=2)
+
+    expected = json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
+    assert sha256 == hashlib.sha256(expected).hexdigest()
+    assert sha256 == write_graph_json(backend, io.BytesIO(), sort_keys=True, encoder="json")
+
+
+def test_empty_graph_sha256():
+    backend = NetworkX(nodes=[])
+    backend.graph()
+
+    expected = json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
+    assert write_graph_file(backend, io.BytesIO()) == hashlib.sha256(expected).hexdigest()
+
+
+def test_reads_nan(tmpdir):
+    proc = Process(process_id=1, process_image="test.exe")
+    proc.wrote[File(file_path="c:", file_name="foo.txt")].append(timestamp=float("nan"))
+
+    backend = NetworkX(nodes=[proc], consolidate_edges=True)
+    backend.graph()
+
+    graph = GraphFile(save(backend, tmpdir))
+
+    timestamp = graph.links()[0]["properties"]["data"][0]["timestamp"]
+    assert timestamp != timestamp
+
+
+def test_is_graph_file(tmpdir):
+    path = save(make_backend(), tmpdir)
+
+    other = tmpdir.join("graph.json")
+    other.write("{}")
+
+    assert is_graph_file(path)
+    assert not is_graph_file(str(other))
+
+
+def test_invalid_file(tmpdir):
+    other = tmpdir.join("graph.json")
+    other.write("{}")
+
+    with pytest.raises(ValueError):
+        GraphFile(str(other))
+
+
+def test_truncated_file(tmpdir):
+    path = save(make_backend(), tmpdir)
+    data = open(path, "rb").read()
+    open(path, "wb").write(data[:-10])
+
+    with pytest.raises(ValueError):
+        GraphFile(path)
@@ -0,0 +1,106 @@
+import hashlib
+import io
+import json
+
+import mock
+import pytest
+
+from beagle.backends.compact import CompactGraph
+from beagle.backends.json_writer import dumps, iter_graph_json, write_graph_json
+from beagle.backends.networkx import NetworkX
+from tests.backend.test_compact import build
+
+
+@pytest.mark.parametrize("backend_cls", [NetworkX, CompactGraph])
+@pytest.mark.parametrize("consolidate_edges", [True, False])
+def test_same_bytes_as_json_dumps(backend_cls, consolidate_edges):
+    backend = build(backend_cls, consolidate_edges=consolidate_edges)
+
+    f = io.BytesIO()
+    write_graph_json(backend, f, sort_keys=True, encoder="json")
+
+    assert f.getvalue() == json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
+
+
+@pytest.mark.parametrize("backend_cls", [NetworkX, CompactGraph])
+def test_orjson_same_values(backend_cls):
+    backend = build(backend_cls)
+
+    f = io.BytesIO()
+    write_graph_json(backend, f, encoder="orjson")
+
+    assert json.loads(f.getvalue()) == backend.to_json()
+
+
+def test_keeps_key_order():
+    backend = build(NetworkX)
+
+    output = b"".join(iter_graph_json(backend, encoder="json"))
+
+    assert output == json.dumps(backend.to_json()).encode("utf-8")
+
+
+def test_empty_graph():
+    backend = NetworkX(nodes=[])
+    backend.graph()
+
+    output = b"".join(iter_graph_json(backend, sort_keys=True, encoder="json"))
+
+    assert json.loads(output) == {"directed": True, "links": [], "multigraph": True, "nodes": []}
+
+
+def test_returns_sha256():
+    backend = build(NetworkX)
+
+    f = io.BytesIO()
+    sha256 = write_graph_json(backend, f, sort_keys=True)
+
+    assert sha256 == hashlib.sha256(f.getvalue()).hexdigest()
+
+
+def test_writes_to_socket():
+    backend = build(CompactGraph)
+
+    sock = mock.MagicMock(spec=["sendall"])
+    write_graph_json(backend, sock, encoder="json", sort_keys=True)
+
+    sent = b"".join(call[0][0] for call in sock.sendall.call_args_list)
+    assert json.loads(sent) == backend.to_json()
+
+
+def test_writes_in_chunks():
+    backend = build(NetworkX)
+
+    f = mock.MagicMock(spec=["write"])
+    with mock.patch("beagle.backends.json_writer._BUFFER_SIZE", 100):
+        write_graph_json(backend, f, encoder="json")
+
+    assert f.write.call_count > 1
+
+
+def test_encoder_from_config():
+    backend = build(NetworkX)
+
+    with mock.patch("beagle.backends.json_writer.Config.get", return_value="json"):
+        output = b"".join(iter_graph_json(backend))
+
+    assert b", " in output
+
+
+def test_invalid_encoder():
+    with pytest.raises(ValueError):
+        list(iter_graph_json(build(NetworkX), encoder="yaml"))
+
+
+def test_orjson_missing_falls_back():
+    backend = build(NetworkX)
+
+    with mock.patch("beagle.backends.json_writer.orjson", None):
+        output = b"".join(iter_graph_json(backend, sort_keys=True, encoder="orjson"))
+
+    assert output == json.dumps(backend.to_json(), sort_keys=True).encode("utf-8")
+
+
+def test_dumps():
+    assert dumps({"b": 1, "a": [1, 2]}, sort_keys=True, encoder="json") == b'{"a": [1, 2], "b": 1}'
+    assert dumps({"b": 1, "a": [1, 2]}, sort_keys=True, encoder="orjson") == b'{"a":[1,2],"b":1}'
@@ -1,3 +1,4 @@
+import gc
 import json
 from typing import Callable, List
 
@@ -5,7 +6,7 @@ import networkx
 import pytest
 
 from beagle.backends.networkx import NetworkX
-from beagle.nodes import Process, File
+from beagle.nodes import File, IPAddress, Process
 
 
 from io import BytesIO
@@ -204,6 +205,47 @@ def test_add_node_overlaps_existing(nx):
     assert "Wrote" in G[u][v2]
 
 
+def test_add_nodes_extends_consolidated_edge():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+
+    proc.launched[other_proc].append(timestamp=0)
+
+    backend = NetworkX(consolidate_edges=True, nodes=[proc, other_proc])
+    G = backend.graph()
+
+    data = G[hash(proc)][hash(other_proc)]["Launched"]["data"]
+
+    for i in range(1, 4):
+        new_proc = Process(process_id=10, process_image="test.exe")
+        new_proc.launched[other_proc].append(timestamp=i)
+        backend.add_nodes([new_proc])
+
+    edge = G[hash(proc)][hash(other_proc)]["Launched"]
+
+    # The events were added to the existing list rather than a copy of it.
+    assert edge["data"] is data
+    assert [event["timestamp"] for event in data] == [0, 1, 2, 3]
+    assert len(G.edges()) == 1
+
+
+def test_consolidated_edges_gathered_per_key():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    same_proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+
+    proc.launched[other_proc].append(timestamp=1)
+    same_proc.launched[other_proc].append(timestamp=2)
+
+    backend = NetworkX(consolidate_edges=True, nodes=[])
+
+    # Not de-duplicated, both instances of the edge are gathered into one.
+    backend._insert_nodes([proc, same_proc, other_proc])
+
+    edge = backend.G[hash(proc)][hash(other_proc)]["Launched"]
+    assert edge["data"] == [{"timestamp": 1}, {"timestamp": 2}]
+
+
 def test_from_datasources():
     packets_1 = [
         Ether(src="ab:ab:ab:ab:ab:ab", dst="12:12:12:12:12:12")
@@ -239,3 +281,164 @@ def test_from_datasources():
     nx.graph()
 
     assert not nx.is_empty()
+
+
+def test_report_counts():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+    f = File(file_path="c:", file_name="foo.txt")
+
+    proc.launched[other_proc].append(timestamp=1)
+    other_proc.wrote[f].append(timestamp=2)
+
+    backend = NetworkX(nodes=[proc, other_proc, f], consolidate_edges=True)
+    backend.graph()
+
+    assert set(backend.report.stages) == {"dedup", "graph"}
+    assert backend.report.node_counts == {"Process": 2, "File": 1}
+    assert backend.report.edge_counts == {"Launched": 1, "Wrote": 1}
+
+
+def test_invalid_edge_compaction():
+    with pytest.raises(ValueError):
+        NetworkX(nodes=[], edge_compaction="foo")
+
+
+@pytest.mark.parametrize(
+    "policy,expected",
+    [
+        ("dedup", [{"timestamp": 1, "count": 2}, {"timestamp": 2, "count": 1}]),
+        (
+            "timestamps",
+            [
+                {
+                    "timestamp": 1,
+                    "first_timestamp": 1,
+                    "last_timestamp": 2,
+                    "min_timestamp": 1,
+                    "max_timestamp": 2,
+                    "count": 3,
+                }
+            ],
+        ),
+        ("cap", [{"timestamp": 1}, {"timestamp": 1, "count": 2}]),
+    ],
+)
+def test_edge_compaction(policy, expected):
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+
+    for timestamp in [1, 1, 2]:
+        proc.launched[other_proc].append(timestamp=timestamp)
+
+    backend = NetworkX(
+        nodes=[proc, other_proc], consolidate_edges=True, edge_compaction=policy, edge_cap=2
+    )
+    G = backend.graph()
+
+    edge = G[hash(proc)][hash(other_proc)]["Launched"]
+    assert edge["data"] == expected
+    assert edge["count"] == 3
+
+    # The count survives a round trip through JSON.
+    data = backend.to_json()
+    assert data["links"][0]["properties"]["count"] == 3
+
+    loaded = NetworkX.from_json(data)
+    edge = next(iter(loaded.edges(data=True)))[2]
+    assert edge["data"] == expected
+    assert edge["count"] == 3
+
+
+def test_edge_compaction_added_nodes():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+    proc.launched[other_proc].append(timestamp=1)
+
+    backend = NetworkX(nodes=[proc, other_proc], consolidate_edges=True, edge_compaction="dedup")
+    backend.graph()
+
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+    proc.launched[other_proc].append(timestamp=1)
+    proc.launched[other_proc].append(timestamp=1)
+
+    backend.add_nodes([proc, other_proc])
+
+    edge = backend.G[hash(proc)][hash(other_proc)]["Launched"]
+    assert edge["data"] == [{"timestamp": 1, "count": 3}]
+    assert edge["count"] == 3
+
+
+def test_edge_compaction_not_consolidated():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+
+    for _ in range(5):
+        proc.launched[other_proc].append(timestamp=1)
+
+    G = NetworkX(nodes=[proc, other_proc], edge_compaction="cap", edge_cap=2).graph()
+
+    assert len(G.edges()) == 2
+
+    # The edges kept still account for every event.
+    data = [attrs["data"] for _, _, attrs in G.edges(data=True)]
+    assert data == [{"timestamp": 1}, {"timestamp": 1, "count": 4}]
+
+
+@pytest.mark.parametrize("consolidate_edges", [True, False])
+def test_named_edges_grouped(consolidate_edges):
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    ip = IPAddress("127.0.0.1")
+
+    proc.connected_to[ip].append(port=80, protocol="TCP", timestamp=1)
+    proc.connected_to[ip].append(port=53, protocol="UDP", timestamp=2)
+    proc.connected_to[ip].append(port=443, protocol="TCP", timestamp=3)
+
+    G = NetworkX(nodes=[proc, ip], consolidate_edges=consolidate_edges).graph()
+
+    ports = {}
+    for _, _, data in G.edges(data=True):
+        ports.setdefault(data["edge_name"], []).append(data["data"])
+
+    if consolidate_edges:
+        tcp, udp = ports["TCP"][0], ports["UDP"][0]
+    else:
+        tcp, udp = ports["TCP"], ports["UDP"]
+
+    # Each name only gets its own events.
+    assert [event["port"] for event in tcp] == [80, 443]
+    assert [event["port"] for event in udp] == [53]
+
+
+def test_graph_keeps_node_order():
+    proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c foobar")
+    f = File(file_path="c:", file_name="foo.txt")
+    other_proc = Process(process_id=12, process_image="best.exe", command_line=None)
+    updated = Process(process_id=12, process_image="best.exe", command_line="best.exe /c 123456")
+
+    proc.wrote[f].append(timestamp=1)
+    proc.launched[other_proc].append(timestamp=2)
+
+    backend = NetworkX(nodes=[proc, updated], consolidate_edges=True)
+    G = backend.graph()
+
+    # Destinations are added after their source, and replaced once inserted themselves.
+    assert list(G.nodes()) == [hash(proc), hash(f), hash(other_proc)]
+    assert G.nodes[hash(other_proc)]["data"].command_line == "best.exe /c 123456"
+    assert len(G.edges()) == 2
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_graph_restores_gc(enabled):
+    proc = Process(process_id=10, process_image="test.exe")
+    proc.wrote[File(file_path="c:", file_name="foo.txt")].append(timestamp=1)
+
+    if not enabled:
+        gc.disable()
+
+    try:
+        NetworkX(nodes=[proc], consolidate_edges=True).graph()
+        assert gc.isenabled() is enabled
+    finally:
+        gc.enable()
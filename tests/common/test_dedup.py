@@ -0,0 +1,60 @@
+from beagle.common import dedup_nodes
+from beagle.common.dedup import sharded_dedup_nodes
+from beagle.nodes import File, Process
+
+
+def make_nodes():
+    nodes = []
+    for i in range(40):
+        proc = Process(process_id=i % 10, process_image="a.exe", command_line=f"a.exe {i}")
+        f = File(file_path="c:\\temp", file_name=f"{i % 5}.txt")
+        proc.wrote[f].append(contents=str(i))
+
+        # Only reachable through the edge.
+        child = Process(process_id=100 + i % 3, process_image="b.exe", command_line="b.exe")
+        proc.launched[child].append(timestamp=i)
+
+        nodes += [proc, f]
+    return nodes
+
+
+def test_sharded_dedup_matches_dedup():
+    expected = {hash(node): node for node in dedup_nodes(make_nodes(), workers=1)}
+    nodes = sharded_dedup_nodes(make_nodes(), workers=3)
+
+    assert len(nodes) == len(expected) == 15
+
+    for node in nodes:
+        other = expected[hash(node)]
+        assert dict(node._attributes()) == dict(other._attributes())
+
+        for attr, edge_map in other._edge_items():
+            edges = getattr(node, attr)
+            assert set(edges) == set(edge_map)
+            for dest, edge in edge_map.items():
+                assert sorted(map(str, edges[dest].column(edge._fields[0]))) == sorted(
+                    map(str, edge.column(edge._fields[0]))
+                )
+
+
+def test_sharded_dedup_relinks_edges():
+    nodes = sharded_dedup_nodes(make_nodes(), workers=2)
+    by_hash = {hash(node): node for node in nodes}
+
+    for node in nodes:
+        if not isinstance(node, Process):
+            continue
+
+        for dest in node.wrote:
+            # Edges point to the merged nodes.
+            assert dest is by_hash[hash(dest)]
+
+        for dest in node.launched:
+            # Destinations which were not in the list keep all of their fields.
+            assert dest.command_line == "b.exe"
+
+
+def test_dedup_nodes_small_list_not_sharded():
+    nodes = dedup_nodes(make_nodes(), workers=4)
+
+    assert len(nodes) == 15
@@ -0,0 +1,141 @@
+import networkx as nx
+import pytest
+
+from beagle.backends.networkx import NetworkX
+from beagle.common.memory import MemoryBudgetExceeded, graph_memory_usage, node_memory_usage
+from beagle.datasources.json_data import JSONData
+from beagle.nodes import File, Process
+from beagle.transformers import GenericTransformer
+from tests.transformers.test_base_transformer import make_events
+
+
+def make_nodes():
+    parent = Process(process_id=1, process_image="a.exe", host="host")
+    child = Process(process_id=2, process_image="b.exe", host="host")
+    f = File(file_path="c:\\", file_name="foo.txt")
+
+    for i in range(10):
+        parent.launched[child].append(timestamp=i)
+    child.wrote[f].append(timestamp=1)
+
+    return [parent, child, f]
+
+
+def test_node_memory_usage():
+    usage = node_memory_usage(make_nodes())
+
+    assert usage["nodes"]["Process"]["count"] == 2
+    assert usage["nodes"]["File"]["count"] == 1
+    assert usage["edges"]["Launched"]["count"] == 1
+    assert usage["edges"]["Launched"]["events"] == 10
+    assert usage["edges"]["Wrote"]["events"] == 1
+
+    assert usage["total"] == sum(
+        stats["bytes"] for stats in list(usage["nodes"].values()) + list(usage["edges"].values())
+    )
+    assert usage["edges"]["Launched"]["bytes"] > usage["edges"]["Wrote"]["bytes"]
+
+
+def test_node_memory_usage_largest_edges():
+    usage = node_memory_usage(make_nodes(), top=1)
+
+    assert len(usage["largest_edges"]) == 1
+    assert usage["largest_edges"][0]["type"] == "Launched"
+    assert usage["largest_edges"][0]["events"] == 10
+
+
+def test_shared_values_counted_once():
+    nodes = make_nodes()
+    single = node_memory_usage(nodes[:1])["nodes"]["Process"]["bytes"]
+    both = node_memory_usage(nodes[:2])["nodes"]["Process"]["bytes"]
+
+    # The second process shares its host string with the first.
+    assert both < 2 * single
+
+
+def test_graph_memory_usage():
+    backend = NetworkX(nodes=make_nodes(), consolidate_edges=True)
+    G = backend.graph()
+
+    usage = graph_memory_usage(G)
+
+    assert usage["nodes"]["Process"]["count"] == 2
+    assert usage["edges"]["Launched"]["events"] == 10
+    assert usage["largest_edges"][0]["type"] == "Launched"
+
+
+def test_graph_memory_usage_not_consolidated():
+    backend = NetworkX(nodes=make_nodes(), consolidate_edges=False)
+    G = backend.graph()
+
+    usage = graph_memory_usage(G)
+
+    assert usage["edges"]["Launched"]["count"] == 10
+    assert usage["edges"]["Launched"]["events"] == 10
+    assert usage["edges"]["Wrote"]["events"] == 1
+    assert usage["largest_edges"][0]["events"] == 1
+
+
+def test_graph_memory_usage_empty():
+    assert graph_memory_usage(nx.MultiDiGraph()) == {
+        "total": 0,
+        "nodes": {},
+        "edges": {},
+        "largest_edges": [],
+    }
+
+
+def test_memory_report():
+    transformer = GenericTransformer(datasource=JSONData(make_events(20)), memory_report=True)
+
+    backend = NetworkX(nodes=transformer.run(), consolidate_edges=True)
+    backend.report = transformer.report
+    backend.graph()
+
+    memory = transformer.report.to_dict()["memory"]
+    assert memory["nodes"]["nodes"]["Process"]["count"] == 20
+    assert memory["graph"]["nodes"]["Process"]["count"] == 20
+
+
+def test_memory_report_disabled():
+    transformer = GenericTransformer(datasource=JSONData(make_events(20)))
+    transformer.run()
+
+    assert transformer.report.to_dict()["memory"] is None
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_memory_budget_exceeded(monkeypatch, execution):
+    checks = []
+
+    def fake_rss():
+        # Over the budget from the fourth batch on.
+        checks.append(1)
+        return 2 * 1024 * 1024 if len(checks) > 3 else 0
+
+    monkeypatch.setattr("beagle.transformers.base_transformer.current_rss", fake_rss)
+
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)),
+        execution=execution,
+        workers=1,
+        batch_size=5,
+        memory_budget_mb=1,
+    )
+
+    with pytest.raises(MemoryBudgetExceeded) as e:
+        transformer.run()
+
+    assert e.value.budget == 1024 * 1024
+    assert e.value.rss == 2 * 1024 * 1024
+    # The nodes of the first three batches.
+    assert e.value.usage["nodes"]["Process"]["count"] == 15
+    assert str(e.value).startswith("Memory usage of 2MB is over the budget of 1MB.")
+
+
+def test_memory_budget_not_exceeded():
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)), memory_budget_mb=1024 * 1024
+    )
+
+    assert len(transformer.run()) == 101
@@ -178,3 +178,21 @@ def test_multiple_packets():
     assert len(events) == 3
 
     assert [e["event_type"] for e in events] == ["HTTPRequest", "DNS", "TCP"]
+
+
+def test_event_types_skip_packets():
+    packets = [
+        Ether(src="ab:ab:ab:ab:ab:ab", dst="12:12:12:12:12:12"),
+        Ether(src="ab:ab:ab:ab:ab:ab", dst="12:12:12:12:12:12")
+        / IP(src="127.0.0.1", dst="192.168.1.1"),
+        Ether(src="ab:ab:ab:ab:ab:ab", dst="12:12:12:12:12:12")
+        / IP(src="127.0.0.1", dst="192.168.1.1")
+        / TCP(sport=80, dport=5355),
+    ]
+
+    datasource = packets_to_datasource_events(packets)
+    datasource.set_event_types({"TCP", "UDP"})
+
+    events = list(datasource.events())
+    assert len(events) == 1
+    assert events[0]["event_type"] == "TCP"
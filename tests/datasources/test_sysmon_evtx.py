@@ -0,0 +1,20 @@
+from lxml import etree
+
+from beagle.datasources.sysmon_evtx import SysmonEVTX
+
+
+def test_event_id():
+    record = etree.fromstring(
+        '<Event xmlns="http://schemas.microsoft.com/win/2004/08/events/event">'
+        + "<System><EventID>11</EventID></System>"
+        + "<EventData><Data Name='Image'>C:\\cmd.exe</Data></EventData>"
+        + "</Event>"
+    )
+
+    assert SysmonEVTX.event_id(record) == 11
+
+
+def test_event_id_missing():
+    record = etree.fromstring("<Event><System></System></Event>")
+
+    assert SysmonEVTX.event_id(record) is None
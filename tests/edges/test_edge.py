@@ -1,6 +1,9 @@
-from beagle.edges import Edge
+import mock
+import numpy as np
 import pytest
 
+from beagle.edges import ConnectedTo, Edge, Launched
+
 
 def make_edge_obj():
     class DummyEdge(Edge):
@@ -55,3 +58,195 @@ def test_invalid_keys_error_add():
 def test_display():
     edge = make_edge_obj()
     assert edge._display == "dummy"
+
+
+def test_events_materialized():
+    edge = make_edge_obj()
+
+    edge.append(field1="blah")
+
+    assert edge._events == [{"field1": "blah", "field2": None, "edge_name": "dummy"}]
+
+    # Changing the returned dicts does not change the edge.
+    edge._events[0].pop("edge_name")
+    assert edge._events[0]["edge_name"] == "dummy"
+
+
+def test_int_column_array():
+    edge = Launched()
+
+    for i in range(1000):
+        edge.append(timestamp=i)
+
+    column = edge.column("timestamp")
+
+    assert isinstance(column, np.ndarray)
+    assert column.tolist() == list(range(1000))
+    assert {"timestamp": 999} in edge
+    assert {"timestamp": 1000} not in edge
+    assert edge._events[10] == {"timestamp": 10, "edge_name": "Launched"}
+
+
+def test_int_column_mixed_values():
+    edge = Launched()
+
+    for i in range(300):
+        edge.append(timestamp=i)
+
+    edge.append(timestamp="2019-01-01")
+    edge.append()
+
+    for i in range(300):
+        edge.append(timestamp=i)
+
+    column = edge.column("timestamp")
+
+    assert isinstance(column, list)
+    assert column[:300] == list(range(300))
+    assert column[300:302] == ["2019-01-01", None]
+    assert len(edge) == 602
+    assert {"timestamp": "2019-01-01"} in edge
+
+
+@pytest.mark.parametrize("events,index_min_events", [(10, 64), (300, 64), (300, 10000)])
+def test_contains_int_and_float(events, index_min_events):
+    edge = Launched()
+
+    for i in range(events):
+        edge.append(timestamp=i)
+
+    # Small edges scan a list, larger ones use the index, or scan the array without one.
+    with mock.patch("beagle.edges.edge._INDEX_MIN_EVENTS", index_min_events):
+        assert {"timestamp": 5} in edge
+        assert {"timestamp": 5.0} in edge
+        assert {"timestamp": True} in edge
+        assert {"timestamp": 5.5} not in edge
+        assert {"timestamp": float("nan")} not in edge
+        assert {"timestamp": 2**70} not in edge
+        assert {"timestamp": "5"} not in edge
+
+
+def test_contains_empty_edge():
+    edge = Launched()
+
+    assert {"timestamp": 1} not in edge
+    assert {"unknown": 1} not in edge
+
+    edge.append(timestamp=1)
+
+    with pytest.raises(KeyError):
+        {"unknown": 1} in edge
+
+
+def test_event_names():
+    edge = ConnectedTo()
+
+    edge.append(port=80, protocol="HTTP")
+    edge.append(port=53)
+
+    assert edge.column("edge_name") == ["HTTP", "Connected To"]
+    assert [event["edge_name"] for event in edge._events] == ["HTTP", "Connected To"]
+
+
+def test_contains_index_updated_on_append():
+    edge = ConnectedTo()
+
+    for i in range(100):
+        edge.append(port=i, protocol="TCP")
+
+    assert {"port": 5, "protocol": "TCP"} in edge
+    assert {"port": 100} not in edge
+    assert {"edge_name": "HTTP"} not in edge
+    assert set(edge._index) == {"port", "protocol", "edge_name"}
+
+    edge.append(port=100, protocol="HTTP")
+
+    assert {"port": 100} in edge
+    assert {"edge_name": "HTTP"} in edge
+
+
+def test_contains_index_unhashable():
+    edge = make_edge_obj()
+
+    for i in range(100):
+        edge.append(field1=str(i))
+
+    assert {"field1": "5"} in edge
+
+    edge.append(field1=["a"])
+
+    assert edge._index["field1"] is None
+    assert {"field1": ["a"]} in edge
+    assert {"field1": "5"} in edge
+    assert {"field1": ["b"]} not in edge
+
+
+def test_contains_small_edge_not_indexed():
+    edge = Launched()
+    edge.append(timestamp=1)
+
+    assert {"timestamp": 1} in edge
+    assert edge._index is None
+
+
+def test_extend():
+    edge = Launched()
+    other = Launched()
+
+    for i in range(300):
+        edge.append(timestamp=i)
+
+    for i in range(300, 700):
+        other.append(timestamp=i)
+    other.append(timestamp="2019-01-01")
+
+    before = other._events
+
+    edge.extend(other)
+
+    assert len(edge) == 701
+    assert edge.column("timestamp")[:700] == list(range(700))
+    assert edge.column("timestamp")[700] == "2019-01-01"
+    assert other._events == before
+
+
+def test_extend_int_columns_stay_arrays():
+    edge = Launched()
+    other = Launched()
+
+    for i in range(10):
+        edge.append(timestamp=i)
+
+    for i in range(10, 1000):
+        other.append(timestamp=i)
+
+    edge.extend(other)
+
+    column = edge.column("timestamp")
+    assert isinstance(column, np.ndarray)
+    assert column.tolist() == list(range(1000))
+
+
+def test_extend_names_and_index():
+    edge = ConnectedTo()
+    other = ConnectedTo()
+
+    for i in range(100):
+        edge.append(port=i)
+
+    assert {"edge_name": "HTTP"} not in edge
+
+    other.append(port=80, protocol="HTTP")
+    edge.extend(other)
+
+    assert edge.column("edge_name") == ["Connected To"] * 100 + ["HTTP"]
+    assert {"edge_name": "HTTP", "port": 80} in edge
+
+
+def test_extend_other_class():
+    edge = Launched()
+    other = ConnectedTo()
+    other.append(port=80)
+
+    with pytest.raises(RuntimeError):
+        edge.extend(other)
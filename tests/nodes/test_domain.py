@@ -20,3 +20,12 @@ def test_uri_of():
 
     assert dom in uri.uri_of
     assert {"timestamp": 1234} in uri.uri_of[dom]
+
+
+def test_uri_edges_not_shared():
+    uri = URI(uri="/foo")
+    other_uri = URI(uri="/bar")
+
+    uri.uri_of[Domain(domain="google.com")]
+
+    assert other_uri.edges == []
@@ -1,9 +1,15 @@
+import os
+import pickle
+import subprocess
+import sys
 from collections import defaultdict
+from fractions import Fraction
 from typing import List, DefaultDict
 
+import numpy as np
 import pytest
 
-from beagle.nodes import Node
+from beagle.nodes import Node, Process
 from beagle.edges import Edge
 
 
@@ -214,6 +220,26 @@ def testMergesEdgesAdded():
     assert {"field1": "foo", "field2": "bar"} in n1.dummyedge[n3]
 
 
+def testMergeKeepsSourceEdges():
+    n1 = DummyNode(x=1, y=2, z=1)
+    n2 = DummyNode(x=1, y=2, z=1)
+    n3 = DummyNode(x=2, y=3, z=3)
+
+    n1.dummyedge[n3].append(field1="a", field2="b")
+    n2.dummyedge[n3].append(field1="foo", field2="bar")
+    n2.dummyedge[n3].append(field1="baz", field2="qux")
+
+    n1.merge_with(n2)
+
+    assert n1.dummyedge[n3].column("field1") == ["a", "foo", "baz"]
+
+    # The source node is left as it was.
+    assert n2.dummyedge[n3]._events == [
+        {"field1": "foo", "field2": "bar", "edge_name": "dummy"},
+        {"field1": "baz", "field2": "qux", "edge_name": "dummy"},
+    ]
+
+
 def testMergesMultipleEdges():
 
     # n1 == n2
@@ -245,3 +271,114 @@ def testMergesMultipleEdges():
 
     assert {"field1": "foo", "field2": "bar"} in n1.dummyedge[n3]
     assert {"field1": "bar", "field2": "foo"} in n1.dummyedge[n4]
+
+
+def testPickleWithCycle():
+    n1 = DummyNode(x=1, y=2, z=1)
+    n2 = DummyNode(x=2, y=3, z=3)
+
+    n1.dummyedge[n2].append(field1="foo", field2="bar")
+    n2.dummyedge[n1]
+
+    restored = pickle.loads(pickle.dumps(n1))
+
+    assert restored == n1
+    assert restored.z == 1
+    assert n2 in restored.dummyedge
+    assert restored in list(restored.dummyedge.keys())[0].dummyedge
+    assert {"field1": "foo", "field2": "bar"} in restored.dummyedge[n2]
+
+
+def testHashStableAcrossProcesses():
+    script = (
+        "from beagle.nodes import File, Process;"
+        + "print(hash(Process(host='h', process_id=1, process_image='a.exe')),"
+        + "hash(File(host='h', full_path='c:\\\\a.exe')))"
+    )
+
+    outputs = {
+        subprocess.check_output(
+            [sys.executable, "-c", script], env={**os.environ, "PYTHONHASHSEED": seed}
+        )
+        for seed in ["1", "2"]
+    }
+
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize("process_id", [1.0, True, np.int64(1), np.float32(1), Fraction(1)])
+def testEqualNodesHashTheSame(process_id):
+    n1 = Process(host="h", process_id=1, process_image="a.exe")
+    n2 = Process(host="h", process_id=process_id, process_image="a.exe")
+
+    assert n1 == n2
+    assert hash(n1) == hash(n2)
+    assert len({n1, n2}) == 1
+
+
+def testHashDistinguishesValues():
+    hashes = {
+        hash(Process(host=host, process_id=process_id, process_image=image))
+        for host, process_id, image in [
+            ("h", 1, "a.exe"),
+            ("h", 1.5, "a.exe"),
+            ("h", "1", "a.exe"),
+            ("h", None, "a.exe"),
+            ("h", b"1", "a.exe"),
+            ("h, 1", None, "a.exe"),
+            (None, 1, "a.exe"),
+        ]
+    }
+
+    assert len(hashes) == 7
+
+
+def testHashIncludesClassName():
+    class OtherNode(Node):
+        key_fields: List[str] = ["x", "y"]
+
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+
+    assert hash(OtherNode(x=1, y=2)) != hash(DummyNode(x=1, y=2, z=3))
+    assert hash(DummyNode(x=1, y=2, z=3)) == hash(DummyNode(x=1, y=2, z=4))
+
+
+def testHashUpdatedWhenKeyFieldSet():
+    n1 = DummyNode(x=1, y=2, z=1)
+    n2 = DummyNode(x=5, y=2, z=1)
+
+    before = hash(n1)
+    assert n1 != n2
+
+    n1.x = 5
+
+    assert hash(n1) != before
+    assert hash(n1) == hash(n2)
+    assert n1 == n2
+
+
+def testHashNotUpdatedForOtherFields():
+    proc = Process(process_id=10, process_image="test.exe")
+    before = hash(proc)
+
+    proc.command_line = "test.exe /c"
+    assert proc._hash == before
+
+    proc.process_id = 12
+    assert proc._hash is None
+    assert hash(proc) == hash(Process(process_id=12, process_image="test.exe"))
+
+
+def testInternFields():
+    image = "".join(["test", ".exe"])
+    proc = Process(process_id=10, process_image=image, command_line="".join(["test", ".exe"]))
+    before = hash(proc)
+
+    proc._intern_fields()
+
+    assert proc.process_image is sys.intern("test.exe")
+    assert proc.command_line is proc.process_image
+    assert proc._hash == before
+    assert proc == Process(process_id=10, process_image="test.exe")
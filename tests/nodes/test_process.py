@@ -58,3 +58,29 @@ def testLaunchedMultipleProces():
     assert {"timestamp": 2} not in parent.launched[child]
     assert {"timestamp": 2} in parent2.launched[child2]
     assert {"timestamp": 12456} not in parent2.launched[child2]
+
+
+def testEdgesCreatedOnAccess():
+    proc = Process(process_id=10, process_image="test.exe")
+    other_proc = Process(process_id=12, process_image="best.exe")
+
+    assert not hasattr(proc, "__dict__")
+    assert proc.edges == []
+
+    proc.launched[other_proc].append(timestamp=1)
+
+    assert proc.edges == [proc.launched]
+    assert "launched" not in proc.to_dict()
+
+
+def testMergeWithLazyEdges():
+    proc = Process(process_id=10, process_image="test.exe")
+    other_proc = Process(process_id=12, process_image="best.exe")
+
+    same_proc = Process(process_id=10, process_image="test.exe", command_line="test.exe /c")
+    same_proc.launched[other_proc].append(timestamp=1)
+
+    proc.merge_with(same_proc)
+
+    assert proc.command_line == "test.exe /c"
+    assert {"timestamp": 1} in proc.launched[other_proc]
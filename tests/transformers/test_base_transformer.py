@@ -0,0 +1,381 @@
+import mock
+import pytest
+
+from beagle.constants import EventTypes, FieldNames
+from beagle.datasources.json_data import JSONData
+from beagle.nodes import File, Process
+from beagle.transformers import DRAPATCTransformer, GenericTransformer, SysmonTransformer
+from beagle.transformers.base_transformer import Transformer, handles
+
+
+def make_events(count: int) -> list:
+    return [
+        {
+            FieldNames.PROCESS_IMAGE: "cmd.exe",
+            FieldNames.PROCESS_IMAGE_PATH: "c:\\windows",
+            FieldNames.PROCESS_ID: str(i),
+            FieldNames.COMMAND_LINE: "cmd.exe",
+            FieldNames.FILE_NAME: f"{i}.txt",
+            FieldNames.FILE_PATH: "c:\\temp",
+            FieldNames.EVENT_TYPE: EventTypes.FILE_WRITTEN,
+        }
+        for i in range(count)
+    ]
+
+
+def test_invalid_execution():
+    with pytest.raises(ValueError):
+        GenericTransformer(datasource=None, execution="fibers")
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_run(execution):
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)), execution=execution, workers=2, batch_size=7
+    )
+
+    nodes = transformer.run()
+
+    # Process and written File per event, all processes share a single image File.
+    assert len(nodes) == 101
+    assert len([node for node in nodes if isinstance(node, Process)]) == 50
+
+    written = [node for node in nodes if isinstance(node, File) and node.file_name == "3.txt"]
+    assert len(written) == 1
+
+    writer = next(node for node in nodes if isinstance(node, Process) and node.process_id == 3)
+    assert written[0] in writer.wrote
+
+
+def test_process_execution_records_errors():
+    events = make_events(5)
+    events[2][FieldNames.PROCESS_ID] = "not a pid"
+
+    transformer = GenericTransformer(
+        datasource=JSONData(events), execution="process", workers=1, batch_size=2
+    )
+
+    nodes = transformer.run()
+
+    assert len(nodes) == 9
+    assert sum(len(errors) for errors in transformer.errors.values()) == 1
+
+
+def test_to_transformer_kwargs():
+    transformer = JSONData([]).to_transformer(execution="process", workers=3)
+
+    assert transformer.execution == "process"
+    assert transformer.workers == 3
+
+
+def test_batches():
+    transformer = GenericTransformer(datasource=JSONData(make_events(50)), batch_size=7)
+
+    batches = list(transformer._batches())
+
+    assert len(batches) == 8
+    assert all(len(batch) == 7 for batch in batches[:-1])
+    assert len(batches[-1]) == 1
+    assert transformer.count == 50
+
+
+def test_bounded_queue():
+    transformer = GenericTransformer(datasource=None, queue_size=2)
+
+    assert transformer._queue.maxsize == 2
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_memory_ceiling_does_not_block(execution):
+    # The process is always above a 1MB ceiling, reading should still complete.
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(20)),
+        execution=execution,
+        workers=1,
+        batch_size=3,
+        queue_size=2,
+        max_rss_mb=1,
+    )
+
+    assert len(transformer.run()) == 41
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_stream(execution):
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)), execution=execution, workers=2, batch_size=4
+    )
+
+    batches = list(transformer.stream(batch_size=40))
+
+    # Nodes are de-duplicated per batch of events.
+    assert [len(batch) for batch in batches] == [40, 40, 33]
+    # Streamed nodes are not kept on the transformer.
+    assert transformer.nodes == []
+
+
+def test_stream_stopped_early():
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(500)), workers=2, batch_size=1, queue_size=1
+    )
+
+    stream = transformer.stream(batch_size=3)
+
+    assert len(next(stream)) == 3
+
+    stream.close()
+
+    assert transformer.count < 500
+
+
+def test_stream_into_backend():
+    from beagle.backends import NetworkX
+
+    backend = NetworkX(nodes=[], consolidate_edges=True)
+
+    for nodes in GenericTransformer(datasource=JSONData(make_events(50))).stream(batch_size=10):
+        backend.add_nodes(nodes)
+
+    # 50 processes, 1 shared image file, and 50 written files.
+    assert len(backend.G.nodes()) == 101
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_run_merges_across_workers(execution):
+    events = make_events(40)
+    for event in events:
+        event[FieldNames.PROCESS_ID] = "1000"
+
+    transformer = GenericTransformer(
+        datasource=JSONData(events), execution=execution, workers=3, batch_size=3
+    )
+
+    nodes = transformer.run()
+
+    processes = [node for node in nodes if isinstance(node, Process)]
+
+    # A single process which wrote to every file.
+    assert len(processes) == 1
+    assert len(processes[0].wrote) == 40
+    assert len(nodes) == 42
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_report(execution):
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)), execution=execution, workers=2, batch_size=10
+    )
+
+    transformer.to_graph(consolidate_edges=True)
+
+    report = transformer.report.to_dict()
+
+    assert report["events"] == 50
+    assert report["errors"] == 0
+    assert set(report["stages"]) == {"transform", "dedup", "graph"}
+    assert report["handlers"]["transform"]["count"] == 50
+    assert report["handlers"]["make_basic_file"]["count"] == 50
+    assert sum(report["handlers"]["make_basic_file"]["histogram"].values()) == 50
+    assert report["nodes"] == {"Process": 50, "File": 51}
+    assert report["edges"] == {"Wrote": 50, "File Of": 50}
+
+
+def test_report_merges_handlers_per_batch():
+    transformer = GenericTransformer(datasource=JSONData(make_events(50)), workers=2, batch_size=10)
+
+    with mock.patch.object(
+        transformer.report, "merge_handlers", wraps=transformer.report.merge_handlers
+    ) as merge, mock.patch.object(transformer.report, "record_handler") as record:
+        transformer.run()
+
+    # Consumers only take the report lock once per batch.
+    assert record.call_count == 0
+    assert merge.call_count == 5
+
+    assert transformer.report.handlers["transform"].count == 50
+    assert transformer.report.handlers["make_basic_file"].count == 50
+
+
+class DispatchTransformer(Transformer):
+    name = "Dispatch"
+
+    def transform(self, event: dict):
+        return self.dispatch(event)
+
+    def event_key(self, event: dict):
+        return (event["kind"], event.get("sub"))
+
+    @handles(("a", "x"), ("a", "y"))
+    def handle_a(self, event: dict):
+        return ("a",)
+
+    @handles("b")
+    def handle_b(self, event: dict):
+        return ("b",)
+
+
+class ChildDispatchTransformer(DispatchTransformer):
+    @handles("b")
+    def handle_b_child(self, event: dict):
+        return ("child_b",)
+
+
+def test_dispatch():
+    transformer = DispatchTransformer(datasource=None)
+
+    assert transformer.transform({"kind": "a", "sub": "x"}) == ("a",)
+    assert transformer.transform({"kind": "a", "sub": "y"}) == ("a",)
+    # Falls back to the first element of the key.
+    assert transformer.transform({"kind": "b", "sub": "anything"}) == ("b",)
+
+    assert transformer.transform({"kind": "a", "sub": "z"}) is None
+    assert transformer.transform({"kind": "a", "sub": "z"}) is None
+    assert transformer.transform({"kind": "c"}) is None
+
+    assert transformer.unhandled == {("a", "z"): 2, ("c", None): 1}
+
+
+def test_dispatch_subclass_overrides():
+    transformer = ChildDispatchTransformer(datasource=None)
+
+    assert transformer.transform({"kind": "b"}) == ("child_b",)
+    assert transformer.transform({"kind": "a", "sub": "x"}) == ("a",)
+
+
+def test_unhandled_keys():
+    assert SysmonTransformer.unhandled_keys([1, 2, 3, 11, 12, 13, 22]) == [2, 12]
+
+    assert DRAPATCTransformer.unhandled_keys(
+        [("registrykeyobject", None), ("event", "EVENT_EXECUTE"), ("event", "EVENT_FORK")]
+    ) == [("event", "EVENT_FORK")]
+
+    assert GenericTransformer.unhandled_keys([EventTypes.PROCESS_LAUNCHED, None]) == [None]
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_run_counts_unhandled(execution):
+    events = make_events(10) + [{FieldNames.EVENT_TYPE: "unknown"}] * 3
+
+    transformer = GenericTransformer(
+        datasource=JSONData(events), execution=execution, workers=2, batch_size=2
+    )
+
+    transformer.run()
+
+    assert transformer.unhandled == {"unknown": 3}
+
+
+def test_run_counts_unhandled_per_batch():
+    events = [{FieldNames.EVENT_TYPE: "unknown"}] * 5000
+
+    transformer = GenericTransformer(datasource=JSONData(events), workers=4, batch_size=50)
+
+    with mock.patch.object(
+        transformer, "_merge_batch_stats", wraps=transformer._merge_batch_stats
+    ) as merge:
+        transformer.run()
+
+    # Consumers count into their own batch counter, and merge it once per batch.
+    assert merge.call_count == 100
+    assert transformer.unhandled == {"unknown": 5000}
+
+
+class EventTypesJSONData(JSONData):
+    """Records the event types set when the events are read."""
+
+    name = "Event Types JSON Data"
+    transformers = [GenericTransformer]
+    category = "Generic Data"
+
+    def __init__(self, events) -> None:
+        super().__init__(events)
+        self.read_event_types: list = []
+
+    def events(self):
+        self.read_event_types.append(self._event_types)
+        yield from super().events()
+
+
+def test_event_types_pushed_to_datasource():
+    datasource = EventTypesJSONData(make_events(10))
+
+    SysmonTransformer(datasource=datasource).run()
+
+    assert datasource.read_event_types == [{1, 3, 11, 13, 14, 15, 22}]
+    assert datasource._event_types is None
+
+    # Another transformer reading the same datasource gets every event.
+    assert len(GenericTransformer(datasource=datasource).run()) == 21
+    assert datasource.read_event_types[-1] is None
+
+
+def test_event_types_restored_when_stream_stops():
+    class FileTransformer(GenericTransformer):
+        def accepted_event_types(self):
+            return {EventTypes.FILE_WRITTEN}
+
+    datasource = EventTypesJSONData(make_events(100))
+    datasource.set_event_types({"other"})
+
+    stream = FileTransformer(datasource=datasource, batch_size=5).stream(batch_size=1)
+    next(stream)
+    stream.close()
+
+    assert datasource.read_event_types == [{EventTypes.FILE_WRITTEN}]
+    assert datasource._event_types == {"other"}
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_run_interns_strings(execution):
+    transformer = GenericTransformer(
+        datasource=JSONData(make_events(50)), execution=execution, workers=2, batch_size=7
+    )
+
+    nodes = transformer.run()
+
+    # Files written by every process, which came back from different batches.
+    paths = [node.file_path for node in nodes if isinstance(node, File) and node.file_name]
+    assert len(paths) == 51
+    assert len({id(path) for path in paths if path == "c:\\temp"}) == 1
+
+
+def test_get_or_create_outside_run():
+    transformer = GenericTransformer(datasource=None)
+
+    proc = Process(process_id=1, process_image="a.exe")
+    other = Process(process_id=1, process_image="a.exe")
+
+    assert transformer.get_or_create(proc) is proc
+    assert transformer.get_or_create(other) is other
+
+
+class RecordingTransformer(GenericTransformer):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.returned: list = []
+
+    def transform(self, event):
+        nodes = super().transform(event)
+        self.returned.append(nodes)
+        return nodes
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_get_or_create_during_run(execution):
+    events = make_events(20)
+    for event in events[10:]:
+        event[FieldNames.PROCESS_ID] = "1000"
+
+    transformer = RecordingTransformer(
+        datasource=JSONData(events), execution=execution, workers=1, batch_size=20
+    )
+
+    nodes = transformer.run()
+
+    if execution == "thread":
+        # Every event reused the same image file, and the same process for the last 10.
+        assert len({id(returned[1]) for returned in transformer.returned}) == 1
+        assert len({id(returned[0]) for returned in transformer.returned[10:]}) == 1
+
+    process = next(node for node in nodes if isinstance(node, Process) and node.process_id == 1000)
+    assert len(process.wrote) == 10
@@ -0,0 +1,202 @@
+import json
+import os
+
+import pytest
+
+from beagle.common.checkpoint import load_checkpoint, save_checkpoint
+from beagle.constants import FieldNames
+from beagle.datasources.json_data import JSONData, JSONFile
+from beagle.nodes import File, Process
+from beagle.transformers import GenericTransformer
+from tests.transformers.test_base_transformer import make_events
+
+
+class FailingJSONData(JSONData):
+    """Raises after yielding `fail_after` events."""
+
+    name = "Failing JSON Data"
+    transformers = [GenericTransformer]
+    category = "Generic Data"
+
+    def __init__(self, events, fail_after: int) -> None:
+        super().__init__(events)
+        self.fail_after = fail_after
+
+    def events(self):
+        for i, event in enumerate(super().events()):
+            if i == self.fail_after:
+                raise RuntimeError("Datasource went away")
+            yield event
+
+
+def edge_events(nodes):
+    return sum(
+        len(edge._events) for node in nodes for edges in node.edges for edge in edges.values()
+    )
+
+
+def test_checkpoint_round_trip(tmpdir):
+    path = str(tmpdir.join("run.ckpt"))
+
+    parent = Process(process_id=1, process_image="a.exe")
+    child = Process(process_id=2, process_image="b.exe")
+    f = File(file_path="c:\\", file_name="foo.txt")
+
+    parent.launched[child].append(timestamp=1)
+    child.launched[parent].append(timestamp=2)
+    child.wrote[f]
+
+    # `f` is only reachable through an edge.
+    save_checkpoint(path, {"position": 10}, [parent, child])
+
+    state, nodes = load_checkpoint(path)
+
+    assert state == {"position": 10}
+    assert nodes == [parent, child]
+
+    new_parent, new_child = nodes
+    assert new_parent.launched[new_child]._events == [{"timestamp": 1, "edge_name": "Launched"}]
+    assert new_child.launched[new_parent]._events == [{"timestamp": 2, "edge_name": "Launched"}]
+    assert f in new_child.wrote
+
+
+def test_checkpoint_deep_chain(tmpdir):
+    path = str(tmpdir.join("run.ckpt"))
+
+    procs = [Process(process_id=i, process_image="a.exe") for i in range(5000)]
+    for parent, child in zip(procs, procs[1:]):
+        parent.launched[child].append(timestamp=1)
+
+    save_checkpoint(path, {}, procs[:1])
+
+    _, nodes = load_checkpoint(path)
+
+    node = nodes[0]
+    depth = 1
+    while node.launched:
+        node = next(iter(node.launched))
+        depth += 1
+
+    assert depth == 5000
+
+
+def test_load_checkpoint_missing(tmpdir):
+    assert load_checkpoint(str(tmpdir.join("missing.ckpt"))) is None
+
+
+@pytest.mark.parametrize("execution", ["thread", "process"])
+def test_resume_from_checkpoint(tmpdir, execution):
+    path = str(tmpdir.join("run.ckpt"))
+    events = make_events(50)
+
+    transformer = GenericTransformer(
+        datasource=FailingJSONData(events, fail_after=33),
+        execution=execution,
+        workers=2,
+        batch_size=5,
+        checkpoint=path,
+        checkpoint_interval=10,
+    )
+
+    with pytest.raises(RuntimeError):
+        transformer.run()
+
+    assert os.path.exists(path)
+    state, _ = load_checkpoint(path)
+    assert state["position"] == 30
+
+    transformer = GenericTransformer(
+        datasource=FailingJSONData(events, fail_after=-1),
+        execution=execution,
+        workers=2,
+        batch_size=5,
+        checkpoint=path,
+        checkpoint_interval=10,
+    )
+
+    nodes = transformer.run()
+
+    # Only the events after the checkpoint were transformed again.
+    assert transformer.report.handlers["transform"].count == 20
+    assert transformer.count == 50
+    assert not os.path.exists(path)
+
+    expected = GenericTransformer(datasource=JSONData(events)).run()
+
+    assert len(nodes) == len(expected) == 101
+    assert edge_events(nodes) == edge_events(expected)
+
+
+def test_checkpoint_ignored_for_other_transformer(tmpdir):
+    path = str(tmpdir.join("run.ckpt"))
+
+    save_checkpoint(
+        path,
+        {"transformer": "Other", "datasource": "JSONData", "position": 30, "unhandled": {}},
+        [],
+    )
+
+    transformer = GenericTransformer(datasource=JSONData(make_events(50)), checkpoint=path)
+
+    assert len(transformer.run()) == 101
+    assert transformer.report.handlers["transform"].count == 50
+
+
+def test_checkpoint_ignored_for_other_events(tmpdir):
+    path = str(tmpdir.join("run.ckpt"))
+
+    transformer = GenericTransformer(
+        datasource=FailingJSONData(make_events(50), fail_after=33),
+        batch_size=5,
+        checkpoint=path,
+        checkpoint_interval=10,
+    )
+
+    with pytest.raises(RuntimeError):
+        transformer.run()
+
+    assert os.path.exists(path)
+
+    other_events = make_events(50)
+    for event in other_events:
+        event[FieldNames.PROCESS_IMAGE] = "other.exe"
+
+    transformer = GenericTransformer(
+        datasource=JSONData(other_events), batch_size=5, checkpoint=path
+    )
+    nodes = transformer.run()
+
+    # Every event was transformed, and none of the nodes of the first run were kept.
+    assert transformer.report.handlers["transform"].count == 50
+    assert len(nodes) == 101
+    assert not any(getattr(node, "process_image", None) == "cmd.exe" for node in nodes)
+
+
+def test_checkpoint_ignored_for_other_file(tmpdir):
+    path = str(tmpdir.join("run.ckpt"))
+
+    events = make_events(50)
+    first, second = tmpdir.join("a.json"), tmpdir.join("b.json")
+    first.write(json.dumps(events))
+    second.write(json.dumps(events))
+
+    identity = JSONFile(str(first)).identity()
+    assert identity == JSONFile(str(first)).identity()
+    assert identity != JSONFile(str(second)).identity()
+
+    save_checkpoint(
+        path,
+        {
+            "transformer": "GenericTransformer",
+            "datasource": "JSONFile",
+            "identity": identity,
+            "position": 30,
+            "unhandled": {},
+        },
+        [],
+    )
+
+    transformer = GenericTransformer(datasource=JSONFile(str(second)), checkpoint=path)
+
+    assert len(transformer.run()) == 101
+    assert transformer.report.handlers["transform"].count == 50
@@ -159,3 +159,7 @@ def test_dns_request_no_resp(transformer):
 
     assert dom.domain == "google.com"
     assert dom in src.dns_query_for
+
+
+def test_accepted_event_types(transformer):
+    assert transformer.accepted_event_types() == {"UDP", "TCP", "DNS", "HTTPRequest"}
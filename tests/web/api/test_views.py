@@ -1,12 +1,15 @@
+import hashlib
+import json
+
 import mock
 import pytest
 
-from beagle.backends import Neo4J, NetworkX
+from beagle.backends import CompactGraph, Neo4J, NetworkX
 from beagle.constants import EventTypes, FieldNames, Protocols
 from beagle.datasources import HXTriage
 from beagle.transformers import FireEyeHXTransformer
 from beagle.web.api.models import Graph
-from beagle.web.api.views import _validate_params
+from beagle.web.api.views import _save_graph_to_db, _validate_params
 
 
 def test_no_params(client):
@@ -59,6 +62,36 @@ def test_new_networkx(validate_mock, setup_mock, create_mock, save_mock, client)
     assert resp.json == {"foo": "bar"}
 
 
+@mock.patch("beagle.web.api.views._save_graph_to_db")
+@mock.patch("beagle.web.api.views._create_graph")
+@mock.patch("beagle.web.api.views._setup_params")
+@mock.patch("beagle.web.api.views._validate_params")
+def test_new_compact_graph(validate_mock, setup_mock, create_mock, save_mock, client):
+    validate_mock.return_value = (
+        {
+            "datasource": HXTriage,
+            "schema": {},
+            "transformer": FireEyeHXTransformer,
+            "backend": CompactGraph,
+        },
+        True,
+    )
+
+    setup_mock.return_value = ({}, True)
+    create_mock.return_value = ({"graph": {"foo": "bar"}, "backend": CompactGraph}, True)
+    save_mock.return_value = {"foo": "bar"}
+
+    resp = client.post(
+        "/api/new",
+        data={"datasource": "HXTriage", "transformer": "GenericTransformer", "comment": "test"},
+    )
+
+    # Saved like a NetworkX graph.
+    assert save_mock.called
+    assert resp.status_code == 200
+    assert resp.json == {"foo": "bar"}
+
+
 @mock.patch("beagle.web.api.views._save_graph_to_db")
 @mock.patch("beagle.web.api.views._create_graph")
 @mock.patch("beagle.web.api.views._setup_params")
@@ -300,6 +333,180 @@ def test_get_graph_metadata_graph_not_found(session, client):
     assert resp.json["message"] == "Graph not found"
 
 
+def test_get_graph_report(session, client, tmpdir):
+    g = Graph(
+        sha256="1234",
+        meta={"foo": "bar"},
+        category="test_cat",
+        comment="foo",
+        file_path="1234.json",
+    )
+    session.add(g)
+    session.commit()
+
+    tmpdir.mkdir("test_cat").join("1234.report.json").write('{"events": 10}')
+
+    with mock.patch("beagle.web.api.views.Config.get", return_value=str(tmpdir)):
+        resp = client.get(f"/api/report/{g.id}")
+
+    assert resp.status_code == 200
+    assert resp.json == {"events": 10}
+
+
+def test_get_graph_report_not_found(session, client, tmpdir):
+    g = Graph(
+        sha256="1234",
+        meta={"foo": "bar"},
+        category="test_cat",
+        comment="foo",
+        file_path="1234.json",
+    )
+    session.add(g)
+    session.commit()
+
+    with mock.patch("beagle.web.api.views.Config.get", return_value=str(tmpdir)):
+        resp = client.get(f"/api/report/{g.id}")
+        assert resp.status_code == 404
+        assert resp.json["message"] == "Report not found"
+
+        resp = client.get(f"/api/report/{g.id + 2}")
+        assert resp.status_code == 404
+        assert resp.json["message"] == "Graph not found"
+
+
+def test_save_graph_to_db(app, session, tmpdir):
+    from beagle.nodes import File, Process
+
+    proc = Process(process_id=10, process_image="test.exe")
+    proc.wrote[File(file_path="c:", file_name="foo.txt")].append(timestamp=1)
+
+    backend = NetworkX(metadata={"name": "test"}, nodes=[proc])
+    backend.graph()
+
+    # The hash doesn't depend on the encoder.
+    def _config(section, key):
+        return {"dir": str(tmpdir), "json_encoder": "orjson"}.get(key)
+
+    with mock.patch("beagle.web.api.views.Config.get", side_effect=_config):
+        with app.test_request_context(data={"comment": "test"}):
+            first = _save_graph_to_db(backend=backend, category="Test Cat")
+            # The same graph is saved once.
+            second = _save_graph_to_db(backend=backend, category="Test Cat")
+
+    assert first == second
+
+    g = Graph.query.filter_by(id=first["id"]).first()
+    expected = json.dumps(backend.to_json(), sort_keys=True)
+
+    assert g.sha256 == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+    assert tmpdir.join("test_cat", g.file_path).read() == expected
+    assert sorted(f.basename for f in tmpdir.join("test_cat").listdir()) == sorted(
+        [f"{g.sha256}.json", f"{g.sha256}.report.json"]
+    )
+
+
+def test_save_graph_to_db_removes_partial_file(app, session, tmpdir):
+    backend = NetworkX(metadata={"name": "test"}, nodes=[])
+    backend.graph()
+
+    def _config(section, key):
+        return {"dir": str(tmpdir)}.get(key)
+
+    with mock.patch("beagle.web.api.views.Config.get", side_effect=_config), mock.patch(
+        "beagle.web.api.views.write_graph_json", side_effect=TypeError("not serializable")
+    ):
+        with app.test_request_context(data={"comment": "test"}):
+            with pytest.raises(TypeError):
+                _save_graph_to_db(backend=backend, category="Test Cat")
+
+    assert tmpdir.join("test_cat").listdir() == []
+
+
+def _make_backend():
+    from beagle.nodes import File, Process
+
+    nodes = []
+    for i in range(5):
+        proc = Process(process_id=i, process_image="test.exe")
+        proc.wrote[File(file_path="c:", file_name="foo.txt")].append(timestamp=i)
+        nodes.append(proc)
+
+    backend = NetworkX(metadata={"name": "test"}, nodes=nodes)
+    backend.graph()
+    return backend
+
+
+@pytest.mark.parametrize("storage_format", ["json", "binary"])
+def test_get_graph(app, client, session, tmpdir, storage_format):
+    backend = _make_backend()
+
+    def _config(section, key):
+        return {"dir": str(tmpdir), "format": storage_format}.get(key)
+
+    with mock.patch("beagle.web.api.views.Config.get", side_effect=_config):
+        with app.test_request_context(data={"comment": "test"}):
+            saved = _save_graph_to_db(backend=backend, category="Test Cat")
+
+        g = Graph.query.filter_by(id=saved["id"]).first()
+        assert g.file_path.endswith(".graph" if storage_format == "binary" else ".json")
+
+        expected = backend.to_json()
+
+        assert client.get(f"/api/graph/{g.id}").json == expected
+
+        resp = client.get(f"/api/graph/{g.id}?nodes=false&start=1&stop=3").json
+        assert resp["nodes"] == []
+        assert resp["links"] == expected["links"][1:3]
+
+        resp = client.get(f"/api/graph/{g.id}?links=false").json
+        assert resp["nodes"] == expected["nodes"]
+        assert resp["links"] == []
+
+        assert client.get(f"/api/graph/{g.id}?start=a").status_code == 400
+        assert client.get(f"/api/graph/{g.id + 2}").status_code == 404
+
+
+@pytest.mark.parametrize("storage_format", ["json", "binary"])
+def test_get_graph_format_from_contents(app, client, session, tmpdir, storage_format):
+    backend = _make_backend()
+
+    def _config(section, key):
+        return {"dir": str(tmpdir), "format": storage_format}.get(key)
+
+    with mock.patch("beagle.web.api.views.Config.get", side_effect=_config):
+        with app.test_request_context(data={"comment": "test"}):
+            saved = _save_graph_to_db(backend=backend, category="Test Cat")
+
+        # Loaded by its contents even without its extension.
+        g = Graph.query.filter_by(id=saved["id"]).first()
+        tmpdir.join("test_cat", g.file_path).rename(tmpdir.join("test_cat", g.sha256))
+        g.file_path = g.sha256
+        session.commit()
+
+        assert client.get(f"/api/graph/{g.id}").json == backend.to_json()
+        assert client.get(f"/api/graph/{g.id}?start=1&stop=3").json["links"] == (
+            backend.to_json()["links"][1:3]
+        )
+
+
+def test_save_graph_to_db_same_hash_in_both_formats(app, session, tmpdir):
+    backend = _make_backend()
+
+    saved = []
+    for storage_format in ["json", "binary"]:
+
+        def _config(section, key):
+            return {"dir": str(tmpdir), "format": storage_format}.get(key)
+
+        with mock.patch("beagle.web.api.views.Config.get", side_effect=_config):
+            with app.test_request_context(data={"comment": "test"}):
+                saved.append(_save_graph_to_db(backend=backend, category="Test Cat"))
+
+    # Switching formats doesn't save the graph again.
+    assert saved[0] == saved[1]
+    assert [f.ext for f in tmpdir.join("test_cat").listdir() if f.ext != ".json"] == []
+
+
 def test_get_categories_only_uploaded(session, client):
     """Should only return the fireeye_hx category"""
     g = Graph(